@@ -0,0 +1,3 @@
+"""
+Benchmarks - Măsurători de performanță (rulare: python -m benchmarks.<modul>)
+"""
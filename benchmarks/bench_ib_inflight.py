@@ -0,0 +1,62 @@
+"""
+Benchmark request-uri IBKR simultane: run_in_executor (vechi) vs API async ib_insync
+
+Rulare:
+    python -m benchmarks.bench_ib_inflight [--requests 64] [--latency-ms 200]
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.agents.data_collection.sources.ib_simulator import SimulatedIB, Stock
+from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+
+
+async def _legacy(ib: SimulatedIB, symbols) -> None:
+    """Calea dinainte: reqHistoricalData sincron în default executor."""
+    loop = asyncio.get_event_loop()
+
+    async def fetch(symbol):
+        return await loop.run_in_executor(
+            None,
+            lambda: ib.reqHistoricalData(Stock(symbol, 'SMART', 'USD'), '', '1 D', '5 mins',
+                                         'TRADES', True, keepUpToDate=False)
+        )
+
+    await asyncio.gather(*[fetch(symbol) for symbol in symbols])
+
+
+async def _native(ib: SimulatedIB, symbols) -> None:
+    """Calea nouă: IBKRDataSource pe reqHistoricalDataAsync."""
+    source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib)
+    await source.connect()
+    await asyncio.gather(*[source.fetch_historical_data(symbol, "5m", 1) for symbol in symbols])
+    await source.disconnect()
+
+
+def _measure(label: str, runner, requests: int, latency: float) -> None:
+    ib = SimulatedIB(latency=latency, pacing={})
+    ib.connect()
+    symbols = [f"SYM{i:03d}" for i in range(requests)]
+    start = time.perf_counter()
+    asyncio.run(runner(ib, symbols))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} max in flight {ib.stats.max_in_flight:4d}   "
+          f"{elapsed:7.3f} s   {requests / elapsed:8.1f} req/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    print(f"{args.requests} concurrent requests, {args.latency_ms:.0f} ms latency, no pacing limits")
+    _measure("run_in_executor (legacy)", _legacy, args.requests, latency)
+    _measure("reqHistoricalDataAsync", _native, args.requests, latency)
+
+
+if __name__ == "__main__":
+    main()
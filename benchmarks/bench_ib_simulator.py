@@ -0,0 +1,82 @@
+"""
+Benchmark pe IB simulat: throughput colectare istorică și latență stream live
+
+Rulare:
+    python -m benchmarks.bench_ib_simulator [--symbols 30] [--latency-ms 50] [--days 5] [--streams 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.agents.data_collection.scheduler import RequestScheduler
+from src.agents.data_collection.sources.ib_simulator import SimulatedIB
+from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+
+
+async def _collection(symbols: int, latency: float, days: int) -> None:
+    """Fetch concurent prin RequestScheduler (limitele IBKR implicite)."""
+    ib = SimulatedIB(latency=latency, jitter=latency / 2)
+    source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib)
+    await source.connect()
+    scheduler = RequestScheduler()
+    names = [f"SYM{i:03d}" for i in range(symbols)]
+
+    async def fetch(symbol: str):
+        async with scheduler.slot("IBKR", request_key=(symbol, "5m", days), contract_key=symbol):
+            return await source.fetch_historical_series(symbol, "5m", days)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[fetch(symbol) for symbol in names])
+    elapsed = time.perf_counter() - start
+    await source.disconnect()
+
+    bars = sum(len(series) for series in results)
+    print(f"Collection: {symbols} symbols x {days} days 5m, latency {latency * 1000:.0f} ms")
+    print(f"  {elapsed:8.3f} s   {bars:,} bars   {bars / elapsed:,.0f} bars/s   "
+          f"max in flight {ib.stats.max_in_flight}   pacing violations {ib.stats.pacing_violations}")
+
+
+async def _streaming(streams: int, updates: int) -> None:
+    """Latența updateEvent → consumator (IBKRDataSource → BarBus → Subscription)."""
+    ib = SimulatedIB(pacing={}, stream_interval=0.002, updates_per_bar=4)
+    source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib)
+    await source.connect()
+    names = [f"SYM{i:03d}" for i in range(streams)]
+    subs = [await source.subscribe(symbol, "1m") for symbol in names]
+    lists = {bars.contract.symbol: bars for bars, _ in ib._streams.values()}
+    latencies = []
+
+    async def consume(symbol, sub):
+        for _ in range(updates):
+            await sub.get()
+            latencies.append(time.perf_counter() - lists[symbol].lastEmit)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[consume(symbol, sub) for symbol, sub in zip(names, subs)])
+    elapsed = time.perf_counter() - start
+    await source.disconnect()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"Streaming: {streams} symbols x {updates} updates")
+    print(f"  {len(latencies) / elapsed:,.0f} updates/s   latency median "
+          f"{statistics.median(latencies) * 1e6:.0f} us   p99 {p99 * 1e6:.0f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--updates", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(_collection(args.symbols, args.latency_ms / 1000, args.days))
+    asyncio.run(_streaming(args.streams, args.updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark construcție Bar: dataclass clasic vs __slots__ vs Bar.from_arrays
+
+Rulare:
+    python -m benchmarks.bench_market_data [--n 1000000]
+"""
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from src.common.models.market_data import Bar
+
+
+# Replica Bar fără __slots__ (varianta de dinainte), cu aceeași validare
+LegacyBar = dataclasses.make_dataclass(
+    "LegacyBar",
+    [(f.name, f.type, f) for f in dataclasses.fields(Bar)],
+    namespace={"__post_init__": Bar.__post_init__},
+)
+
+
+def _columns(n: int):
+    start = datetime(2024, 1, 2, 9, 30)
+    timestamps = [start + timedelta(minutes=i) for i in range(n)]
+    opens = [100.0 + (i % 50) * 0.01 for i in range(n)]
+    highs = [o + 0.5 for o in opens]
+    lows = [o - 0.5 for o in opens]
+    closes = [o + 0.1 for o in opens]
+    volumes = [1000 + i % 100 for i in range(n)]
+    return timestamps, opens, highs, lows, closes, volumes
+
+
+def _measure(label: str, build, n: int, repeat: int = 3) -> None:
+    # Timp: cea mai bună din `repeat` rulări (fără tracemalloc, care încetinește alocările)
+    elapsed = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        bars = build()
+        elapsed = min(elapsed, time.perf_counter() - start)
+        assert len(bars) == n
+        del bars
+
+    # Memorie alocată (vârf)
+    gc.collect()
+    tracemalloc.start()
+    bars = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del bars
+
+    print(f"{label:<24} {elapsed:7.3f} s   {n / elapsed / 1e6:5.2f} M bars/s   {peak / n:7.1f} B/bar")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.n
+
+    ts, o, h, l, c, v = _columns(n)
+    print(f"Building {n:,} bars")
+
+    _measure("dataclass (__dict__)", lambda: [
+        LegacyBar(t, *row, symbol="AAPL", timeframe="1m", source="IBKR")
+        for t, *row in zip(ts, o, h, l, c, v)
+    ], n)
+    _measure("dataclass(slots=True)", lambda: [
+        Bar(t, *row, symbol="AAPL", timeframe="1m", source="IBKR")
+        for t, *row in zip(ts, o, h, l, c, v)
+    ], n)
+    _measure("Bar.trusted", lambda: [
+        Bar.trusted(t, *row, symbol="AAPL", timeframe="1m", source="IBKR")
+        for t, *row in zip(ts, o, h, l, c, v)
+    ], n)
+    _measure("Bar.from_arrays", lambda: Bar.from_arrays(
+        ts, o, h, l, c, v, symbol="AAPL", timeframe="1m", source="IBKR"
+    ), n)
+
+
+if __name__ == "__main__":
+    main()
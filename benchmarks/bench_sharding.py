@@ -0,0 +1,64 @@
+"""
+Benchmark pe IB simulat: throughput colectare istorică în funcție de numărul de conexiuni (clientId)
+
+Pacing-ul e scalat în jos (implicit 10 requests/secundă per conexiune, în loc
+de 60 / 10 minute), ca rularea să dureze secunde; raportul dintre conexiuni
+rămâne același.
+
+Rulare:
+    python -m benchmarks.bench_sharding [--symbols 120] [--connections 1 2 4 8] [--rate 10]
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.agents.data_collection.scheduler import RequestScheduler
+from src.agents.data_collection.sources.ib_simulator import SimulatedIB
+from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+from src.agents.data_collection.sources.sharded_source import ShardedDataSource
+
+
+async def _collection(symbols: int, connections: int, rate: int, latency: float) -> None:
+    shards = [
+        IBKRDataSource("127.0.0.1", 7497, k + 1, ib=SimulatedIB(pacing={}, latency=latency, jitter=latency / 2))
+        for k in range(connections)
+    ]
+    source = ShardedDataSource(shards)
+    await source.connect()
+    scheduler = RequestScheduler({"IBKR": {
+        "max_requests": rate, "period_seconds": 1, "identical_interval_seconds": 0,
+    }})
+    names = [f"SYM{i:03d}" for i in range(symbols)]
+    await source.prepare(names)
+
+    async def fetch(symbol: str):
+        async with scheduler.slot(source.pacing_key(symbol), request_key=(symbol, "1H", 5), contract_key=symbol):
+            return await source.fetch_historical_series(symbol, "1H", 5)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[fetch(symbol) for symbol in names])
+    elapsed = time.perf_counter() - start
+    await source.disconnect()
+
+    bars = sum(len(series) for series in results)
+    per_shard = sorted(len(group) for group in source.assign(names).values())
+    print(f"{connections:3d} connections   {elapsed:7.3f} s   {symbols / elapsed:7.1f} requests/s   "
+          f"{bars:,} bars   symbols per connection {per_shard[0]}-{per_shard[-1]}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=120)
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--rate", type=int, default=10, help="Requests pe secundă per conexiune")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    print(f"Collection: {args.symbols} symbols, {args.rate} requests/s per connection")
+    for connections in args.connections:
+        asyncio.run(_collection(args.symbols, connections, args.rate, args.latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark TickBarAggregator: tick-uri pe secundă (un singur core), din valori simple și din obiecte Tick
+
+Rulare:
+    python -m benchmarks.bench_tick_aggregator [--ticks 2000000] [--symbols 50] [--timeframe 1m]
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.agents.data_collection.market_calendar import ExchangeCalendar, NS
+from src.agents.data_collection.tick_aggregator import TickBarAggregator
+from src.common.models.market_data import Tick
+
+
+def _ticks(n: int, symbols: int, seed: int = 42):
+    """Tick-uri sintetice în sesiunea RTH: ~20 trade-uri / secundă / simbol, random walk."""
+    rng = np.random.default_rng(seed)
+    open_ns = int(datetime(2024, 3, 5, 14, 30, tzinfo=timezone.utc).timestamp()) * NS
+    per_second = 20 * symbols
+    stamps = open_ns + np.cumsum(rng.exponential(NS / per_second, n)).astype(np.int64)
+    names = np.array([f"SYM{i:03d}" for i in range(symbols)], dtype=object)[rng.integers(0, symbols, n)]
+    prices = np.round(100 + np.cumsum(rng.normal(0, 0.01, n)), 2)
+    sizes = rng.integers(1, 500, n)
+    return stamps.tolist(), names.tolist(), prices.tolist(), sizes.tolist()
+
+
+def _run_values(aggregator: TickBarAggregator, stamps, names, prices, sizes) -> float:
+    add = aggregator.add
+    start = time.perf_counter()
+    for ts, symbol, price, size in zip(stamps, names, prices, sizes):
+        add(symbol, ts, price, size)
+    aggregator.flush()
+    return time.perf_counter() - start
+
+
+def _run_ticks(aggregator: TickBarAggregator, ticks) -> float:
+    add_tick = aggregator.add_tick
+    start = time.perf_counter()
+    for tick in ticks:
+        add_tick(tick)
+    aggregator.flush()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ticks", type=int, default=2_000_000)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--timeframe", default="1m")
+    args = parser.parse_args()
+
+    stamps, names, prices, sizes = _ticks(args.ticks, args.symbols)
+    span = (stamps[-1] - stamps[0]) / NS / 60
+    print(f"{args.ticks:,} ticks, {args.symbols} symbols, {span:.0f} minutes of trading, {args.timeframe} bars")
+
+    for label, calendar in (("fixed grid", None), ("NYSE sessions", ExchangeCalendar())):
+        aggregator = TickBarAggregator(args.timeframe, calendar=calendar)
+        elapsed = _run_values(aggregator, stamps, names, prices, sizes)
+        print(f"add()      {label:14s} {elapsed:7.3f} s   {args.ticks / elapsed:12,.0f} ticks/s   "
+              f"{aggregator.bars_emitted:,} bars")
+
+    ticks = [
+        Tick.trusted(datetime.fromtimestamp(ts / NS, tz=timezone.utc), symbol, price, size)
+        for ts, symbol, price, size in zip(stamps, names, prices, sizes)
+    ]
+    aggregator = TickBarAggregator(args.timeframe, calendar=ExchangeCalendar())
+    elapsed = _run_ticks(aggregator, ticks)
+    print(f"add_tick() {'NYSE sessions':14s} {elapsed:7.3f} s   {args.ticks / elapsed:12,.0f} ticks/s   "
+          f"{aggregator.bars_emitted:,} bars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark conversie DataFrame Yahoo → bars: iterrows (vechi) vs coloane (BarSeries)
+
+Rulare:
+    python -m benchmarks.bench_yahoo_conversion [--days 30]
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.agents.data_collection.sources.yahoo_source import YahooDataSource
+from src.common.models.market_data import Bar
+
+
+def _synthetic_history(days: int) -> pd.DataFrame:
+    """DataFrame ca yfinance pentru date de 1 minut (390 bars / sesiune)."""
+    sessions = pd.bdate_range("2024-01-02", periods=days)
+    index = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=390, freq="1min")
+        for day in sessions
+    ])).tz_localize("America/New_York")
+    rng = np.random.default_rng(42)
+    close = 150 + np.cumsum(rng.normal(0, 0.05, len(index)))
+    open_ = close + rng.normal(0, 0.02, len(index))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + 0.03,
+        "Low": np.minimum(open_, close) - 0.03,
+        "Close": close,
+        "Volume": rng.integers(100, 10_000, len(index)),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    }, index=index)
+
+
+def _legacy_convert(hist: pd.DataFrame, symbol: str, timeframe: str):
+    """Conversia dinainte: iterrows + un Bar validat per rând."""
+    bars = []
+    for idx, row in hist.iterrows():
+        timestamp = idx.to_pydatetime() if hasattr(idx, 'to_pydatetime') else datetime.fromtimestamp(idx.timestamp())
+        bars.append(Bar(
+            timestamp=timestamp,
+            open=round(float(row['Open']), 2),
+            high=round(float(row['High']), 2),
+            low=round(float(row['Low']), 2),
+            close=round(float(row['Close']), 2),
+            volume=int(row['Volume']) if 'Volume' in row else 0,
+            symbol=symbol,
+            timeframe=timeframe,
+            count=None,
+            wap=None,
+            hasGaps=None,
+            source='YAHOO',
+            normalized=True
+        ))
+    return bars
+
+
+def _best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    hist = _synthetic_history(args.days)
+    # Doar conversia e măsurată; constructorul sursei cere yfinance instalat
+    source = YahooDataSource.__new__(YahooDataSource)
+    n = len(hist)
+    print(f"Converting {n:,} 1-minute rows ({args.days} sessions)")
+
+    results = [
+        ("iterrows + Bar (legacy)", _best_of(lambda: _legacy_convert(hist, "AAPL", "1m"), repeat=1)),
+        ("columns → BarSeries", _best_of(lambda: source._frame_to_series(hist, "AAPL", "1m"))),
+        ("columns → List[Bar]", _best_of(lambda: source._frame_to_series(hist, "AAPL", "1m").to_bars())),
+    ]
+    baseline = results[0][1]
+    for label, elapsed in results:
+        print(f"{label:<26} {elapsed * 1000:9.1f} ms   {n / elapsed / 1e6:6.2f} M rows/s   x{baseline / elapsed:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,52 @@
 Data Collection Agent - Orchestrator principal pentru colectare date
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 import asyncio
+import math
+import signal
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
 
 from src.common.utils.config_loader import ConfigLoader
 from src.common.logging_utils.logger import get_logger
-from src.common.models.market_data import Bar
+from src.common.models.market_data import Bar, BarSeries
+from src.common.utils.helpers import timeframe_to_seconds
 
 # Lazy imports pentru a evita event loop issues în Streamlit
 # IBKRDataSource se importă doar când e necesar
 from src.agents.data_collection.sources.yahoo_source import YahooDataSource
 from src.agents.data_collection.sources.base_source import BaseDataSource
+from src.agents.data_collection.sources.cached_source import CachedDataSource
+from src.agents.data_collection.sources.pool import SourcePool
+from src.agents.data_collection.sources.sharded_source import ShardedDataSource
 from src.agents.data_collection.normalizer import DataNormalizer
+from src.agents.data_collection.market_calendar import NS, ExchangeCalendar, MissingRange
+from src.agents.data_collection.corporate_actions import CorporateActionAdjuster, CorporateActionStore
+from src.agents.data_collection.resampler import Resampler
+from src.agents.data_collection.merge import BarMerger, MergeResult
+from src.agents.data_collection.daemon import CollectorDaemon
 from src.agents.data_collection.validator import DataValidator
+from src.agents.data_collection.scheduler import RequestScheduler
+from src.agents.data_collection.watermark import WatermarkStore
+from src.agents.data_collection.bus import BackpressurePolicy, BarBus, Subscription
+from src.agents.data_collection.ring_buffer import RingBufferStore
+
+
+# TWS / IB Gateway acceptă cel mult 32 de clienți API simultan per cont
+MAX_IBKR_CONNECTIONS = 32
+
+# Sufixul fișierelor cu bars agregate local (derived_timeframes), separate de cele colectate direct
+DERIVED_SUFFIX = "_derived"
+
+
+def _utc_key(ts) -> pd.Timestamp:
+    """Cheie comparabilă pentru timestamp-uri naive/aware (naive = UTC)."""
+    t = pd.Timestamp(ts)
+    return t.tz_convert("UTC") if t.tzinfo is not None else t.tz_localize("UTC")
 
 
 class DataCollectionAgent:
@@ -35,10 +66,43 @@ class DataCollectionAgent:
         else:
             self.config = self.config_loader.load_config("config.yaml")
         
+        data_collector_config = self.config.get("data_collector", {})
+        
         self.data_source: Optional[BaseDataSource] = None
-        self.normalizer = DataNormalizer()
+        self.data_source_name = data_collector_config.get("data_source", "IBKR").upper()
+        # Surse (primară + backup) conectate lazy și refolosite între simboluri și rulări
+        self.sources = SourcePool(
+            self._create_source,
+            retry_after=data_collector_config.get("source_retry_seconds", 60)
+        )
+        # Calendarul bursei: sesiuni RTH/ETH, sărbători, zile scurte (detecție goluri)
+        self.calendar = ExchangeCalendar.from_config(data_collector_config.get("calendar"))
+        # La timestamp-uri suprapuse câștigă sursa preferată (IBKR > YAHOO implicit)
+        self.merger = BarMerger(data_collector_config.get("source_priority"))
+        self.normalizer = DataNormalizer(self.calendar, self.merger)
+        self.resampler = Resampler(self.calendar)
+        # Split-uri/dividende: istoricul rămâne raw pe disc, view-ul ajustat se calculează la citire
+        data_dir = data_collector_config.get("data_dir", "data/processed")
+        actions_config = data_collector_config.get("corporate_actions") or {}
+        self.corporate_actions = CorporateActionStore(
+            actions_config.get("file", f"{data_dir}/corporate_actions.json")
+        )
+        self.adjuster = CorporateActionAdjuster(
+            self.corporate_actions, tz=self.calendar.tz, dividends=actions_config.get("dividends", True)
+        )
         self.validator = DataValidator()
+        self.scheduler = RequestScheduler.from_config(data_collector_config)
+        # Bus comun pentru bars live din toate sursele
+        self.bus = BarBus.from_config(data_collector_config)
         self.logger = get_logger(__name__)
+        
+        # Mod incremental: watermark per (simbol, timeframe) + istoric cumulativ
+        self.watermarks: Optional[WatermarkStore] = None
+        if data_collector_config.get("incremental", False):
+            data_dir = data_collector_config.get("data_dir", "data/processed")
+            self.watermarks = WatermarkStore(
+                data_collector_config.get("watermark_file", f"{data_dir}/watermarks.json")
+            )
     
     async def initialize(self) -> bool:
         """Inițializare conexiuni și setup.
@@ -49,29 +113,18 @@ class DataCollectionAgent:
         try:
             # Obține config data_collector
             data_collector_config = self.config.get("data_collector", {})
-            ibkr_config = self.config.get("ibkr", {})
-            data_source_name = data_collector_config.get("data_source", "IBKR")
-            
-            # Conectează la sursa primară
-            if data_source_name.upper() == "IBKR":
-                # Lazy import pentru a evita event loop issues în Streamlit
-                from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
-                self.data_source = IBKRDataSource(
-                    host=ibkr_config.get("host", "127.0.0.1"),
-                    port=ibkr_config.get("port", 7497),
-                    clientId=ibkr_config.get("clientId", 1)
-                )
-                connected = await self.data_source.connect()
-                if not connected:
-                    self.logger.warning("Failed to connect to IBKR, will try backup source if configured")
-                    # Nu returnăm False aici - încercăm backup
-            elif data_source_name.upper() == "YAHOO":
-                self.data_source = YahooDataSource()
-                connected = await self.data_source.connect()
-            else:
+            data_source_name = self.data_source_name
+            
+            if data_source_name not in ("IBKR", "YAHOO"):
                 self.logger.error(f"Unknown data source: {data_source_name}")
                 return False
             
+            # Conectează la sursa primară (prin pool, refolosită între rulări)
+            self.data_source = await self.sources.get(data_source_name)
+            if self.data_source is None:
+                self.logger.warning(f"Failed to connect to {data_source_name}, will try backup source if configured")
+                # Nu returnăm False aici - încercăm backup
+            
             # Crează output directories
             data_dir = data_collector_config.get("data_dir", "data/processed")
             Path(data_dir).mkdir(parents=True, exist_ok=True)
@@ -85,6 +138,9 @@ class DataCollectionAgent:
     async def collect_all(self) -> bool:
         """Colectează date pentru toate simbolurile.
         
+        Simbolurile se descarcă concurent; ritmul real e limitat de
+        RequestScheduler, conform limitelor de pacing ale fiecărei surse.
+        
         Returns:
             True dacă colectarea reușește
         """
@@ -99,117 +155,702 @@ class DataCollectionAgent:
                 self.logger.warning("No symbols configured")
                 return False
             
-            for symbol in symbols:
-                self.logger.info(f"Collecting {symbol}...")
-                
-                # Fetch de la sursa primară
-                bars = await self.data_source.fetch_historical_data(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    lookback_days=lookback_days,
-                    useRTH=useRTH
+            # Mod incremental: cerem doar intervalul de după watermark
+            watermarks = {
+                symbol: self._get_watermark(symbol, timeframe, data_collector_config)
+                for symbol in symbols
+            }
+            lookbacks = {
+                symbol: self._incremental_lookback(watermarks[symbol], lookback_days)
+                if watermarks[symbol] is not None else lookback_days
+                for symbol in symbols
+            }
+            
+            # Sursa primară se reconectează dacă a căzut între rulări
+            if self.data_source is None or not await self.data_source.is_healthy():
+                self.data_source = await self.sources.get(self.data_source_name)
+            
+            # Pregătire sursă (contracte IBKR calificate o dată, din cache dacă există)
+            if self.data_source is not None:
+                await self.data_source.prepare(symbols)
+            
+            # Surse cu download multi-simbol: un request per grup de simboluri
+            prefetched: Dict[str, BarSeries] = {}
+            if self.data_source is not None and self.data_source.supports_batch:
+                prefetched = await self._fetch_batched(self.data_source, symbols, timeframe, lookbacks, useRTH)
+            
+            results = await asyncio.gather(*[
+                self._collect_symbol(
+                    symbol, timeframe, lookbacks[symbol], useRTH, data_collector_config,
+                    watermark=watermarks[symbol], prefetched=prefetched.get(symbol)
                 )
-                
-                # Dacă nu avem date și avem backup source, încercăm backup
-                if not bars:
-                    backup_source_name = data_collector_config.get("backup_source")
-                    if backup_source_name:
-                        self.logger.info(f"No data from primary source, trying backup: {backup_source_name}")
-                        backup_source = self._get_backup_source(backup_source_name)
-                        if backup_source:
-                            await backup_source.connect()
-                            bars = await backup_source.fetch_historical_data(
-                                symbol=symbol,
-                                timeframe=timeframe,
-                                lookback_days=lookback_days,
-                                useRTH=useRTH
-                            )
-                            await backup_source.disconnect()
-                
-                if not bars:
-                    self.logger.warning(f"No data for {symbol} from any source")
-                    continue
-                
-                # Validate
-                valid_count, invalid_count = self.validator.validate_bars(bars)
-                self.logger.info(f"{symbol}: {valid_count} valid, {invalid_count} invalid")
-                
-                # Save
-                await self._save_bars(symbol, bars, data_collector_config)
-                
-                # Pace limit IBKR (min 10 sec între requests)
-                self.logger.info(f"Waiting 10 seconds before next request (IBKR pacing limit)...")
-                await asyncio.sleep(10)
-            
-            self.logger.info("Collection completed")
+                for symbol in symbols
+            ])
+            
+            if self.watermarks is not None:
+                self.watermarks.save()
+            
+            if data_collector_config.get("normalize_splits", False):
+                await self.refresh_corporate_actions(symbols)
+            
+            # Goluri în istoricul cumulativ: se descarcă doar intervalele lipsă
+            if self.watermarks is not None and (data_collector_config.get("gap_fill") or {}).get("enabled", False):
+                await self.fill_gaps(symbols, timeframe)
+            
+            if isinstance(self.data_source, CachedDataSource):
+                self.logger.info(f"History cache: {self.data_source.stats()}")
+            self.logger.info(f"Collection completed ({sum(results)}/{len(symbols)} symbols)")
             return True
         except Exception as e:
             self.logger.error(f"Collection error: {e}")
             return False
     
-    async def _save_bars(self, symbol: str, bars: List[Bar], config: dict) -> bool:
-        """Salvează bars în format CSV + JSON.
+    async def backfill(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        symbols: Optional[List[str]] = None,
+        timeframe: Optional[str] = None
+    ) -> bool:
+        """Backfill istoric lung din IBKR, în ferestre paralele cu checkpoint.
+        
+        Intervalul se împarte în ferestre acceptate de IBKR pentru bar size,
+        rulate concurent prin RequestScheduler. Progresul se salvează în
+        `backfill.checkpoint_dir`; o rulare întreruptă se reia de unde a rămas.
+        
+        Args:
+            start: Începutul intervalului (naive = UTC)
+            end: Sfârșitul intervalului (default: acum)
+            symbols: Simboluri (default: cele din config)
+            timeframe: Timeframe (default: cel din config)
+        
+        Returns:
+            True dacă toate simbolurile au fost descărcate complet și salvate
+        """
+        data_collector_config = self.config.get("data_collector", {})
+        symbols = symbols or data_collector_config.get("symbols", [])
+        timeframe = timeframe or data_collector_config.get("timeframe", "1H")
+        useRTH = data_collector_config.get("useRTH", True)
+        config = {**data_collector_config, "timeframe": timeframe}
+        
+        backfiller = await self._backfiller(symbols)
+        if backfiller is None:
+            return False
+        
+        async def run_symbol(symbol: str) -> bool:
+            try:
+                result = await backfiller.run(symbol, timeframe, start, end, useRTH)
+                if not len(result.series):
+                    return result.complete
+                series, sources = result.series, None
+                if self.watermarks is not None:
+                    merged = self._merge_history(symbol, timeframe, series, config)
+                    series, sources = merged.series, merged.sources
+                saved = await self._save_bars(symbol, series, config, sources=sources,
+                                              changed=result.series.timestamps)
+                if saved and self.watermarks is not None:
+                    self.watermarks.set(symbol, timeframe, series[-1].timestamp)
+                return saved and result.complete
+            except Exception as e:
+                self.logger.error(f"Backfill error for {symbol}: {e}")
+                return False
+        
+        results = await asyncio.gather(*[run_symbol(symbol) for symbol in symbols])
+        if self.watermarks is not None:
+            self.watermarks.save()
+        self.logger.info(f"Backfill completed ({sum(results)}/{len(symbols)} symbols)")
+        return all(results)
+    
+    def find_gaps(self, symbol: str, timeframe: Optional[str] = None) -> List[MissingRange]:
+        """Intervalele lipsă din istoricul salvat al unui simbol, față de calendarul bursei.
+        
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe (default: cel din config)
+        
+        Returns:
+            Intervale [start, end) UTC cu bars lipsă (între primul și ultimul bar salvat)
+        """
+        data_collector_config = self.config.get("data_collector", {})
+        timeframe = timeframe or data_collector_config.get("timeframe", "1H")
+        history = self._load_history(symbol, timeframe, data_collector_config)
+        if not len(history):
+            return []
+        return self.calendar.missing_ranges(history, timeframe, data_collector_config.get("useRTH", True))
+    
+    async def fill_gaps(self, symbols: Optional[List[str]] = None, timeframe: Optional[str] = None) -> bool:
+        """Descarcă din IBKR doar intervalele lipsă din istoric și le adaugă la el.
+        
+        Fiecare interval trece prin Backfiller (ferestre IBKR, pacing, checkpoint);
+        simbolurile rulează concurent, intervalele unui simbol pe rând. Se iau
+        cel mult `gap_fill.max_ranges` intervale per simbol, cele mai recente.
+        Golurile pe care sursa nu le are (ex: suspendări) rămân și se reîncearcă.
+        
+        Args:
+            symbols: Simboluri (default: cele din config)
+            timeframe: Timeframe (default: cel din config)
+        
+        Returns:
+            True dacă toate golurile găsite au fost descărcate și salvate
+        """
+        data_collector_config = self.config.get("data_collector", {})
+        gap_config = data_collector_config.get("gap_fill") or {}
+        symbols = symbols or data_collector_config.get("symbols", [])
+        timeframe = timeframe or data_collector_config.get("timeframe", "1H")
+        useRTH = data_collector_config.get("useRTH", True)
+        max_ranges = gap_config.get("max_ranges", 20)
+        config = {**data_collector_config, "timeframe": timeframe}
+        
+        gaps = {symbol: self.find_gaps(symbol, timeframe)[-max_ranges:] for symbol in symbols}
+        gaps = {symbol: ranges for symbol, ranges in gaps.items() if ranges}
+        if not gaps:
+            self.logger.info("No gaps in history")
+            return True
+        
+        backfiller = await self._backfiller(list(gaps))
+        if backfiller is None:
+            return False
+        
+        async def fill_symbol(symbol: str, ranges: List[MissingRange]) -> bool:
+            try:
+                self.logger.info(f"{symbol}: filling {len(ranges)} gaps ({sum(r.bars for r in ranges)} bars)")
+                # Secvențial per simbol: checkpoint-ul backfill e unul per simbol/timeframe
+                results = [await backfiller.run(symbol, timeframe, r.start, r.end, useRTH) for r in ranges]
+                series = BarSeries.concat([result.series for result in results if len(result.series)])
+                if len(series):
+                    merged = self._merge_history(symbol, timeframe, series, config)
+                    if not await self._save_bars(symbol, merged.series, config, sources=merged.sources,
+                                                 changed=series.timestamps):
+                        return False
+                    self.logger.info(f"{symbol}: {len(series)} bars recovered")
+                return all(result.complete for result in results)
+            except Exception as e:
+                self.logger.error(f"Gap fill error for {symbol}: {e}")
+                return False
+        
+        results = await asyncio.gather(*[fill_symbol(symbol, ranges) for symbol, ranges in gaps.items()])
+        return all(results)
+    
+    async def _backfiller(self, symbols: List[str]):
+        """Backfiller peste sursa IBKR din pool (None dacă IBKR nu e disponibil)."""
+        from src.agents.data_collection.backfill import Backfiller, BackfillPlanner
+        
+        data_collector_config = self.config.get("data_collector", {})
+        backfill_config = data_collector_config.get("backfill", {}) or {}
+        data_dir = data_collector_config.get("data_dir", "data/processed")
+        
+        source = await self.sources.get("IBKR")
+        if source is None:
+            self.logger.error("Backfill requires a connected IBKR source")
+            return None
+        
+        await source.prepare(symbols)
+        return Backfiller(
+            source,
+            self.scheduler,
+            planner=BackfillPlanner(backfill_config.get("window_days")),
+            checkpoint_dir=backfill_config.get("checkpoint_dir", f"{data_dir}/_backfill")
+        )
+    
+    async def subscribe(
+        self,
+        symbol: str,
+        timeframe: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        policy: Optional[BackpressurePolicy] = None,
+        closed_only: bool = False
+    ) -> Optional[Subscription]:
+        """Abonament la bars live de la sursa primară.
+        
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe (default: cel din config)
+            maxsize: Dimensiune coadă (default: live.queue_size)
+            policy: Politica de backpressure (default: live.backpressure)
+            closed_only: Doar bars închise
+        
+        Returns:
+            Subscription (iterator async de BarUpdate) sau None fără sursă conectată
+            ori dacă sursa nu poate porni stream-ul
+        """
+        timeframe = timeframe or self.config.get("data_collector", {}).get("timeframe", "1H")
+        if self.data_source is None or not await self.data_source.is_healthy():
+            self.data_source = await self.sources.get(self.data_source_name)
+        if self.data_source is None:
+            self.logger.error(f"Cannot subscribe to {symbol}: no connected source")
+            return None
+        self.data_source.bus = self.bus
+        sub = await self.data_source.subscribe(symbol, timeframe, maxsize, policy, closed_only)
+        if sub is None:
+            self.logger.error(f"Cannot subscribe to {symbol} {timeframe}: live stream not started")
+        return sub
+    
+    def load_bars(self, symbol: str, timeframe: Optional[str] = None, adjusted: Optional[bool] = None) -> BarSeries:
+        """Istoricul salvat al simbolului, ajustat pentru split-uri/dividende sau raw.
+        
+        Ambele view-uri stau în memorie după prima citire; un split nou
+        reconstruiește doar view-ul ajustat al simbolului respectiv.
         
         Args:
             symbol: Simbol stoc
-            bars: Lista de Bar-uri
+            timeframe: Timeframe (default: cel din config)
+            adjusted: Ajustat (default: data_collector.normalize_splits)
+        
+        Returns:
+            BarSeries (partajat, nu se modifică in-place; goală dacă nu există istoric)
+        """
+        data_collector_config = self.config.get("data_collector", {})
+        timeframe = timeframe or data_collector_config.get("timeframe", "1H")
+        if adjusted is None:
+            adjusted = data_collector_config.get("normalize_splits", False)
+        return self.adjuster.view(
+            symbol,
+            timeframe,
+            lambda: self._load_history(symbol, timeframe, data_collector_config),
+            adjusted=adjusted,
+        )
+    
+    async def refresh_corporate_actions(self, symbols: Optional[List[str]] = None) -> List[str]:
+        """Actualizează split-urile/dividendele din Yahoo (cel mult o dată la `refresh_hours`).
+        
+        Args:
+            symbols: Simboluri (default: cele din config)
+        
+        Returns:
+            Simbolurile ale căror acțiuni s-au schimbat (view-urile lor ajustate se reconstruiesc)
+        """
+        data_collector_config = self.config.get("data_collector", {})
+        actions_config = data_collector_config.get("corporate_actions") or {}
+        symbols = symbols or data_collector_config.get("symbols", [])
+        max_age = timedelta(hours=actions_config.get("refresh_hours", 24))
+        due = [s for s in symbols if self.corporate_actions.needs_refresh(s, max_age)]
+        if not due or not actions_config.get("refresh", True):
+            return []
+        
+        source = await self.sources.get("YAHOO")
+        if source is None or not hasattr(source, "fetch_corporate_actions"):
+            self.logger.warning("Corporate actions refresh skipped: Yahoo source not available")
+            return []
+        
+        changed = []
+        for symbol in due:
+            async with self.scheduler.slot(source.pacing_key(symbol), request_key=("actions", symbol)):
+                actions = await source.fetch_corporate_actions(symbol)
+            if actions is None:
+                continue
+            if self.corporate_actions.update(symbol, actions):
+                changed.append(symbol)
+            self.corporate_actions.mark_checked(symbol)
+        self.corporate_actions.save()
+        if changed:
+            self.logger.info(f"Corporate actions updated for {changed}")
+        return changed
+    
+    def get_history(self, symbol: str, timeframe: Optional[str] = None, n: Optional[int] = None) -> BarSeries:
+        """Ultimele n bars live ale sursei primare, din memorie (fără citire de pe disc).
+        
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe (default: cel din config)
+            n: Număr de bars (default: tot buffer-ul, ring_buffer_depth)
+        
+        Returns:
+            BarSeries (view peste ring buffer; goală dacă simbolul nu e abonat)
+        """
+        timeframe = timeframe or self.config.get("data_collector", {}).get("timeframe", "1H")
+        if self.data_source is None:
+            return BarSeries.empty(symbol, timeframe)
+        return self.data_source.get_history(symbol, timeframe, n)
+    
+    async def _collect_symbol(
+        self,
+        symbol: str,
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool,
+        config: dict,
+        watermark: Optional[datetime] = None,
+        prefetched: Optional[BarSeries] = None
+    ) -> bool:
+        """Colectează, validează și salvează un singur simbol.
+        
+        Args:
+            watermark: Ultimul timestamp salvat (mod incremental)
+            prefetched: Seria deja descărcată într-un batch (None = fetch individual)
+        
+        Returns:
+            True dacă simbolul a fost salvat
+        """
+        try:
+            self.logger.info(f"Collecting {symbol}...")
+            if watermark is not None:
+                self.logger.info(f"{symbol}: incremental from {watermark} ({lookback_days} days)")
+            
+            # Fetch de la sursa primară (dacă nu a venit deja într-un batch)
+            if prefetched is not None:
+                series = prefetched
+            elif self.data_source is not None:
+                series = await self._fetch(self.data_source, symbol, timeframe, lookback_days, useRTH)
+            else:
+                series = BarSeries.empty(symbol, timeframe)
+            
+            # Dacă nu avem date și avem backup source, încercăm backup
+            if not len(series):
+                backup_source_name = config.get("backup_source")
+                if backup_source_name:
+                    self.logger.info(f"No data from primary source, trying backup: {backup_source_name}")
+                    backup_source = await self.sources.get(backup_source_name)
+                    if backup_source:
+                        series = await self._fetch(backup_source, symbol, timeframe, lookback_days, useRTH)
+            
+            if not len(series):
+                self.logger.warning(f"No data for {symbol} from any source")
+                return False
+            
+            # Validate
+            validation = self.validator.validate_frame(series, symbol)
+            self.logger.info(f"{symbol}: {validation.valid_count} valid, {validation.invalid_count} invalid")
+            
+            if self.watermarks is None:
+                saved = await self._save_bars(symbol, series, config)
+                if saved:
+                    await self._save_derived(symbol, series, config)
+                return saved
+            
+            # Incremental: păstrăm doar bars noi și le adăugăm la istoric
+            if watermark is not None:
+                # Ultimul bar salvat se reia (putea fi încă incomplet)
+                series = series[series.timestamps >= _utc_key(watermark).value]
+                if not len(series):
+                    self.logger.info(f"{symbol}: already up to date")
+                    return True
+            merged = self._merge_history(symbol, timeframe, series, config)
+            saved = await self._save_bars(symbol, merged.series, config, sources=merged.sources,
+                                          changed=series.timestamps)
+            if saved:
+                self.watermarks.set(symbol, timeframe, merged.series[-1].timestamp)
+                self.logger.info(f"{symbol}: {len(series)} new bars, {len(merged.series)} in history")
+                await self._save_derived(symbol, merged.series, config, since=int(series.timestamps.min()))
+            return saved
+        except Exception as e:
+            self.logger.error(f"Collection error for {symbol}: {e}")
+            return False
+    
+    async def _fetch(
+        self,
+        source: BaseDataSource,
+        symbol: str,
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool
+    ) -> BarSeries:
+        """Fetch istoric (columnar) printr-un slot de pacing al sursei (hit-urile din cache nu așteaptă)."""
+        if isinstance(source, CachedDataSource):
+            cached = source.lookup(symbol, timeframe, lookback_days, useRTH)
+            if cached is not None:
+                return cached
+        request_key = (symbol, timeframe, lookback_days, useRTH)
+        async with self.scheduler.slot(source.pacing_key(symbol), request_key=request_key, contract_key=symbol):
+            return await source.fetch_historical_series(
+                symbol=symbol,
+                timeframe=timeframe,
+                lookback_days=lookback_days,
+                useRTH=useRTH
+            )
+    
+    async def _fetch_batched(
+        self,
+        source: BaseDataSource,
+        symbols: List[str],
+        timeframe: str,
+        lookbacks: Dict[str, int],
+        useRTH: bool
+    ) -> Dict[str, BarSeries]:
+        """Fetch multi-simbol în grupuri de `source.batch_size` (pe conexiune).
+        
+        Un grup ocupă un slot de pacing, dar consumă câte un token per simbol:
+        yf.download face un request HTTP pentru fiecare ticker.
+        
+        Returns:
+            Dict simbol → BarSeries; simbolurile din grupuri eșuate lipsesc
+            (vor fi descărcate individual)
+        """
+        results: Dict[str, BarSeries] = {}
+        if isinstance(source, CachedDataSource):
+            for symbol in symbols:
+                cached = source.lookup(symbol, timeframe, lookbacks[symbol], useRTH)
+                if cached is not None:
+                    results[symbol] = cached
+            symbols = [symbol for symbol in symbols if symbol not in results]
+        
+        # Grupuri pe conexiune (pacing_key), apoi simboluri cu lookback apropiat
+        # în același grup (fereastra = maximul grupului)
+        by_key: Dict[str, List[str]] = {}
+        for symbol in sorted(symbols, key=lambda s: lookbacks[s]):
+            by_key.setdefault(source.pacing_key(symbol), []).append(symbol)
+        size = max(1, source.batch_size)
+        chunks = [(key, ordered[i:i + size]) for key, ordered in by_key.items()
+                  for i in range(0, len(ordered), size)]
+        
+        async def fetch_chunk(pacing_key: str, chunk: List[str]) -> Dict[str, BarSeries]:
+            days = max(lookbacks[s] for s in chunk)
+            try:
+                async with self.scheduler.slot(
+                    pacing_key, request_key=(tuple(chunk), timeframe, days, useRTH), requests=len(chunk)
+                ):
+                    return await source.fetch_historical_batch(chunk, timeframe, days, useRTH)
+            except Exception as e:
+                self.logger.error(f"Batch fetch error for {len(chunk)} symbols: {e}")
+                return {}
+        
+        for batch in await asyncio.gather(*[fetch_chunk(key, chunk) for key, chunk in chunks]):
+            results.update(batch)
+        return results
+    
+    def _history_unreadable(self, symbol: str, timeframe: str, config: dict) -> bool:
+        """True dacă există un fișier de istoric și un watermark, dar istoricul s-a încărcat gol."""
+        if self.watermarks is None or self.watermarks.get(symbol, timeframe) is None:
+            return False
+        base_name = self._history_base(symbol, timeframe, config)
+        return any(Path(f"{base_name}.{ext}").exists() for ext in ("json", "csv"))
+    
+    def _get_watermark(self, symbol: str, timeframe: str, config: dict) -> Optional[datetime]:
+        """Watermark din store sau, la prima rulare incrementală, din istoricul existent."""
+        if self.watermarks is None:
+            return None
+        watermark = self.watermarks.get(symbol, timeframe)
+        if watermark is None:
+            history = self._load_history(symbol, timeframe, config)
+            if len(history):
+                watermark = history[-1].timestamp
+        return watermark
+    
+    def _incremental_lookback(self, watermark: datetime, lookback_days: int) -> int:
+        """Zile de cerut astfel încât fereastra să acopere watermark-ul."""
+        elapsed = pd.Timestamp.now(tz="UTC") - _utc_key(watermark)
+        days = math.ceil(elapsed.total_seconds() / 86400) + 1
+        return max(1, min(lookback_days, days))
+    
+    def _history_base(self, symbol: str, timeframe: str, config: dict) -> str:
+        """Cale (fără extensie) pentru istoricul cumulativ al unui simbol."""
+        data_dir = config.get("data_dir", "data/processed")
+        return f"{data_dir}/{symbol}_{timeframe}{config.get('history_suffix', '')}"
+    
+    def _load_history(self, symbol: str, timeframe: str, config: dict, tz=None, return_sources: bool = False):
+        """Încarcă istoricul salvat (JSON păstrează timezone-ul, CSV ca fallback).
+        
+        Returns:
+            BarSeries; cu return_sources: (BarSeries, sursa per rând sau None)
+        """
+        base_name = self._history_base(symbol, timeframe, config)
+        history, sources = self.normalizer.json_to_series(f"{base_name}.json", return_sources=True)
+        if not len(history):
+            bars = self.normalizer.csv_to_bars(f"{base_name}.csv", tz=tz)
+            history = BarSeries.from_bars(bars, symbol=symbol, timeframe=timeframe)
+            sources = np.array([bar.source for bar in bars], dtype=object)
+        return (history, sources) if return_sources else history
+    
+    def _merge_history(self, symbol: str, timeframe: str, series: BarSeries, config: dict) -> MergeResult:
+        """Combină bars noi cu istoricul existent.
+        
+        La același timestamp câștigă sursa preferată (source_priority), iar la
+        aceeași sursă bar-ul nou; MergeResult.sources spune de unde vine fiecare rând.
+        """
+        history, sources = self._load_history(symbol, timeframe, config, tz=series.tz, return_sources=True)
+        if not len(history) and self._history_unreadable(symbol, timeframe, config):
+            # Salvarea ar suprascrie istoricul cu doar bars noi
+            raise RuntimeError(
+                f"History file for {symbol} {timeframe} exists but could not be loaded, "
+                f"refusing to overwrite it (fix or remove {self._history_base(symbol, timeframe, config)}.*)"
+            )
+        merged = self.merger.merge([history, series], sources=[sources, None])
+        if merged.duplicates:
+            self.logger.info(f"{symbol}: {merged.duplicates} overlapping bars reconciled {merged.source_counts()}")
+        return merged
+    
+    async def _save_bars(
+        self,
+        symbol: str,
+        bars: Union[List[Bar], BarSeries],
+        config: dict,
+        sources: Optional[np.ndarray] = None,
+        changed: Optional[np.ndarray] = None
+    ) -> bool:
+        """Salvează bars în formatele din output_format (CSV, JSON, Parquet).
+        
+        Args:
+            symbol: Simbol stoc
+            bars: Lista de Bar-uri sau BarSeries
             config: Configurație data_collector
+            sources: Sursa per rând (după merge; None = sursa seriei)
+            changed: Timestamp-urile bars noi din `bars` (Parquet rescrie doar
+                partițiile lor; None = toate)
         """
         try:
             timeframe = config.get("timeframe", "1H")
             data_dir = config.get("data_dir", "data/processed")
             output_format = config.get("output_format", ["csv", "json"])
             
-            # Filename
-            from datetime import timezone
-            date_str = datetime.now(timezone.utc).strftime('%Y%m%d')
-            base_name = f"{data_dir}/{symbol}_{timeframe}_{date_str}"
-            
-            # CSV
-            if "csv" in output_format:
-                csv_path = f"{base_name}.csv"
-                self.normalizer.bars_to_csv(bars, csv_path)
+            # Filename: istoric cumulativ în mod incremental, snapshot zilnic altfel
+            if self.watermarks is not None:
+                base_name = self._history_base(symbol, timeframe, config)
+            else:
+                date_str = datetime.now(timezone.utc).strftime('%Y%m%d')
+                base_name = f"{data_dir}/{symbol}_{timeframe}{config.get('history_suffix', '')}_{date_str}"
             
-            # JSON
-            if "json" in output_format:
-                json_path = f"{base_name}.json"
-                self.normalizer.bars_to_json(bars, json_path, symbol, timeframe)
+            # O singură conversie columnară, apoi CSV / JSON / Parquet (scrieri atomice)
+            self.normalizer.export(
+                bars, base_name, output_format, symbol, timeframe,
+                json_compact=config.get("json_compact", False),
+                parquet_dir=config.get("parquet_dir", f"{data_dir}/parquet"),
+                useRTH=config.get("useRTH", True),
+                sources=sources,
+                changed=changed,
+            )
+            # Istoricul de pe disc s-a schimbat: view-urile raw/ajustate se recitesc la cerere
+            self.adjuster.invalidate(symbol, timeframe)
             
             return True
         except Exception as e:
             self.logger.error(f"Save error: {e}")
             return False
     
-    def _get_backup_source(self, source_name: str) -> Optional[BaseDataSource]:
-        """Creează backup source.
+    async def _save_derived(self, symbol: str, series: BarSeries, config: dict, since: Optional[int] = None) -> bool:
+        """Salvează timeframe-urile din derived_timeframes, agregate local din seria colectată.
+        
+        Un singur request per simbol (ex: 1m) acoperă toate timeframe-urile mai mari.
+        Bars derivate au fișierele lor ({symbol}_{tf}_derived.*, Parquet în
+        {parquet_dir}_derived): nu amestecă alinierea resampler-ului cu bars
+        colectate direct în același timeframe. În mod incremental se adaugă
+        la istoricul derivat existent (un lookback scurt nu șterge bars vechi).
         
         Args:
-            source_name: Nume sursă ('YAHOO', 'ALPHA', etc.)
+            symbol: Simbol stoc
+            series: Bars colectate
+            config: Configurație data_collector
+            since: Primul bar nou din `series` (ns UTC); Parquet rescrie doar
+                partițiile bars derivate care îl pot conține (None = toate)
         
         Returns:
-            BaseDataSource sau None
+            True dacă toate timeframe-urile derivate au fost salvate
         """
-        source_name_upper = source_name.upper()
+        timeframes = config.get("derived_timeframes") or []
+        if not timeframes or not len(series):
+            return True
+        derived = self.resampler.resample_many(series, timeframes, config.get("useRTH", True))
+        data_dir = config.get("data_dir", "data/processed")
+        derived_config = {
+            **config,
+            "history_suffix": DERIVED_SUFFIX,
+            "parquet_dir": f"{config.get('parquet_dir', f'{data_dir}/parquet')}{DERIVED_SUFFIX}",
+        }
+        results = []
+        for timeframe, bars in derived.items():
+            if not len(bars):
+                continue
+            tf_config = {**derived_config, "timeframe": timeframe}
+            sources, changed = None, bars.timestamps
+            if since is not None:
+                changed = changed[changed >= since - timeframe_to_seconds(timeframe) * NS]
+            if self.watermarks is not None:
+                try:
+                    merged = self._merge_history(symbol, timeframe, bars, tf_config)
+                except RuntimeError as e:
+                    self.logger.error(f"Derived {timeframe} for {symbol} not saved: {e}")
+                    results.append(False)
+                    continue
+                bars, sources = merged.series, merged.sources
+            results.append(await self._save_bars(symbol, bars, tf_config, sources=sources, changed=changed))
+        self.logger.info(f"{symbol}: derived {', '.join(f'{tf}={len(b)}' for tf, b in derived.items())}")
+        return all(results)
+    
+    def _create_source(self, source_name: str) -> Optional[BaseDataSource]:
+        """Creează o sursă de date (neconectată, cu bus-ul agentului și ring buffer propriu), folosit de SourcePool.
+        
+        Cu data_collector.cache.enabled sursa e învelită în CachedDataSource.
+        
+        Args:
+            source_name: Nume sursă ('IBKR', 'YAHOO', etc.)
         
+        Returns:
+            BaseDataSource sau None
+        """
+        data_collector_config = self.config.get("data_collector", {})
+        source = self._build_source(source_name.upper())
+        if source is not None:
+            cache_config = data_collector_config.get("cache") or {}
+            if cache_config.get("enabled", False):
+                # Răspunsuri istorice refolosite între rulări (TTL per timeframe, LRU pe disc)
+                source = CachedDataSource.from_config(
+                    source, cache_config, data_collector_config.get("data_dir", "data/processed")
+                )
+            source.bus = self.bus
+            source.history = RingBufferStore(data_collector_config.get("ring_buffer_depth", 500))
+        return source
+    
+    def _build_source(self, source_name_upper: str) -> Optional[BaseDataSource]:
+        """Instanțiază sursa după nume (fără conectare)."""
         if source_name_upper == "IBKR":
-            # Lazy import pentru a evita event loop issues în Streamlit
-            from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
-            ibkr_config = self.config.get("ibkr", {})
-            return IBKRDataSource(
-                host=ibkr_config.get("host", "127.0.0.1"),
-                port=ibkr_config.get("port", 7497),
-                clientId=ibkr_config.get("clientId", 1)
-            )
+            try:
+                ibkr_config = self.config.get("ibkr", {})
+                client_ids = self._ibkr_client_ids(ibkr_config)
+                if len(client_ids) == 1:
+                    return self._build_ibkr(ibkr_config, client_ids[0])
+                # Mai multe conexiuni: simboluri împărțite prin hash consistent, pacing per clientId
+                self.logger.info(f"IBKR sharded over clientIds {client_ids}")
+                return ShardedDataSource(
+                    [self._build_ibkr(ibkr_config, client_id) for client_id in client_ids],
+                    retry_after=self.config.get("data_collector", {}).get("source_retry_seconds", 60),
+                )
+            except ImportError as e:
+                self.logger.error(f"Cannot create IBKR source: {e}")
+                return None
         elif source_name_upper == "YAHOO":
             try:
-                return YahooDataSource()
+                return YahooDataSource(
+                    batch_size=self.config.get("data_collector", {}).get("yahoo_batch_size", 50)
+                )
             except ImportError as e:
                 self.logger.error(f"Cannot create Yahoo source: {e}")
                 return None
         else:
-            self.logger.warning(f"Unknown backup source: {source_name}")
+            self.logger.warning(f"Unknown data source: {source_name_upper}")
             return None
     
+    def _build_ibkr(self, ibkr_config: dict, client_id: int) -> BaseDataSource:
+        """O conexiune IBKR (reală sau simulată) cu clientId-ul dat."""
+        # Lazy import pentru a evita event loop issues în Streamlit
+        from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+        ib = None
+        if ibkr_config.get("simulator", False):
+            # IB simulat local (teste/benchmark fără TWS)
+            from src.agents.data_collection.sources.ib_simulator import SimulatedIB
+            ib = SimulatedIB.from_config(ibkr_config.get("simulator_options"))
+            self.logger.info("Using simulated IBKR (no TWS connection)")
+        return IBKRDataSource(
+            host=ibkr_config.get("host", "127.0.0.1"),
+            port=ibkr_config.get("port", 7497),
+            clientId=client_id,
+            ib=ib,
+            request_timeout=ibkr_config.get("request_timeout", 60),
+            connect_timeout=ibkr_config.get("connect_timeout", 10),
+            contract_cache=ibkr_config.get("contract_cache"),
+            contract_cache_ttl_days=ibkr_config.get("contract_cache_ttl_days", 7)
+        )
+    
+    def _ibkr_client_ids(self, ibkr_config: dict) -> List[int]:
+        """clientId-urile conexiunilor IBKR: `client_ids` explicit sau `connections` consecutive de la `clientId`."""
+        client_ids = ibkr_config.get("client_ids")
+        if not client_ids:
+            first = ibkr_config.get("clientId", 1)
+            client_ids = [first + k for k in range(max(1, int(ibkr_config.get("connections", 1))))]
+        if len(client_ids) > MAX_IBKR_CONNECTIONS:
+            self.logger.warning(
+                f"{len(client_ids)} IBKR connections requested, TWS accepts {MAX_IBKR_CONNECTIONS}; extra ignored"
+            )
+            client_ids = client_ids[:MAX_IBKR_CONNECTIONS]
+        return list(dict.fromkeys(client_ids))
+    
     async def shutdown(self) -> bool:
         """Dezactivare controlată.
         
@@ -217,8 +858,11 @@ class DataCollectionAgent:
             True dacă shutdown-ul reușește
         """
         try:
-            if self.data_source:
+            # Sursa primară setată din afara pool-ului (ex: teste) se închide separat
+            if self.data_source and self.data_source not in self.sources:
                 await self.data_source.disconnect()
+            await self.sources.close_all()
+            self.bus.close()
             self.logger.info("DataCollectionAgent shutdown completed")
             return True
         except Exception as e:
@@ -227,17 +871,41 @@ class DataCollectionAgent:
 
 
 # Entry point
-async def main(config_path: Optional[str] = None):
+async def main(
+    config_path: Optional[str] = None,
+    backfill_start: Optional[str] = None,
+    fill_gaps: bool = False,
+    daemon: bool = False
+):
     """Entry point pentru rulare standalone."""
     collector = DataCollectionAgent(config_path)
     if await collector.initialize():
-        await collector.collect_all()
+        if daemon:
+            runner = CollectorDaemon.from_config(collector)
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, runner.stop)
+                except (NotImplementedError, RuntimeError):
+                    pass  # Windows: oprire cu Ctrl+C (KeyboardInterrupt)
+            await runner.run()
+        elif backfill_start:
+            await collector.backfill(datetime.fromisoformat(backfill_start))
+        elif fill_gaps:
+            await collector.fill_gaps()
+        else:
+            await collector.collect_all()
         await collector.shutdown()
     else:
         print("Failed to initialize collector")
 
 
 if __name__ == "__main__":
-    import sys
-    config_file = sys.argv[1] if len(sys.argv) > 1 else "config/config.yaml"
-    asyncio.run(main(config_file))
+    import argparse
+    parser = argparse.ArgumentParser(description="Data Collection Agent")
+    parser.add_argument("config", nargs="?", default="config/config.yaml")
+    parser.add_argument("--backfill", metavar="START", help="Backfill IBKR de la data ISO (ex: 2020-01-01)")
+    parser.add_argument("--fill-gaps", action="store_true", help="Descarcă doar intervalele lipsă din istoric")
+    parser.add_argument("--daemon", action="store_true", help="Rulează continuu, cu colectări la închiderea bars")
+    args = parser.parse_args()
+    asyncio.run(main(args.config, args.backfill, args.fill_gaps, args.daemon))
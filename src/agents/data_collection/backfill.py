@@ -0,0 +1,313 @@
+"""
+Backfill - Descărcare istoric lung în ferestre acceptate de IBKR, cu checkpoint
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+import asyncio
+import json
+import math
+import os
+import shutil
+
+import pandas as pd
+
+from src.agents.data_collection.scheduler import RequestScheduler
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import BarSeries
+from src.common.utils.helpers import timeframe_to_seconds
+
+
+# Durata maximă (zile) a unui request IBKR per bar size; cereri mai mari sunt respinse/throttled
+DEFAULT_WINDOW_DAYS = {
+    "1m": 1,
+    "5m": 7,
+    "15m": 7,
+    "1H": 30,
+    "4H": 30,
+    "1D": 365,
+}
+
+
+@dataclass(frozen=True)
+class BackfillWindow:
+    """O fereastră [start, end) descărcată cu un singur reqHistoricalData."""
+
+    index: int
+    start: datetime
+    end: datetime
+
+    @property
+    def days(self) -> int:
+        return max(1, math.ceil((self.end - self.start).total_seconds() / 86400))
+
+    @property
+    def duration_str(self) -> str:
+        """durationStr IBKR ('N D', respectiv '1 Y' pentru un an)"""
+        return "1 Y" if self.days >= 365 else f"{self.days} D"
+
+
+@dataclass
+class BackfillResult:
+    """Rezultatul unui backfill: seria combinată și ferestrele rămase nedescărcate."""
+
+    series: BarSeries
+    windows_total: int
+    failed: List[int] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed
+
+
+class BackfillPlanner:
+    """Împarte un interval lung în ferestre de dimensiune acceptată pentru bar size."""
+
+    def __init__(self, window_days: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            window_days: Suprascrieri pentru DEFAULT_WINDOW_DAYS (timeframe → zile)
+        """
+        self.window_days = {**DEFAULT_WINDOW_DAYS, **(window_days or {})}
+
+    def window_for(self, timeframe: str) -> timedelta:
+        """Dimensiunea ferestrei pentru un timeframe."""
+        bar_seconds = timeframe_to_seconds(timeframe)
+        days = self.window_days.get(timeframe)
+        if not days or days * 86400 < bar_seconds:
+            raise ValueError(f"Invalid backfill window for {timeframe}: {days}")
+        return timedelta(days=days)
+
+    def plan(self, start: datetime, end: datetime, timeframe: str) -> List[BackfillWindow]:
+        """Ferestrele care acoperă [start, end), de la cea mai recentă spre trecut.
+
+        Args:
+            start: Începutul intervalului (naive = UTC)
+            end: Sfârșitul intervalului (naive = UTC)
+            timeframe: Timeframe-ul bars
+
+        Returns:
+            Lista de ferestre (index 0 = cea mai recentă)
+        """
+        start, end = _as_utc(start), _as_utc(end)
+        if start >= end:
+            return []
+        step = self.window_for(timeframe)
+        windows = []
+        window_end = end
+        while window_end > start:
+            window_start = max(start, window_end - step)
+            windows.append(BackfillWindow(len(windows), window_start, window_end))
+            window_end = window_start
+        return windows
+
+
+class BackfillCheckpoint:
+    """Progresul unui backfill pe disc: state.json + un .npz per fereastră terminată.
+
+    Un checkpoint e valabil doar pentru aceiași parametri (interval, useRTH,
+    dimensiune fereastră); altfel se ignoră și backfill-ul pornește de la zero.
+    """
+
+    STATE_FILE = "state.json"
+
+    def __init__(self, directory: str, params: dict):
+        """
+        Args:
+            directory: Directorul checkpoint-ului (unul per simbol/timeframe)
+            params: Parametrii backfill-ului (serializabili JSON)
+        """
+        self.directory = Path(directory)
+        self.params = params
+        self.logger = get_logger(__name__)
+        self._done: Set[int] = set()
+        self.load()
+
+    @classmethod
+    def saved_params(cls, directory: str) -> Optional[dict]:
+        """Parametrii unui checkpoint existent (None dacă lipsește sau e ilizibil)."""
+        state_path = Path(directory) / cls.STATE_FILE
+        if not state_path.exists():
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                params = json.load(f).get("params")
+        except (OSError, ValueError, AttributeError):
+            return None
+        return params if isinstance(params, dict) else None
+
+    def load(self) -> None:
+        """Încarcă ferestrele terminate (dacă checkpoint-ul corespunde parametrilor)."""
+        state_path = self.directory / self.STATE_FILE
+        if not state_path.exists():
+            return
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cannot read backfill checkpoint {state_path}: {e}")
+            return
+        if not isinstance(state, dict) or state.get("params") != self.params:
+            self.logger.info(f"Backfill checkpoint {self.directory} has other parameters, starting over")
+            return
+        self._done = {i for i in state.get("done", []) if self._window_path(i).exists()}
+
+    @property
+    def completed(self) -> Set[int]:
+        return set(self._done)
+
+    def load_window(self, index: int) -> BarSeries:
+        return BarSeries.load_npz(str(self._window_path(index)))
+
+    def save_window(self, index: int, series: BarSeries) -> None:
+        """Salvează o fereastră terminată și actualizează state.json (tmp + rename)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._window_path(index)
+        tmp_path = path.with_name(path.name + ".tmp")
+        series.save_npz(str(tmp_path))
+        os.replace(tmp_path, path)
+
+        self._done.add(index)
+        state_path = self.directory / self.STATE_FILE
+        tmp_state = state_path.with_name(state_path.name + ".tmp")
+        with open(tmp_state, 'w', encoding='utf-8') as f:
+            json.dump({"params": self.params, "done": sorted(self._done)}, f)
+        os.replace(tmp_state, state_path)
+
+    def clear(self) -> None:
+        """Șterge checkpoint-ul (după un backfill complet)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._done.clear()
+
+    def _window_path(self, index: int) -> Path:
+        return self.directory / f"window_{index:05d}.npz"
+
+
+class Backfiller:
+    """Rulează ferestrele unui backfill concurent, în limitele de pacing ale sursei.
+
+    Sursa trebuie să expună `fetch_window(symbol, timeframe, end, duration_str, useRTH)`
+    (IBKRDataSource). Ferestrele eșuate rămân în checkpoint și se reiau la
+    următoarea rulare.
+    """
+
+    def __init__(
+        self,
+        source,
+        scheduler: RequestScheduler,
+        planner: Optional[BackfillPlanner] = None,
+        checkpoint_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            source: Sursa de date (cu fetch_window)
+            scheduler: Scheduler-ul de pacing partajat cu colectarea
+            planner: Planner-ul de ferestre (default: DEFAULT_WINDOW_DAYS)
+            checkpoint_dir: Director pentru checkpoint-uri (None = fără checkpoint)
+        """
+        if not hasattr(source, "fetch_window"):
+            raise ValueError(f"Source {source.name} does not support windowed backfill")
+        self.source = source
+        self.scheduler = scheduler
+        self.planner = planner or BackfillPlanner()
+        self.checkpoint_dir = checkpoint_dir
+        self.logger = get_logger(__name__)
+
+    async def run(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        useRTH: bool = True
+    ) -> BackfillResult:
+        """Descarcă [start, end) pentru un simbol.
+
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe-ul bars
+            start: Începutul intervalului (naive = UTC)
+            end: Sfârșitul intervalului (default: acum; la reluare, cel din checkpoint)
+            useRTH: Ore regulate de trading
+
+        Returns:
+            BackfillResult cu seria sortată, fără duplicate, limitată la [start, end)
+        """
+        start = _as_utc(start)
+        params = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "start": start.isoformat(),
+            "end": None,
+            "useRTH": useRTH,
+            "window_days": self.planner.window_days.get(timeframe),
+        }
+        checkpoint_path = f"{self.checkpoint_dir}/{symbol}_{timeframe}" if self.checkpoint_dir else None
+        if end is None:
+            # Fără end explicit, un backfill întrerupt se reia cu end-ul lui (altfel
+            # ferestrele s-ar decala și checkpoint-ul nu s-ar mai potrivi)
+            end = datetime.now(timezone.utc)
+            saved = BackfillCheckpoint.saved_params(checkpoint_path) if checkpoint_path else None
+            if saved is not None and saved.get("end") and {**saved, "end": None} == params:
+                end = datetime.fromisoformat(saved["end"])
+                self.logger.info(f"Backfill {symbol} {timeframe}: resuming up to {saved['end']}")
+        end = _as_utc(end)
+        params["end"] = end.isoformat()
+        windows = self.planner.plan(start, end, timeframe)
+
+        checkpoint = None
+        if checkpoint_path:
+            checkpoint = BackfillCheckpoint(checkpoint_path, params)
+
+        results: Dict[int, BarSeries] = {}
+        if checkpoint is not None:
+            for index in checkpoint.completed:
+                results[index] = checkpoint.load_window(index)
+        pending = [w for w in windows if w.index not in results]
+        self.logger.info(
+            f"Backfill {symbol} {timeframe}: {len(windows)} windows, "
+            f"{len(windows) - len(pending)} from checkpoint"
+        )
+
+        # Sursele cu mai multe conexiuni: pacing-ul conexiunii simbolului
+        pacing_key = self.source.pacing_key(symbol) if hasattr(self.source, "pacing_key") else self.source.name
+
+        async def fetch(window: BackfillWindow) -> None:
+            request_key = (symbol, timeframe, window.end.isoformat(), window.duration_str, useRTH)
+            try:
+                async with self.scheduler.slot(pacing_key, request_key=request_key, contract_key=symbol):
+                    series = await self.source.fetch_window(
+                        symbol, timeframe, window.end, window.duration_str, useRTH
+                    )
+            except Exception as e:
+                self.logger.error(f"Backfill window {window.index} for {symbol} failed: {e}")
+                return
+            results[window.index] = series
+            if checkpoint is not None:
+                checkpoint.save_window(window.index, series)
+
+        await asyncio.gather(*[fetch(w) for w in pending])
+
+        failed = sorted(w.index for w in windows if w.index not in results)
+        # Ferestrele se suprapun la margini (zile întregi): concat cronologic + unique
+        stitched = BarSeries.concat([results[i] for i in sorted(results, reverse=True)]).unique()
+        start_ns, end_ns = pd.Timestamp(start).value, pd.Timestamp(end).value
+        stitched = stitched[(stitched.timestamps >= start_ns) & (stitched.timestamps < end_ns)]
+        if not len(stitched):
+            stitched = BarSeries.empty(symbol, timeframe, self.source.name)
+
+        if failed:
+            self.logger.warning(f"Backfill {symbol} {timeframe}: {len(failed)} windows failed, rerun to resume")
+        elif checkpoint is not None:
+            checkpoint.clear()
+        self.logger.info(f"Backfill {symbol} {timeframe}: {len(stitched)} bars")
+        return BackfillResult(stitched, len(windows), failed)
+
+
+def _as_utc(ts: datetime) -> datetime:
+    """datetime aware în UTC (naive = UTC)."""
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
@@ -0,0 +1,238 @@
+"""
+Bar Bus - Distribuție publish/subscribe a bars live către consumatori
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Deque, Dict, List, Optional, Tuple
+import asyncio
+
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import Bar
+
+
+class BackpressurePolicy(str, Enum):
+    """Ce se întâmplă când coada unui abonat e plină."""
+
+    DROP_OLDEST = "drop_oldest"   # se pierde cel mai vechi update
+    COALESCE = "coalesce"         # update-urile aceluiași bar se înlocuiesc; apoi ca DROP_OLDEST
+    BLOCK = "block"               # publish() așteaptă consumatorul (fără pierderi)
+
+
+@dataclass(slots=True)
+class BarUpdate:
+    """Un update live: bar-ul curent (în formare) sau un bar închis."""
+
+    bar: Bar
+    closed: bool
+
+
+class SubscriptionClosed(Exception):
+    """Abonamentul a fost închis și nu mai are update-uri."""
+
+
+class Subscription:
+    """Coada unui consumator pentru un (symbol, timeframe); iterator async.
+
+    Exemplu:
+        async for update in bus.subscribe("AAPL", "1m", closed_only=True):
+            ...
+
+    Toate metodele se apelează din thread-ul event loop-ului.
+    """
+
+    def __init__(
+        self,
+        bus: "BarBus",
+        symbol: Optional[str],
+        timeframe: Optional[str],
+        maxsize: int,
+        policy: BackpressurePolicy,
+        closed_only: bool
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self._bus = bus
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed_only = closed_only
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: Deque[BarUpdate] = deque()
+        # BLOCK cu producător sincron (callback ib_insync): nu-l putem opri,
+        # update-urile peste maxsize așteaptă aici, în ordine
+        self._overflow: Deque[BarUpdate] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items) + len(self._overflow)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> BarUpdate:
+        try:
+            return await self.get()
+        except SubscriptionClosed:
+            raise StopAsyncIteration
+
+    async def get(self) -> BarUpdate:
+        """Următorul update (așteaptă fără polling).
+
+        Raises:
+            SubscriptionClosed: Abonamentul e închis și coada e goală
+        """
+        while not self._items:
+            if self._closed:
+                raise SubscriptionClosed()
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        update = self._items.popleft()
+        if self._overflow:
+            self._items.append(self._overflow.popleft())
+        if len(self._items) < self.maxsize:
+            self._not_full.set()
+        return update
+
+    def close(self) -> None:
+        """Închide abonamentul; update-urile deja primite se pot citi în continuare."""
+        if self._closed:
+            return
+        self._closed = True
+        self._bus._remove(self)
+        self._not_empty.set()
+        self._not_full.set()
+
+    def _wants(self, update: BarUpdate) -> bool:
+        return not self._closed and (update.closed or not self.closed_only)
+
+    def _offer(self, update: BarUpdate) -> None:
+        """Adaugă fără să aștepte, aplicând politica de backpressure."""
+        items = self._items
+        if (self.policy is BackpressurePolicy.COALESCE and items
+                and items[-1].bar.timestamp == update.bar.timestamp and not items[-1].closed):
+            items[-1] = update
+            self.coalesced += 1
+        elif self.policy is BackpressurePolicy.BLOCK and (self._overflow or len(items) >= self.maxsize):
+            self._overflow.append(update)
+        else:
+            if len(items) >= self.maxsize:
+                items.popleft()
+                self.dropped += 1
+            items.append(update)
+        if len(items) >= self.maxsize:
+            self._not_full.clear()
+        self._not_empty.set()
+
+    async def _put(self, update: BarUpdate) -> None:
+        """Adaugă, așteptând loc în coadă pentru politica BLOCK."""
+        if self.policy is BackpressurePolicy.BLOCK:
+            while not self._closed and (self._overflow or len(self._items) >= self.maxsize):
+                self._not_full.clear()
+                await self._not_full.wait()
+            if self._closed:
+                return
+        self._offer(update)
+
+
+class BarBus:
+    """Fan-out al update-urilor live către abonați, per (symbol, timeframe).
+
+    symbol/timeframe None la subscribe = toate (ex: recorder pentru toate simbolurile).
+    """
+
+    def __init__(self, maxsize: int = 1000, policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST):
+        """
+        Args:
+            maxsize: Dimensiunea implicită a cozii unui abonat
+            policy: Politica implicită de backpressure
+        """
+        self.maxsize = maxsize
+        self.policy = BackpressurePolicy(policy)
+        self._subs: Dict[Tuple[Optional[str], Optional[str]], List[Subscription]] = {}
+        self.logger = get_logger(__name__)
+
+    @classmethod
+    def from_config(cls, data_collector_config: dict) -> "BarBus":
+        """Construiește bus-ul din secțiunea `live` a config-ului data_collector."""
+        live = data_collector_config.get("live", {}) or {}
+        return cls(
+            maxsize=live.get("queue_size", 1000),
+            policy=BackpressurePolicy(live.get("backpressure", BackpressurePolicy.DROP_OLDEST.value))
+        )
+
+    def subscribe(
+        self,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        maxsize: Optional[int] = None,
+        policy: Optional[BackpressurePolicy] = None,
+        closed_only: bool = False
+    ) -> Subscription:
+        """Abonează un consumator.
+
+        Args:
+            symbol: Simbol (None = toate)
+            timeframe: Timeframe (None = toate)
+            maxsize: Dimensiune coadă (default: a bus-ului)
+            policy: Politica de backpressure (default: a bus-ului)
+            closed_only: Doar bars închise (fără update-urile bar-ului în formare)
+
+        Returns:
+            Subscription (iterator async)
+        """
+        sub = Subscription(
+            self, symbol, timeframe,
+            maxsize or self.maxsize,
+            BackpressurePolicy(policy) if policy is not None else self.policy,
+            closed_only
+        )
+        self._subs.setdefault((symbol, timeframe), []).append(sub)
+        return sub
+
+    def has_subscribers(self, symbol: str, timeframe: str) -> bool:
+        return bool(self._matching(symbol, timeframe))
+
+    def publish_nowait(self, bar: Bar, closed: bool) -> None:
+        """Publică din cod sincron (callback-uri ale sursei); nu blochează niciodată."""
+        update = BarUpdate(bar, closed)
+        for sub in self._matching(bar.symbol, bar.timeframe):
+            if sub._wants(update):
+                sub._offer(update)
+
+    async def publish(self, bar: Bar, closed: bool) -> None:
+        """Publică din cod async; cu BLOCK așteaptă abonații lenți."""
+        update = BarUpdate(bar, closed)
+        for sub in self._matching(bar.symbol, bar.timeframe):
+            if sub._wants(update):
+                await sub._put(update)
+
+    def close(self) -> None:
+        """Închide toate abonamentele."""
+        for subs in list(self._subs.values()):
+            for sub in list(subs):
+                sub.close()
+
+    def _matching(self, symbol: str, timeframe: str) -> List[Subscription]:
+        subs: List[Subscription] = []
+        for key in ((symbol, timeframe), (symbol, None), (None, timeframe), (None, None)):
+            subs.extend(self._subs.get(key, ()))
+        return subs
+
+    def _remove(self, sub: Subscription) -> None:
+        key = (sub.symbol, sub.timeframe)
+        subs = self._subs.get(key)
+        if subs and sub in subs:
+            subs.remove(sub)
+            if not subs:
+                del self._subs[key]
@@ -0,0 +1,324 @@
+"""
+Corporate Actions - Split-uri și dividende per simbol, ajustare vectorizată a bars (view raw + ajustat)
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import BarSeries
+
+
+SPLIT = "split"
+DIVIDEND = "dividend"
+
+
+@dataclass(frozen=True)
+class CorporateAction:
+    """Un split sau un dividend, efectiv de la ex-date (bars de dinainte se ajustează)."""
+
+    symbol: str
+    ex_date: date
+    kind: str           # 'split' | 'dividend'
+    value: float        # split: acțiuni noi per acțiune veche (4.0 = 4:1, 0.1 = reverse 1:10); dividend: sumă per acțiune
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ex_date": self.ex_date.isoformat(), "kind": self.kind, "value": self.value}
+
+
+class CorporateActionStore:
+    """Split-urile și dividendele fiecărui simbol, persistate într-un JSON.
+
+    Format: {"AAPL": {"checked_at": "...", "actions": [{"ex_date": "2020-08-31",
+    "kind": "split", "value": 4.0}, ...]}}. Fiecare simbol are o versiune care
+    crește la orice modificare a acțiunilor lui; view-urile ajustate se
+    reconstruiesc doar pentru simbolurile cu versiune nouă.
+    """
+
+    def __init__(self, filepath: Optional[str] = None):
+        """
+        Args:
+            filepath: Fișier JSON (None = doar în memorie)
+        """
+        self.filepath = Path(filepath) if filepath else None
+        self.logger = get_logger(__name__)
+        self._actions: Dict[str, List[CorporateAction]] = {}
+        self._checked_at: Dict[str, datetime] = {}
+        self._versions: Dict[str, int] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Încarcă acțiunile de pe disc (dacă fișierul există)."""
+        if self.filepath is None or not self.filepath.exists():
+            return
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                entries = json.load(f) or {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cannot read corporate actions from {self.filepath}: {e}")
+            return
+        for symbol, entry in entries.items():
+            actions = []
+            for item in entry.get("actions", []):
+                try:
+                    actions.append(CorporateAction(
+                        symbol, date.fromisoformat(item["ex_date"]), item["kind"], float(item["value"])
+                    ))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self._actions[symbol] = sorted(actions, key=lambda a: (a.ex_date, a.kind))
+            if entry.get("checked_at"):
+                self._checked_at[symbol] = datetime.fromisoformat(entry["checked_at"])
+            self._versions[symbol] = self._versions.get(symbol, 0) + 1
+
+    def save(self) -> bool:
+        """Scrie acțiunile pe disc (tmp + rename atomic).
+
+        Returns:
+            True dacă scrierea reușește (sau nu există fișier)
+        """
+        if self.filepath is None or not self._dirty:
+            return True
+        entries = {}
+        for symbol in sorted(set(self._actions) | set(self._checked_at)):
+            entry: Dict[str, Any] = {"actions": [a.to_dict() for a in self._actions.get(symbol, [])]}
+            if symbol in self._checked_at:
+                entry["checked_at"] = self._checked_at[symbol].isoformat()
+            entries[symbol] = entry
+        try:
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.filepath.with_suffix(self.filepath.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.filepath)
+            self._dirty = False
+            return True
+        except OSError as e:
+            self.logger.error(f"Cannot save corporate actions: {e}")
+            return False
+
+    def actions(self, symbol: str) -> List[CorporateAction]:
+        """Acțiunile simbolului, sortate după ex-date."""
+        return list(self._actions.get(symbol, []))
+
+    def version(self, symbol: str) -> int:
+        """Versiunea acțiunilor simbolului (crește la fiecare modificare)."""
+        return self._versions.get(symbol, 0)
+
+    def add_split(self, symbol: str, ex_date: date, ratio: float) -> bool:
+        """Adaugă un split (ratio = acțiuni noi per acțiune veche)."""
+        return self.update(symbol, self.actions(symbol) + [CorporateAction(symbol, ex_date, SPLIT, float(ratio))])
+
+    def add_dividend(self, symbol: str, ex_date: date, amount: float) -> bool:
+        """Adaugă un dividend (sumă per acțiune, nete de split-urile ulterioare)."""
+        return self.update(symbol, self.actions(symbol) + [CorporateAction(symbol, ex_date, DIVIDEND, float(amount))])
+
+    def update(self, symbol: str, actions: Iterable[CorporateAction]) -> bool:
+        """Înlocuiește acțiunile simbolului.
+
+        Returns:
+            True dacă s-a schimbat ceva (versiunea simbolului crește)
+        """
+        actions = sorted(set(actions), key=lambda a: (a.ex_date, a.kind))
+        invalid = [a for a in actions if a.kind not in (SPLIT, DIVIDEND) or a.value <= 0]
+        if invalid:
+            raise ValueError(f"Invalid corporate actions for {symbol}: {invalid}")
+        if actions == self._actions.get(symbol, []):
+            return False
+        self._actions[symbol] = actions
+        self._versions[symbol] = self._versions.get(symbol, 0) + 1
+        self._dirty = True
+        return True
+
+    def mark_checked(self, symbol: str, when: Optional[datetime] = None) -> None:
+        """Momentul ultimei verificări la sursă (pentru refresh periodic)."""
+        self._checked_at[symbol] = when or datetime.now(timezone.utc)
+        self._dirty = True
+
+    def needs_refresh(self, symbol: str, max_age: timedelta) -> bool:
+        """True dacă simbolul nu a mai fost verificat de `max_age`."""
+        checked_at = self._checked_at.get(symbol)
+        return checked_at is None or datetime.now(timezone.utc) - checked_at > max_age
+
+
+class CorporateActionAdjuster:
+    """Ajustează bars pentru split-uri și dividende, pe coloane întregi.
+
+    Factorul unui bar e produsul factorilor tuturor acțiunilor cu ex-date
+    după ziua bar-ului (produs cumulativ de la coadă + un searchsorted):
+
+    - split r: prețuri × 1/r, volum × r
+    - dividend d: prețuri × (1 - d / close-ul din ziua dinaintea ex-date), volum neschimbat
+
+    Istoricul raw și view-ul ajustat se țin în cache per (simbol, timeframe):
+    o acțiune nouă reconstruiește doar view-ul ajustat al simbolului ei, un
+    istoric nou salvat invalidează doar simbolul respectiv. Toate sursele se
+    ajustează la fel: istoricul salvat e raw (și cel din Yahoo, descărcat fără
+    auto_adjust), deci un split apărut după salvare se aplică tuturor rândurilor.
+    """
+
+    def __init__(self, store: CorporateActionStore, tz: str = "America/New_York", dividends: bool = True):
+        """
+        Args:
+            store: Acțiunile corporative
+            tz: Timezone-ul bursei (ziua de sesiune a fiecărui bar)
+            dividends: False = doar split-uri
+        """
+        self.store = store
+        self.tz = tz
+        self.dividends = dividends
+        self.logger = get_logger(__name__)
+        self._raw: Dict[Tuple[str, str], BarSeries] = {}
+        self._adjusted: Dict[Tuple[str, str], Tuple[int, BarSeries]] = {}
+
+    def factors(self, series: BarSeries) -> Tuple[np.ndarray, np.ndarray]:
+        """Factorii de ajustare per bar.
+
+        Args:
+            series: Bars raw ale unui simbol
+
+        Returns:
+            (factor preț, factor volum), float64 de lungimea seriei
+        """
+        n = len(series)
+        price = np.ones(n)
+        volume = np.ones(n)
+        actions = [a for a in self.store.actions(series.symbol) if self.dividends or a.kind == SPLIT]
+        if not n or not actions:
+            return price, volume
+
+        days = self._session_days(series)
+        order = np.argsort(days, kind="stable")
+        sorted_days = days[order]
+        ex = np.array([a.ex_date for a in actions], dtype="datetime64[D]")
+        is_split = np.array([a.kind == SPLIT for a in actions])
+        values = np.array([a.value for a in actions])
+
+        # Close-ul raw din ultima zi dinaintea fiecărui ex-date (pentru dividende)
+        prev = np.searchsorted(sorted_days, ex, side="left") - 1
+        prev_close = np.where(prev >= 0, series.close[order[np.maximum(prev, 0)]], np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            dividend_factor = 1.0 - values / prev_close
+        bad = ~is_split & ~(dividend_factor > 0)
+        if np.any(bad & (prev >= 0)):
+            self.logger.warning(f"{series.symbol}: dividends larger than the previous close ignored")
+        dividend_factor = np.where(bad, 1.0, dividend_factor)
+
+        step_price = np.where(is_split, 1.0 / values, dividend_factor)
+        step_volume = np.where(is_split, values, 1.0)
+        # Produs cumulativ de la coadă: cum[k] = produsul acțiunilor k..end
+        cum_price = np.r_[np.cumprod(step_price[::-1])[::-1], 1.0]
+        cum_volume = np.r_[np.cumprod(step_volume[::-1])[::-1], 1.0]
+        pos = np.searchsorted(ex, days, side="right")
+        return cum_price[pos], cum_volume[pos]
+
+    def adjust(self, series: BarSeries) -> BarSeries:
+        """Seria ajustată (prețuri și WAP × factor preț, volum × factor volum).
+
+        Returns:
+            BarSeries nouă cu normalized=True (seria raw nu se modifică)
+        """
+        price, volume = self.factors(series)
+        adjusted = series._with_columns({
+            "timestamps": series.timestamps,
+            "open": series.open * price,
+            "high": series.high * price,
+            "low": series.low * price,
+            "close": series.close * price,
+            "volume": np.rint(series.volume * volume).astype(np.int64),
+            "count": series.count,
+            "wap": series.wap * price,
+            "has_gaps": series.has_gaps,
+        })
+        adjusted.normalized = True
+        return adjusted
+
+    def view(
+        self,
+        symbol: str,
+        timeframe: str,
+        loader: Callable[[], BarSeries],
+        adjusted: bool = True
+    ) -> BarSeries:
+        """Istoricul simbolului, raw sau ajustat, din cache.
+
+        Args:
+            symbol: Simbol
+            timeframe: Timeframe
+            loader: Încarcă seria raw la prima cerere sau după invalidate()
+            adjusted: False = seria raw
+
+        Returns:
+            BarSeries partajat între apelanți (nu se modifică in-place)
+        """
+        key = (symbol, timeframe)
+        raw = self._raw.get(key)
+        if raw is None:
+            raw = loader()
+            self._raw[key] = raw
+            self._adjusted.pop(key, None)
+        if not adjusted:
+            return raw
+
+        version = self.store.version(symbol)
+        cached = self._adjusted.get(key)
+        if cached is None or cached[0] != version:
+            if cached is not None:
+                self.logger.info(f"{symbol} {timeframe}: corporate actions changed, rebuilding adjusted view")
+            cached = (version, self.adjust(raw))
+            self._adjusted[key] = cached
+        return cached[1]
+
+    def invalidate(self, symbol: str, timeframe: Optional[str] = None) -> None:
+        """Uită view-urile unui simbol (după ce istoricul lui s-a schimbat pe disc)."""
+        for key in [k for k in self._raw if k[0] == symbol and timeframe in (None, k[1])]:
+            del self._raw[key]
+        for key in [k for k in self._adjusted if k[0] == symbol and timeframe in (None, k[1])]:
+            del self._adjusted[key]
+
+    def _session_days(self, series: BarSeries) -> np.ndarray:
+        """Ziua de sesiune a fiecărui bar (datetime64[D]), ca ExchangeCalendar."""
+        index = series.datetime_index()
+        if not (index == index.normalize()).all():
+            # Bars cu oră → ziua în timezone-ul bursei; bars zilnice la miezul nopții → eticheta lor
+            index = (index if index.tz is not None else index.tz_localize("UTC")).tz_convert(self.tz)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.normalize().values.astype("datetime64[D]")
+
+
+def actions_from_frame(symbol: str, frame: pd.DataFrame) -> List[CorporateAction]:
+    """Acțiuni din tabelul yfinance `Ticker.actions` (coloane Dividends, Stock Splits).
+
+    Yahoo raportează dividendele ajustate la split-urile ulterioare; aici se
+    readuc la suma plătită efectiv, ca factorul să folosească close-ul raw.
+    """
+    if frame is None or frame.empty:
+        return []
+    index = pd.DatetimeIndex(frame.index)
+    days = (index.tz_localize(None) if index.tz is not None else index).normalize().values.astype("datetime64[D]")
+    splits = frame["Stock Splits"].fillna(0).to_numpy(np.float64) if "Stock Splits" in frame else np.zeros(len(frame))
+    dividends = frame["Dividends"].fillna(0).to_numpy(np.float64) if "Dividends" in frame else np.zeros(len(frame))
+
+    split_days = days[splits > 0]
+    split_ratios = splits[splits > 0]
+    order = np.argsort(split_days)
+    split_days, split_ratios = split_days[order], split_ratios[order]
+    later = np.r_[np.cumprod(split_ratios[::-1])[::-1], 1.0]
+
+    actions = [CorporateAction(symbol, pd.Timestamp(d).date(), SPLIT, float(r))
+               for d, r in zip(split_days.tolist(), split_ratios.tolist())]
+    has_dividend = dividends > 0
+    # Split în aceeași zi cu dividendul: suma e deja pe acțiuni noi
+    raw_amounts = dividends[has_dividend] * later[np.searchsorted(split_days, days[has_dividend], side="right")]
+    actions += [CorporateAction(symbol, pd.Timestamp(d).date(), DIVIDEND, float(round(a, 6)))
+                for d, a in zip(days[has_dividend].tolist(), raw_amounts.tolist())]
+    return sorted(actions, key=lambda a: (a.ex_date, a.kind))
@@ -0,0 +1,221 @@
+"""
+Collector Daemon - Rulare continuă a agentului, cu colectări la închiderea bars (calendarul bursei)
+"""
+
+from typing import Optional
+import asyncio
+import time
+
+import numpy as np
+
+from src.agents.data_collection.market_calendar import NS, ExchangeCalendar, bar_alignment
+from src.agents.data_collection.sources.cached_source import CachedDataSource
+from src.common.logging_utils.logger import get_logger
+
+
+OVERRUN_POLICIES = ("skip", "coalesce")
+
+
+class CollectionSchedule:
+    """Momentele de colectare: la `delay_seconds` după închiderea fiecărui bar.
+
+    Bars sunt cele ale sesiunilor calendarului, cu alinierea sursei
+    (ExchangeCalendar.slots): 1H RTH 'clock' (IBKR) → 10:00, 11:00, ... 16:00 ET;
+    'open' (Yahoo) → 10:30, 11:30, ... 15:30, 16:00 ET; 1D → închiderea
+    sesiunii RTH. În weekend și sărbători nu se rulează.
+    """
+
+    # Cât de departe se caută următoarea sesiune (acoperă orice vacanță)
+    HORIZON_DAYS = 14
+
+    def __init__(
+        self,
+        calendar: ExchangeCalendar,
+        timeframe: str,
+        useRTH: bool = True,
+        delay_seconds: float = 5.0,
+        align: str = "open"
+    ):
+        """
+        Args:
+            calendar: Calendarul bursei
+            timeframe: Timeframe-ul bars colectate
+            useRTH: Sesiune regulară (False = și pre/post market)
+            delay_seconds: Întârziere după închidere (bar-ul trebuie să apară la sursă)
+            align: Alinierea bars sursei ('open' sau 'clock')
+        """
+        self.calendar = calendar
+        self.timeframe = timeframe
+        self.useRTH = useRTH
+        self.align = align
+        self.delay_ns = int(delay_seconds * NS)
+
+    def next_close(self, now_ns: int) -> int:
+        """Închiderea primului bar pentru care momentul de colectare e după `now_ns` (ns UTC)."""
+        lo = now_ns - self.delay_ns
+        _, ends = self.calendar.slots(
+            lo, lo + self.HORIZON_DAYS * 86400 * NS, self.timeframe, self.useRTH, self.align
+        )
+        ends = np.unique(ends)
+        pos = np.searchsorted(ends, lo, side="right")
+        if pos >= len(ends):
+            raise ValueError(f"No {self.timeframe} session in the next {self.HORIZON_DAYS} days")
+        return int(ends[pos])
+
+    def next_run(self, now_ns: int) -> int:
+        """Următorul moment de colectare (ns UTC), strict după `now_ns`."""
+        return self.next_close(now_ns) + self.delay_ns
+
+
+class CollectorDaemon:
+    """Ține agentul inițializat și rulează collect_all după program.
+
+    Conexiunile (SourcePool), contractele calificate și cache-urile rămân
+    calde între rulări. O rulare care depășește momentul următor nu se
+    suprapune cu ea: 'skip' sare peste momentul ratat, 'coalesce' face o
+    singură rulare imediat după (oricâte momente s-au ratat între timp).
+    """
+
+    def __init__(
+        self,
+        agent,
+        schedule: CollectionSchedule,
+        overrun: str = "skip",
+        run_on_start: bool = True
+    ):
+        """
+        Args:
+            agent: DataCollectionAgent inițializat
+            schedule: Programul de colectare
+            overrun: 'skip' sau 'coalesce'
+            run_on_start: Colectare imediată la pornire (recuperează ce s-a ratat)
+
+        Raises:
+            ValueError: Politică de overrun necunoscută
+        """
+        if overrun not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy: {overrun} (expected one of {OVERRUN_POLICIES})")
+        self.agent = agent
+        self.schedule = schedule
+        self.overrun = overrun
+        self.run_on_start = run_on_start
+        self.logger = get_logger(__name__)
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._pending = False
+        self._pending_close: Optional[int] = None
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.last_duration: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, agent) -> "CollectorDaemon":
+        """Daemon din blocul data_collector.daemon (timeframe, delay_seconds, align, overrun, run_on_start).
+
+        Fără `align`, se folosește alinierea bars sursei primare (IBKR: la ora fixă).
+        """
+        data_collector_config = agent.config.get("data_collector", {})
+        daemon_cfg = data_collector_config.get("daemon") or {}
+        schedule = CollectionSchedule(
+            agent.calendar,
+            daemon_cfg.get("timeframe", data_collector_config.get("timeframe", "1H")),
+            useRTH=data_collector_config.get("useRTH", True),
+            delay_seconds=daemon_cfg.get("delay_seconds", 5),
+            align=daemon_cfg.get("align") or bar_alignment(data_collector_config.get("data_source", "IBKR")),
+        )
+        return cls(
+            agent,
+            schedule,
+            overrun=daemon_cfg.get("overrun", "skip"),
+            run_on_start=daemon_cfg.get("run_on_start", True),
+        )
+
+    @property
+    def running(self) -> bool:
+        """True cât timp o colectare e în curs."""
+        return self._task is not None and not self._task.done()
+
+    def stop(self) -> None:
+        """Oprește bucla (rularea în curs se termină normal)."""
+        self._stop.set()
+
+    async def run(self, max_ticks: Optional[int] = None) -> None:
+        """Bucla daemon-ului, până la stop() (sau `max_ticks` momente programate).
+
+        Args:
+            max_ticks: Număr maxim de momente programate (None = fără limită)
+        """
+        self.logger.info(
+            f"Collector daemon started ({self.schedule.timeframe}, overrun={self.overrun})"
+        )
+        if self.run_on_start:
+            self._trigger(None)
+        ticks = 0
+        wake_ns = 0
+        while not self._stop.is_set() and (max_ticks is None or ticks < max_ticks):
+            # Niciodată același bar de două ori (timer-ul se poate trezi puțin devreme)
+            close_ns = self.schedule.next_close(max(time.time_ns(), wake_ns))
+            wake_ns = close_ns + self.schedule.delay_ns
+            self.logger.debug(f"Next collection at {np.datetime64(wake_ns, 'ns')} UTC")
+            if await self._sleep_until(wake_ns):
+                break
+            ticks += 1
+            self._trigger(close_ns)
+
+        if self._task is not None:
+            await self._task
+        self.logger.info(
+            f"Collector daemon stopped (runs={self.runs}, failures={self.failures}, "
+            f"skipped={self.skipped}, coalesced={self.coalesced})"
+        )
+
+    def _trigger(self, close_ns: Optional[int]) -> None:
+        """Pornește o colectare sau aplică politica de overrun dacă una e în curs."""
+        if self.running:
+            if self.overrun == "coalesce":
+                if self._pending:
+                    self.coalesced += 1
+                self._pending = True
+                self._pending_close = close_ns
+                self.logger.warning("Collection still running, next run coalesced")
+            else:
+                self.skipped += 1
+                self.logger.warning("Collection still running, scheduled run skipped")
+            return
+        self._task = asyncio.create_task(self._run_collections(close_ns))
+
+    async def _run_collections(self, close_ns: Optional[int]) -> None:
+        while True:
+            self._pending = False
+            if close_ns is not None:
+                self._expire_cache(close_ns)
+            started = time.monotonic()
+            try:
+                ok = await self.agent.collect_all()
+            except Exception as e:
+                self.logger.error(f"Scheduled collection error: {e}")
+                ok = False
+            self.last_duration = time.monotonic() - started
+            self.runs += 1
+            self.failures += 0 if ok else 1
+            self.logger.info(f"Scheduled collection finished in {self.last_duration:.1f}s (ok={ok})")
+            if not self._pending or self._stop.is_set():
+                return
+            close_ns = self._pending_close
+
+    def _expire_cache(self, close_ns: int) -> None:
+        """Răspunsurile din cache de dinainte de închiderea bar-ului nu conțin bar-ul nou."""
+        for source in self.agent.sources:
+            if isinstance(source, CachedDataSource):
+                source.expire(self.schedule.timeframe, created_before=close_ns / NS)
+
+    async def _sleep_until(self, wake_ns: int) -> bool:
+        """Așteaptă până la `wake_ns` (ns UTC); True dacă s-a cerut oprirea."""
+        delay = max(0.0, (wake_ns - time.time_ns()) / NS)
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
@@ -0,0 +1,382 @@
+"""
+Market Calendar - Sesiuni bursiere US (RTH/ETH, sărbători, zile scurte) și detecție goluri
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import calendar as _calendar
+
+import numpy as np
+import pandas as pd
+
+from src.common.models.market_data import BarSeries
+from src.common.utils.helpers import timeframe_to_seconds
+
+
+NS = 1_000_000_000
+
+# Închideri neprogramate NYSE (evenimente, doliu național), pe lângă regulile anuale
+SPECIAL_CLOSURES = (
+    date(2001, 9, 11), date(2001, 9, 12), date(2001, 9, 13), date(2001, 9, 14),
+    date(2004, 6, 11), date(2007, 1, 2), date(2012, 10, 29), date(2012, 10, 30),
+    date(2018, 12, 5), date(2025, 1, 9),
+)
+
+# Alinierea bars intraday: 'open' = din bar_seconds în bar_seconds de la deschidere
+# (Yahoo, resampler: 09:30, 10:30, ...); 'clock' = la ora fixă, primul bar trunchiat
+# la deschidere (IBKR: 09:30, 10:00, 11:00, ...)
+ALIGNMENTS = ("open", "clock")
+SOURCE_ALIGNMENT = {"IBKR": "clock"}
+
+
+def bar_alignment(source: Optional[str]) -> str:
+    """Alinierea bars intraday ale unei surse ('open' dacă nu e cunoscută)."""
+    return SOURCE_ALIGNMENT.get((source or "").upper(), "open")
+
+
+@dataclass(frozen=True)
+class MissingRange:
+    """Un interval [start, end) în care lipsesc bars așteptate de calendar."""
+
+    start: datetime
+    end: datetime
+    bars: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"start": self.start.isoformat(), "end": self.end.isoformat(), "bars": self.bars}
+
+
+def _easter(year: int) -> date:
+    """Duminica Paștelui (calendar gregorian, algoritmul anonim)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """A n-a zi `weekday` din lună (n=-1 = ultima)."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year, month, _calendar.monthrange(year, month)[1])
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    """Sâmbătă → vineri, duminică → luni."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+class ExchangeCalendar:
+    """Calendarul unei burse US (implicit NYSE/Nasdaq): zile de tranzacționare și sesiuni.
+
+    Sărbătorile și zilele scurte (închidere la 13:00 ET) se calculează din
+    regulile NYSE, fără dependențe externe; închiderile speciale și orice
+    abateri se pot adăuga prin `holidays` / `half_days`. Sesiunile sunt
+    RTH (09:30-16:00) sau ETH (04:00-20:00), în timezone-ul bursei.
+    """
+
+    def __init__(
+        self,
+        tz: str = "America/New_York",
+        rth: Tuple[time, time] = (time(9, 30), time(16, 0)),
+        eth: Tuple[time, time] = (time(4, 0), time(20, 0)),
+        early_close: time = time(13, 0),
+        early_close_eth: time = time(17, 0),
+        holidays: Iterable[date] = (),
+        half_days: Iterable[date] = ()
+    ):
+        """
+        Args:
+            tz: Timezone-ul bursei
+            rth: Deschidere/închidere sesiune regulară
+            eth: Deschidere/închidere sesiune extinsă (pre/post market)
+            early_close: Închiderea RTH în zilele scurte
+            early_close_eth: Închiderea ETH în zilele scurte
+            holidays: Zile închise suplimentare
+            half_days: Zile scurte suplimentare
+        """
+        self.tz = tz
+        self.rth = rth
+        self.eth = eth
+        self.early_close = early_close
+        self.early_close_eth = early_close_eth
+        self._extra_holidays = set(holidays) | set(SPECIAL_CLOSURES)
+        self._extra_half_days = set(half_days)
+        self._years: Dict[int, Tuple[Set[date], Set[date]]] = {}
+
+    @classmethod
+    def from_config(cls, calendar_cfg: Optional[dict]) -> "ExchangeCalendar":
+        """Calendar din blocul data_collector.calendar (tz, holidays, half_days)."""
+        calendar_cfg = calendar_cfg or {}
+        return cls(
+            tz=calendar_cfg.get("tz", "America/New_York"),
+            holidays=[pd.Timestamp(d).date() for d in calendar_cfg.get("holidays", [])],
+            half_days=[pd.Timestamp(d).date() for d in calendar_cfg.get("half_days", [])],
+        )
+
+    def holidays(self, year: int) -> Set[date]:
+        """Zilele lucrătoare în care bursa e închisă."""
+        return self._year(year)[0]
+
+    def half_days(self, year: int) -> Set[date]:
+        """Zilele cu închidere devreme."""
+        return self._year(year)[1]
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def trading_days(self, start: date, end: date) -> np.ndarray:
+        """Zilele de tranzacționare din [start, end] (datetime64[D])."""
+        holidays = set()
+        for year in range(start.year, end.year + 1):
+            holidays |= self.holidays(year)
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        return days[np.is_busday(days, holidays=np.array(sorted(holidays), dtype="datetime64[D]"))]
+
+    def sessions(self, start: date, end: date, useRTH: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sesiunile zilelor de tranzacționare din [start, end].
+
+        Returns:
+            (zile datetime64[D], deschideri ns UTC, închideri ns UTC)
+        """
+        days = self.trading_days(start, end)
+        session_open, session_close = self.rth if useRTH else self.eth
+        early = self.early_close if useRTH else self.early_close_eth
+        half = set()
+        for year in range(start.year, end.year + 1):
+            half |= self.half_days(year)
+        is_half = np.isin(days, np.array(sorted(half), dtype="datetime64[D]"))
+
+        midnight = pd.DatetimeIndex(days.astype("datetime64[ns]")).tz_localize(self.tz)
+        opens = (midnight + pd.Timedelta(hours=session_open.hour, minutes=session_open.minute)).asi8
+        closes = np.where(
+            is_half,
+            (midnight + pd.Timedelta(hours=early.hour, minutes=early.minute)).asi8,
+            (midnight + pd.Timedelta(hours=session_close.hour, minutes=session_close.minute)).asi8,
+        )
+        return days, opens, closes
+
+    def expected_timestamps(
+        self,
+        start: datetime,
+        end: datetime,
+        timeframe: str,
+        useRTH: bool = True,
+        align: str = "open"
+    ) -> np.ndarray:
+        """Începutul bars așteptate în [start, end) (ns UTC; naive = UTC).
+
+        Bars intraday pornesc de la deschiderea sesiunii, din bar_seconds în
+        bar_seconds (ultimul poate fi trunchiat de închidere) sau, cu
+        align='clock', la ora fixă; bar-ul zilnic începe la deschiderea RTH.
+        """
+        lo, hi = _to_ns(start), _to_ns(end)
+        if hi <= lo:
+            return np.empty(0, dtype=np.int64)
+        slots, _ = self.slots(lo, hi, timeframe, useRTH, align)
+        return slots[(slots >= lo) & (slots < hi)]
+
+    def missing_ranges(
+        self,
+        series: BarSeries,
+        timeframe: Optional[str] = None,
+        useRTH: Optional[bool] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        align: Optional[str] = None
+    ) -> List[MissingRange]:
+        """Intervalele în care seria nu are bars față de calendar.
+
+        Fără start/end se verifică doar între primul și ultimul bar al seriei
+        (nu știm cât istoric trebuia să existe). Un slot e acoperit dacă un bar
+        începe oriunde în el; sloturile au alinierea bars din serie (1H IBKR la
+        ora fixă: 09:30, 10:00, ... 15:00; Yahoo de la deschidere: 09:30, 10:30, ...).
+
+        Args:
+            series: Seria verificată
+            timeframe: Timeframe (default: series.timeframe)
+            useRTH: Sesiune regulară; None = dedus din timestamp-urile seriei
+            start: Începutul intervalului verificat
+            end: Sfârșitul intervalului verificat
+            align: 'open' sau 'clock'; None = dedusă din timestamp-urile seriei
+
+        Returns:
+            Intervale [start, end) în UTC, cu numărul de bars lipsă
+        """
+        timeframe = timeframe or series.timeframe
+        stamps = np.unique(series.timestamps)
+        if not len(stamps) and (start is None or end is None):
+            return []
+        bar_ns = timeframe_to_seconds(timeframe) * NS
+        daily = bar_ns >= 86400 * NS
+        if useRTH is None:
+            useRTH = daily or self.is_rth(stamps)
+
+        if daily:
+            # Zilnic: comparăm zilele de sesiune, nu ora din timestamp
+            actual = self._session_dates(series)
+            lo_day = np.datetime64(pd.Timestamp(start).date(), "D") if start is not None else actual.min()
+            hi_day = (np.datetime64(pd.Timestamp(_to_ns(end) - 1, tz="UTC").tz_convert(self.tz).date(), "D")
+                      if end is not None else actual.max())
+            days, slots, slot_ends = self.sessions(_as_date(lo_day), _as_date(hi_day), useRTH=True)
+            covered = np.isin(days, actual)
+        else:
+            lo = _to_ns(start) if start is not None else int(stamps[0])
+            hi = _to_ns(end) if end is not None else int(stamps[-1]) + 1
+            align = align or self.infer_alignment(stamps, timeframe, useRTH)
+            slots, slot_ends = self.slots(lo, hi, timeframe, useRTH, align)
+            keep = (slot_ends > lo) & (slots < hi)
+            slots, slot_ends = slots[keep], slot_ends[keep]
+            covered = np.zeros(len(slots), dtype=bool)
+            pos = np.searchsorted(slots, stamps, side="right") - 1
+            inside = pos >= 0
+            inside[inside] &= stamps[inside] < slot_ends[pos[inside]]
+            covered[pos[inside]] = True
+
+        missing = np.flatnonzero(~covered)
+        if not len(missing):
+            return []
+        # Sloturi lipsă consecutive → un singur interval (poate traversa noaptea)
+        breaks = np.flatnonzero(np.diff(missing) != 1) + 1
+        firsts = missing[np.r_[0, breaks]]
+        lasts = missing[np.r_[breaks - 1, len(missing) - 1]]
+        return [
+            MissingRange(
+                start=_to_datetime(slots[first]),
+                end=_to_datetime(slot_ends[last]),
+                bars=int(last - first + 1),
+            )
+            for first, last in zip(firsts.tolist(), lasts.tolist())
+        ]
+
+    def slots(
+        self,
+        lo: int,
+        hi: int,
+        timeframe: str,
+        useRTH: bool,
+        align: str = "open"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Sloturile (început, sfârșit, ns UTC) ale sesiunilor care ating [lo, hi) (ns UTC).
+
+        Intraday 'open': din bar_seconds în bar_seconds de la deschidere,
+        ultimul trunchiat la închidere; 'clock': granițe la multiplii de
+        bar_seconds de la miezul nopții (ora bursei), primul slot trunchiat la
+        deschidere, ultimul la închidere. Zilnic: un slot per sesiune RTH.
+
+        Raises:
+            ValueError: Aliniere necunoscută
+        """
+        if align not in ALIGNMENTS:
+            raise ValueError(f"Unknown bar alignment: {align} (expected one of {ALIGNMENTS})")
+        bar_ns = timeframe_to_seconds(timeframe) * NS
+        first = pd.Timestamp(lo, tz="UTC").tz_convert(self.tz).date()
+        last = pd.Timestamp(hi - 1, tz="UTC").tz_convert(self.tz).date()
+        days, opens, closes = self.sessions(first, last, useRTH=useRTH or bar_ns >= 86400 * NS)
+        if bar_ns >= 86400 * NS:
+            return opens, closes
+        if align == "clock":
+            midnight = pd.DatetimeIndex(days.astype("datetime64[ns]")).tz_localize(self.tz).asi8
+            # Indicele grilei de la miezul nopții: primul punct după deschidere .. ultimul înainte de închidere
+            k_first = (opens - midnight) // bar_ns + 1
+            k_last = -(-(closes - midnight) // bar_ns) - 1
+            counts = 1 + np.maximum(0, k_last - k_first + 1)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            ends = np.repeat(midnight, counts) + (np.repeat(k_first, counts) + offsets) * bar_ns
+            slots = ends - bar_ns
+            slots[offsets == 0] = opens
+            return slots, np.minimum(ends, np.repeat(closes, counts))
+        counts = -(-(closes - opens) // bar_ns)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        slots = np.repeat(opens, counts) + offsets * bar_ns
+        return slots, np.minimum(slots + bar_ns, np.repeat(closes, counts))
+
+    def infer_alignment(self, stamps: np.ndarray, timeframe: str, useRTH: bool = True) -> str:
+        """Alinierea bars intraday deduse din timestamp-uri: cea pe care cad cele mai multe bars."""
+        if not len(stamps):
+            return "open"
+        lo, hi = int(stamps.min()), int(stamps.max()) + 1
+        on_grid = {
+            align: int(np.isin(stamps, self.slots(lo, hi, timeframe, useRTH, align)[0]).sum())
+            for align in ALIGNMENTS
+        }
+        return "clock" if on_grid["clock"] > on_grid["open"] else "open"
+
+    def is_rth(self, stamps: np.ndarray) -> bool:
+        """True dacă toate bars cad în sesiunea regulară."""
+        local = pd.DatetimeIndex(stamps, tz="UTC").tz_convert(self.tz)
+        seconds = local.hour * 3600 + local.minute * 60 + local.second
+        open_s = self.rth[0].hour * 3600 + self.rth[0].minute * 60
+        close_s = self.rth[1].hour * 3600 + self.rth[1].minute * 60
+        return bool(np.all((seconds >= open_s) & (seconds < close_s)))
+
+    def _session_dates(self, series: BarSeries) -> np.ndarray:
+        """Ziua de sesiune a fiecărui bar zilnic (datetime64[D])."""
+        index = series.datetime_index()
+        if len(index) and not (index == index.normalize()).all():
+            # Bar zilnic cu oră (ex: deschiderea sesiunii) → ziua în timezone-ul bursei
+            index = (index if index.tz is not None else index.tz_localize("UTC")).tz_convert(self.tz)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return np.unique(index.normalize().values.astype("datetime64[D]"))
+
+    def _year(self, year: int) -> Tuple[Set[date], Set[date]]:
+        """(sărbători, zile scurte) pentru un an, calculate o dată."""
+        cached = self._years.get(year)
+        if cached is not None:
+            return cached
+        holidays = {
+            _nth_weekday(year, 2, 0, 3),                     # Presidents' Day
+            _easter(year) - timedelta(days=2),               # Good Friday
+            _nth_weekday(year, 5, 0, -1),                    # Memorial Day
+            _observed(date(year, 7, 4)),                     # Independence Day
+            _nth_weekday(year, 9, 0, 1),                     # Labor Day
+            _nth_weekday(year, 11, 3, 4),                    # Thanksgiving
+            _observed(date(year, 12, 25)),                   # Christmas
+        }
+        new_year = date(year, 1, 1)
+        if new_year.weekday() != 5:                          # sâmbătă: fără zi liberă compensată
+            holidays.add(_observed(new_year))
+        if year >= 1998:
+            holidays.add(_nth_weekday(year, 1, 0, 3))        # Martin Luther King Jr. Day
+        if year >= 2022:
+            holidays.add(_observed(date(year, 6, 19)))       # Juneteenth
+        holidays |= {d for d in self._extra_holidays if d.year == year}
+
+        half_days = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}   # ziua după Thanksgiving
+        for day in (date(year, 7, 3), date(year, 12, 24)):
+            if day.weekday() < 4:                            # luni-joi; vineri e deja zi liberă
+                half_days.add(day)
+        half_days = {d for d in half_days | self._extra_half_days
+                     if d.year == year and d not in holidays}
+
+        self._years[year] = (holidays, half_days)
+        return self._years[year]
+
+
+def _to_ns(ts: Any) -> int:
+    """datetime/Timestamp → ns UTC (naive = UTC)."""
+    t = pd.Timestamp(ts)
+    t = t.tz_convert("UTC") if t.tzinfo is not None else t.tz_localize("UTC")
+    return t.as_unit("ns").value
+
+
+def _to_datetime(ns: int) -> datetime:
+    return pd.Timestamp(int(ns), tz="UTC").to_pydatetime()
+
+
+def _as_date(day: np.datetime64) -> date:
+    return pd.Timestamp(day).date()
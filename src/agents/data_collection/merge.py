@@ -0,0 +1,128 @@
+"""
+Bar Merger - Deduplicare și combinare bars din mai multe surse, cu prioritate pe sursă
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import BarSeries
+
+
+# Ordinea implicită: sursa mai bună câștigă la același timestamp
+DEFAULT_SOURCE_PRIORITY = ("IBKR", "YAHOO")
+
+
+@dataclass
+class MergeResult:
+    """Seria combinată, sursa care a câștigat fiecare rând și rândurile eliminate."""
+
+    series: BarSeries
+    sources: np.ndarray          # object, sursa per rând (None = necunoscută)
+    duplicates: int
+
+    def source_counts(self) -> Dict[Optional[str], int]:
+        """Număr de rânduri câștigate de fiecare sursă."""
+        names, counts = np.unique(self.sources.astype(str), return_counts=True)
+        return {(None if name == "None" else name): int(n) for name, n in zip(names.tolist(), counts.tolist())}
+
+
+class BarMerger:
+    """Combină serii suprapuse (sursă primară/backup, snapshot-uri, ferestre backfill).
+
+    Cheia e (symbol, timeframe, timestamp). La același timestamp câștigă sursa
+    cu prioritate mai mare; la prioritate egală câștigă seria dată mai târziu
+    (date mai noi). Implementare sort-merge columnară: un singur np.lexsort pe
+    (timestamp, rang sursă, ordine), apoi primul rând din fiecare grup.
+    """
+
+    def __init__(self, priority: Optional[Sequence[str]] = None):
+        """
+        Args:
+            priority: Surse în ordinea preferinței (default: IBKR, YAHOO);
+                sursele nelistate vin după, cele necunoscute (None) ultimele
+        """
+        self.priority = tuple(s.upper() for s in (priority or DEFAULT_SOURCE_PRIORITY))
+        self.logger = get_logger(__name__)
+
+    def rank(self, source: Optional[str]) -> int:
+        """Rangul unei surse (mai mic = preferată)."""
+        if source is None:
+            return len(self.priority) + 1
+        try:
+            return self.priority.index(source.upper())
+        except ValueError:
+            return len(self.priority)
+
+    def merge(
+        self,
+        series: Sequence[BarSeries],
+        sources: Optional[Sequence[Optional[np.ndarray]]] = None
+    ) -> MergeResult:
+        """Combină serii ale aceluiași simbol/timeframe.
+
+        Args:
+            series: Serii de combinat (ordinea contează doar la prioritate egală)
+            sources: Sursa per rând pentru fiecare serie (None = series.source)
+
+        Returns:
+            MergeResult cu seria sortată, fără timestamp-uri duplicate
+
+        Raises:
+            ValueError: Serii cu simboluri sau timeframe-uri diferite
+        """
+        series = list(series)
+        sources = list(sources) if sources is not None else [None] * len(series)
+        present = [(s, src) for s, src in zip(series, sources) if s is not None and len(s)]
+        for field in ("symbol", "timeframe"):
+            values = {getattr(s, field) for s, _ in present} - {None}
+            if len(values) > 1:
+                raise ValueError(f"Cannot merge different {field}s: {sorted(values)}")
+        if not present:
+            empty = BarSeries.concat(series)
+            return MergeResult(empty, np.empty(0, dtype=object), 0)
+
+        combined = BarSeries.concat([s for s, _ in present])
+        # Sursele ca coduri întregi (numele o singură dată), apoi rang per cod
+        names: List[Optional[str]] = []
+        codes = np.concatenate([self._codes(s, src, names) for s, src in present])
+        ranks = np.array([self.rank(name) for name in names], dtype=np.int64)
+        # Cheie secundară: rang ↑, apoi seria cea mai nouă întâi
+        position = np.concatenate([np.full(len(s), len(present) - 1 - i, dtype=np.int64)
+                                   for i, (s, _) in enumerate(present)])
+        preference = ranks[codes] * len(present) + position
+
+        order = np.lexsort((preference, combined.timestamps))
+        ordered = combined.timestamps[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = ordered[1:] != ordered[:-1]
+        winners = order[keep]
+
+        return MergeResult(
+            series=combined[winners],
+            sources=np.array(names + [None], dtype=object)[:-1][codes[winners]],
+            duplicates=int(len(order) - len(winners)),
+        )
+
+    def merge_all(self, series: Sequence[BarSeries]) -> Dict[Tuple[Optional[str], Optional[str]], MergeResult]:
+        """Grupează seriile după (symbol, timeframe) și combină fiecare grup."""
+        groups: Dict[Tuple[Optional[str], Optional[str]], List[BarSeries]] = {}
+        for s in series:
+            groups.setdefault((s.symbol, s.timeframe), []).append(s)
+        return {key: self.merge(group) for key, group in groups.items()}
+
+    @staticmethod
+    def _codes(series: BarSeries, row_sources: Optional[np.ndarray], names: List[Optional[str]]) -> np.ndarray:
+        """Codurile surselor unei serii (indici în `names`, extins la nevoie)."""
+        def code(name: Optional[str]) -> int:
+            if name not in names:
+                names.append(name)
+            return names.index(name)
+
+        if row_sources is None:
+            return np.full(len(series), code(series.source), dtype=np.int64)
+        distinct, inverse = np.unique(np.asarray(row_sources, dtype=object).astype(str), return_inverse=True)
+        lookup = np.array([code(None if name == "None" else name) for name in distinct.tolist()], dtype=np.int64)
+        return lookup[inverse]
@@ -1,43 +1,176 @@
 """
-Data Normalizer - Normalizare și export date (CSV, JSON)
+Data Normalizer - Normalizare și export date (CSV, JSON, Parquet)
 """
 
-from typing import List
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+import numpy as np
 import pandas as pd
 import json
+import os
+import textwrap
 from datetime import datetime, timezone
 from pathlib import Path
 
-from src.common.models.market_data import Bar
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from src.agents.data_collection.market_calendar import ExchangeCalendar, MissingRange
+from src.agents.data_collection.merge import BarMerger
+from src.common.models.market_data import Bar, BarSeries, COUNT_MISSING, GAPS_MISSING
 from src.common.logging_utils.logger import get_logger
 
 
+# Schema coloanelor Parquet (partițiile symbol/timeframe/year sunt în path)
+PARQUET_COLUMNS = (
+    "timestamp", "open", "high", "low", "close", "volume",
+    "count", "wap", "hasGaps", "source",
+)
+
+
+# Coloanele JSON compact (columnar), în ordinea din fișier
+JSON_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume", "count", "wap", "hasGaps")
+
+
+def _json_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serializare JSON: orjson dacă e instalat, altfel json din stdlib."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+@contextmanager
+def _atomic_write(filepath: str, mode: str = 'wb', **open_kwargs) -> Iterator[Any]:
+    """Scrie într-un fișier temporar ascuns și îl redenumește atomic la final.
+    
+    Cititorii (dashboard, alt agent) văd fie fișierul vechi, fie pe cel nou
+    complet; la eroare temporarul se șterge și fișierul vechi rămâne intact.
+    """
+    path = Path(filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 class DataNormalizer:
     """Normalizare format date."""
     
-    def __init__(self):
+    # Bars serializate per bucată la export JSON (memoria nu crește cu istoricul)
+    JSON_CHUNK = 4096
+    
+    def __init__(self, calendar: Optional[ExchangeCalendar] = None, merger: Optional[BarMerger] = None):
+        """
+        Args:
+            calendar: Calendarul bursei pentru detecția bars lipsă (default: NYSE)
+            merger: Prioritatea surselor la timestamp-uri duplicate în Parquet (default: IBKR, YAHOO)
+        """
         self.logger = get_logger(__name__)
+        self.calendar = calendar or ExchangeCalendar()
+        self.merger = merger or BarMerger()
+    
+    def export(
+        self,
+        bars: Union[List[Bar], BarSeries],
+        base_path: str,
+        formats: Iterable[str],
+        symbol: str,
+        timeframe: str,
+        json_compact: bool = False,
+        parquet_dir: Optional[str] = None,
+        useRTH: Optional[bool] = None,
+        sources: Optional[np.ndarray] = None,
+        changed: Optional[np.ndarray] = None
+    ) -> Dict[str, bool]:
+        """Exportă bars în toate formatele cerute dintr-o singură conversie columnară.
+        
+        Bars se convertesc o dată în BarSeries; fiecare writer citește
+        coloanele direct. Fișierele se scriu atomic (tmp + rename).
+        
+        Args:
+            bars: Lista de Bar-uri sau BarSeries
+            base_path: Cale fără extensie (ex: data/processed/AAPL_1H)
+            formats: Formate de scris ("csv", "json", "parquet")
+            symbol: Simbol stoc
+            timeframe: Timeframe
+            json_compact: JSON pe coloane, fără indentare
+            parquet_dir: Rădăcina dataset-ului Parquet (implicit {dir(base_path)}/parquet)
+            useRTH: Sesiunea pentru detecția golurilor din JSON (None = dedusă)
+            sources: Sursa per rând (ex: MergeResult.sources; None = series.source)
+            changed: Timestamp-urile rândurilor noi (Parquet rescrie doar partițiile lor)
+        
+        Returns:
+            Dict format → True dacă exportul a reușit
+        """
+        series = bars if isinstance(bars, BarSeries) else BarSeries.from_bars(bars, symbol, timeframe)
+        writers = {
+            "csv": lambda: self.bars_to_csv(series, f"{base_path}.csv", sources=sources),
+            "json": lambda: self.bars_to_json(series, f"{base_path}.json", symbol, timeframe, compact=json_compact,
+                                              useRTH=useRTH, sources=sources),
+            "parquet": lambda: self.bars_to_parquet(
+                series, parquet_dir or str(Path(base_path).parent / "parquet"), symbol, timeframe,
+                sources=sources, changed=changed),
+        }
+        results = {}
+        for fmt in dict.fromkeys(formats):
+            writer = writers.get(fmt)
+            if writer is None:
+                self.logger.warning(f"Unknown output format: {fmt}")
+                results[fmt] = False
+                continue
+            results[fmt] = writer()
+        return results
     
-    def bars_to_csv(self, bars: List[Bar], filepath: str) -> bool:
-        """Exportă bars → CSV.
+    def bars_to_csv(
+        self,
+        bars: Union[List[Bar], BarSeries],
+        filepath: str,
+        sources: Optional[np.ndarray] = None
+    ) -> bool:
+        """Exportă bars → CSV (scriere atomică).
         
         Args:
-            bars: Lista de Bar-uri
+            bars: Lista de Bar-uri sau BarSeries
             filepath: Cale fișier CSV
+            sources: Sursa per rând (None = sursa fiecărui bar / a seriei)
         
         Returns:
             True dacă exportul reușește
         """
         try:
-            # Creează directorul dacă nu există
-            Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-            
-            # Convert la dict pentru CSV
-            data = [bar.to_csv_dict() for bar in bars]
-            df = pd.DataFrame(data)
+            # Convert la dict pentru CSV (BarSeries: direct din coloane)
+            if isinstance(bars, BarSeries):
+                df = self._series_to_csv_frame(bars)
+            else:
+                df = pd.DataFrame([bar.to_csv_dict() for bar in bars])
+            if sources is not None:
+                df["source"] = [src or "" for src in sources]
             
             # Export CSV
-            df.to_csv(filepath, index=False)
+            with _atomic_write(filepath, 'w', encoding='utf-8', newline='') as f:
+                df.to_csv(f, index=False)
             
             self.logger.info(f"Saved {len(bars)} bars to {filepath}")
             return True
@@ -45,67 +178,493 @@ class DataNormalizer:
             self.logger.error(f"CSV export error: {e}")
             return False
     
-    def bars_to_json(self, bars: List[Bar], filepath: str, symbol: str, timeframe: str) -> bool:
-        """Exportă bars → JSON cu metadata.
+    def bars_to_json(
+        self,
+        bars: Union[List[Bar], BarSeries],
+        filepath: str,
+        symbol: str,
+        timeframe: str,
+        compact: bool = False,
+        useRTH: Optional[bool] = None,
+        sources: Optional[np.ndarray] = None
+    ) -> bool:
+        """Exportă bars → JSON cu metadata, scris incremental (bucăți de JSON_CHUNK bars) și atomic.
         
         Args:
-            bars: Lista de Bar-uri
+            bars: Lista de Bar-uri sau BarSeries
             filepath: Cale fișier JSON
             symbol: Simbol stoc
             timeframe: Timeframe
+            compact: True = coloane (un array per câmp), fără indentare;
+                False = un obiect per bar, indentat (formatul clasic)
+            useRTH: Sesiunea față de care se caută bars lipsă (None = dedusă din date)
+            sources: Sursa per rând (compact: coloană "source" în plus)
         
         Returns:
             True dacă exportul reușește
         """
         try:
-            # Creează directorul dacă nu există
-            Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-            
-            if not bars:
+            series = bars if isinstance(bars, BarSeries) else BarSeries.from_bars(bars, symbol, timeframe)
+            if not len(series):
                 self.logger.warning(f"No bars to export for {symbol}")
                 return False
             
             # Metadata
+            first, last = series[0], series[-1]
+            missing = self.find_missing_ranges(series, timeframe, useRTH)
             metadata = {
                 "symbol": symbol,
                 "timeframe": timeframe,
                 "period": {
-                    "start": bars[0].timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                    "end": bars[-1].timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-                    "total_bars": len(bars),
+                    "start": first.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+                    "end": last.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+                    "total_bars": len(series),
                     "date_generated": datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
                 },
                 "metadata": {
-                    "source": bars[0].source if bars else "UNKNOWN",
+                    "source": series.source or "UNKNOWN",
                     "normalized": True,
                     "data_quality": {
-                        "missing_bars": self._count_missing_bars(bars),
-                        "gaps_detected": sum(1 for b in bars if b.hasGaps),
-                        "duplicates": self._count_duplicates(bars)
+                        "missing_bars": sum(r.bars for r in missing),
+                        "missing_ranges": [r.to_dict() for r in missing],
+                        "gaps_detected": int(np.count_nonzero(series.has_gaps == 1)),
+                        "duplicates": self._count_duplicates(series)
                     }
                 },
-                "bars": [bar.to_dict() for bar in bars]
             }
             
-            # Export JSON
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            # Export JSON (header + bars în bucăți)
+            with _atomic_write(filepath) as f:
+                if compact:
+                    metadata["format"] = "columnar"
+                    metadata["tz"] = series.tz_name
+                    header = _json_bytes(metadata)
+                    f.write(header[:-1] + b',"bars":{')
+                    columns = JSON_COLUMNS + (("source",) if sources is not None else ())
+                    for i, name in enumerate(columns):
+                        f.write((',' if i else '').encode() + b'"' + name.encode() + b'":[')
+                        chunks = self._json_column(series, name, sources)
+                        self._write_json_items(f, (_json_bytes(chunk)[1:-1] for chunk in chunks), b',')
+                        f.write(b']')
+                    f.write(b'}}')
+                else:
+                    header = _json_bytes(metadata, indent=True)
+                    f.write(header[:-2] + b',\n  "bars": [\n')
+                    self._write_json_items(f, self._json_rows(series, sources), b',\n')
+                    f.write(b'\n  ]\n}')
             
-            self.logger.info(f"Saved {len(bars)} bars to {filepath}")
+            self.logger.info(f"Saved {len(series)} bars to {filepath}")
             return True
         except Exception as e:
             self.logger.error(f"JSON export error: {e}")
             return False
     
-    def _count_missing_bars(self, bars: List[Bar]) -> int:
-        """Detectează baruri lipsă (simplificat - poate fi îmbunătățit)."""
-        # TODO: Implementare mai sofisticată bazată pe timeframe
-        # Pentru acum, returnăm 0
-        return 0
+    @staticmethod
+    def _write_json_items(f, items: Iterator[bytes], separator: bytes) -> None:
+        """Scrie fragmente JSON separate (fragmentele goale se sar)."""
+        first = True
+        for item in items:
+            if not item:
+                continue
+            if not first:
+                f.write(separator)
+            f.write(item)
+            first = False
+    
+    def _json_rows(self, series: BarSeries, sources: Optional[np.ndarray] = None) -> Iterator[bytes]:
+        """Bars ca obiecte JSON indentate (ca json.dump(indent=2)), bucată cu bucată."""
+        for start in range(0, len(series), self.JSON_CHUNK):
+            chunk = series[start:start + self.JSON_CHUNK].to_bars()
+            if sources is not None:
+                for bar, source in zip(chunk, sources[start:start + self.JSON_CHUNK]):
+                    bar.source = source
+            yield b',\n'.join(
+                textwrap.indent(_json_bytes(bar.to_dict(), indent=True).decode('utf-8'), '    ').encode('utf-8')
+                for bar in chunk
+            )
+    
+    def _json_column(self, series: BarSeries, name: str, sources: Optional[np.ndarray] = None) -> Iterator[list]:
+        """Valorile unei coloane JSON compact, ca liste Python (lipsă = null)."""
+        for start in range(0, len(series), self.JSON_CHUNK):
+            chunk = series[start:start + self.JSON_CHUNK]
+            if name == "source":
+                yield list(sources[start:start + self.JSON_CHUNK])
+            elif name == "timestamp":
+                yield [ts.isoformat() for ts in chunk.datetime_index().to_pydatetime()]
+            elif name == "count":
+                yield [None if c == COUNT_MISSING else c for c in chunk.count.tolist()]
+            elif name == "wap":
+                yield [None if w != w else w for w in chunk.wap.tolist()]
+            elif name == "hasGaps":
+                yield [None if g == GAPS_MISSING else bool(g) for g in chunk.has_gaps.tolist()]
+            else:
+                yield getattr(chunk, name).tolist()
+    
+    def bars_to_parquet(
+        self,
+        bars: Union[List[Bar], BarSeries],
+        root_dir: str,
+        symbol: str,
+        timeframe: str,
+        sources: Optional[np.ndarray] = None,
+        changed: Optional[np.ndarray] = None
+    ) -> bool:
+        """Exportă bars → dataset Parquet partiționat (symbol/timeframe/year).
+        
+        Layout: {root_dir}/symbol=AAPL/timeframe=1H/year=2026/data.parquet
+        Bars noi se adaugă la partițiile existente; la timestamp duplicat
+        câștigă sursa preferată (self.merger), iar la aceeași sursă bar-ul nou.
+        Timestamp-ul e int64 (ns UTC), OHLC float64.
+        
+        Args:
+            bars: Lista de Bar-uri sau BarSeries
+            root_dir: Directorul rădăcină al dataset-ului
+            symbol: Simbol stoc
+            timeframe: Timeframe
+            sources: Sursa per rând (None = sursa seriei)
+            changed: Timestamp-urile (ns UTC) rândurilor noi; se rescriu doar
+                partițiile anilor lor, nu tot istoricul (None = toate partițiile seriei)
+        
+        Returns:
+            True dacă exportul reușește
+        """
+        if not PARQUET_AVAILABLE:
+            self.logger.error("pyarrow not installed. Install with: pip install pyarrow")
+            return False
+        try:
+            if not len(bars):
+                self.logger.warning(f"No bars to export for {symbol}")
+                return False
+            
+            table = self._bars_to_table(bars, sources)
+            years = pd.to_datetime(table.column("timestamp").to_numpy(), utc=True).year.to_numpy()
+            touched = set(years.tolist())
+            if changed is not None:
+                touched &= set(pd.to_datetime(np.asarray(changed, dtype=np.int64), utc=True).year.tolist())
+            
+            for year in sorted(touched):
+                part = table.filter(pa.array(years == year))
+                part_dir = Path(root_dir) / f"symbol={symbol}" / f"timeframe={timeframe}" / f"year={year}"
+                part_dir.mkdir(parents=True, exist_ok=True)
+                part_path = part_dir / "data.parquet"
+                
+                # Append: combină cu partiția existentă (rândurile noi după cele existente)
+                if part_path.exists():
+                    existing = pq.read_table(part_path, schema=self._parquet_schema())
+                    part = pa.concat_tables([existing, part])
+                part = self._dedupe_table(part)
+                
+                # Prefixul "." ascunde fișierul temporar de cititorii dataset-ului
+                tmp_path = part_dir / ".data.parquet.tmp"
+                pq.write_table(part, tmp_path, compression="zstd")
+                os.replace(tmp_path, part_path)
+            
+            self.logger.info(f"Saved {len(bars)} bars to {root_dir} (parquet, {len(touched)} partitions)")
+            return True
+        except Exception as e:
+            self.logger.error(f"Parquet export error: {e}")
+            return False
+    
+    def read_parquet(
+        self,
+        root_dir: str,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Citește bars din dataset-ul Parquet, cu filtrare pe partiții și coloane.
+        
+        Args:
+            root_dir: Directorul rădăcină al dataset-ului
+            symbol: Filtru simbol (None = toate)
+            timeframe: Filtru timeframe (None = toate)
+            columns: Coloanele de citit (None = toate)
+            start: Timestamp minim inclusiv (naive = UTC)
+            end: Timestamp maxim inclusiv (naive = UTC)
+        
+        Returns:
+            DataFrame sortat după timestamp (timestamp ca datetime64 UTC)
+        """
+        if not PARQUET_AVAILABLE:
+            self.logger.error("pyarrow not installed. Install with: pip install pyarrow")
+            return pd.DataFrame()
+        if not Path(root_dir).exists():
+            return pd.DataFrame()
+        
+        dataset = ds.dataset(root_dir, format="parquet", partitioning="hive")
+        expr = None
+        conditions = []
+        if symbol is not None:
+            conditions.append(ds.field("symbol") == symbol)
+        if timeframe is not None:
+            conditions.append(ds.field("timeframe") == timeframe)
+        if start is not None:
+            start_ts = self._to_utc(start)
+            conditions.append(ds.field("year") >= start_ts.year)
+            conditions.append(ds.field("timestamp") >= start_ts.value)
+        if end is not None:
+            end_ts = self._to_utc(end)
+            conditions.append(ds.field("year") <= end_ts.year)
+            conditions.append(ds.field("timestamp") <= end_ts.value)
+        for condition in conditions:
+            expr = condition if expr is None else expr & condition
+        
+        if columns is not None and "timestamp" not in columns:
+            columns = ["timestamp", *columns]
+        df = dataset.to_table(columns=list(columns) if columns else None, filter=expr).to_pandas()
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ns", utc=True)
+        return df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+    
+    @staticmethod
+    def _to_utc(ts) -> pd.Timestamp:
+        t = pd.Timestamp(ts)
+        t = t.tz_convert("UTC") if t.tzinfo is not None else t.tz_localize("UTC")
+        return t.as_unit("ns")
+    
+    @staticmethod
+    def _parquet_schema():
+        return pa.schema([
+            ("timestamp", pa.int64()),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.int64()),
+            ("count", pa.int64()),
+            ("wap", pa.float64()),
+            ("hasGaps", pa.bool_()),
+            ("source", pa.string()),
+        ])
+    
+    def _bars_to_table(self, bars: Union[List[Bar], BarSeries], sources: Optional[np.ndarray] = None):
+        """Bars → pyarrow.Table cu coloane tipizate."""
+        series = bars if isinstance(bars, BarSeries) else BarSeries.from_bars(bars)
+        if sources is None:
+            sources = [series.source] * len(series)
+        return pa.table({
+            "timestamp": pa.array(series.timestamps, pa.int64()),
+            "open": pa.array(series.open, pa.float64()),
+            "high": pa.array(series.high, pa.float64()),
+            "low": pa.array(series.low, pa.float64()),
+            "close": pa.array(series.close, pa.float64()),
+            "volume": pa.array(series.volume, pa.int64()),
+            "count": pa.array(series.count, pa.int64(), mask=series.count == COUNT_MISSING),
+            "wap": pa.array(series.wap, pa.float64(), mask=np.isnan(series.wap)),
+            "hasGaps": pa.array(series.has_gaps == 1, pa.bool_(), mask=series.has_gaps == GAPS_MISSING),
+            "source": pa.array(list(sources), pa.string()),
+        }, schema=self._parquet_schema())
+    
+    @staticmethod
+    def _series_to_csv_frame(series: BarSeries) -> pd.DataFrame:
+        """BarSeries → DataFrame cu aceleași coloane ca Bar.to_csv_dict()."""
+        return pd.DataFrame({
+            "symbol": series.symbol or "",
+            "timeframe": series.timeframe or "",
+            "timestamp": series.datetime_index().strftime('%Y-%m-%d %H:%M:%S'),
+            "open": np.round(series.open, 2),
+            "high": np.round(series.high, 2),
+            "low": np.round(series.low, 2),
+            "close": np.round(series.close, 2),
+            "volume": series.volume,
+            "count": np.where(series.count == COUNT_MISSING, 0, series.count),
+            "wap": np.round(np.nan_to_num(series.wap, nan=0.0), 2),
+            "hasGaps": series.has_gaps == 1,
+            "source": series.source or "",
+            "normalized": bool(series.normalized),
+        })
+    
+    def _dedupe_table(self, table):
+        """Sortează după timestamp; la duplicate câștigă sursa preferată, apoi rândul mai nou (ultimul)."""
+        timestamps = table.column("timestamp").to_numpy()
+        names, codes = np.unique(np.array(table.column("source").to_pylist(), dtype=object).astype(str),
+                                 return_inverse=True)
+        ranks = np.array([self.merger.rank(None if name == "None" else name) for name in names.tolist()],
+                         dtype=np.int64)[codes]
+        newest_first = np.arange(len(timestamps))[::-1]
+        order = np.lexsort((newest_first, ranks, timestamps))
+        ordered = timestamps[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = ordered[1:] != ordered[:-1]
+        return table.take(pa.array(order[keep]))
+    
+    def csv_to_bars(self, filepath: str, tz: Optional[str] = None) -> List[Bar]:
+        """Încarcă bars dintr-un CSV scris de bars_to_csv.
+        
+        Args:
+            filepath: Cale fișier CSV
+            tz: Timezone pentru timestamp-uri (CSV-ul păstrează doar ora locală)
+        
+        Returns:
+            Lista de Bar-uri (goală dacă fișierul lipsește sau e invalid)
+        """
+        try:
+            if not Path(filepath).exists():
+                return []
+            df = pd.read_csv(filepath, keep_default_na=False)
+            timestamps = pd.to_datetime(df["timestamp"])
+            if tz is not None:
+                timestamps = timestamps.dt.tz_localize(tz, ambiguous='NaT', nonexistent='NaT')
+            bars = []
+            skipped = 0
+            for ts, row in zip(timestamps, df.to_dict("records")):
+                if pd.isna(ts):
+                    continue
+                try:
+                    bar = Bar(
+                        timestamp=ts.to_pydatetime(),
+                        open=float(row["open"]),
+                        high=float(row["high"]),
+                        low=float(row["low"]),
+                        close=float(row["close"]),
+                        volume=int(row["volume"]),
+                        symbol=row.get("symbol") or None,
+                        timeframe=row.get("timeframe") or None,
+                        count=int(row["count"]) if row.get("count") else None,
+                        wap=float(row["wap"]) if row.get("wap") else None,
+                        hasGaps=bool(row.get("hasGaps")),
+                        source=row.get("source") or None,
+                        normalized=bool(row.get("normalized"))
+                    )
+                except ValueError:
+                    # Un rând inconsistent nu invalidează tot istoricul
+                    skipped += 1
+                    continue
+                bars.append(bar)
+            if skipped:
+                self.logger.warning(f"CSV import {filepath}: skipped {skipped} invalid rows")
+            return bars
+        except Exception as e:
+            self.logger.error(f"CSV import error: {e}")
+            return []
+    
+    def json_to_bars(self, filepath: str) -> List[Bar]:
+        """Încarcă bars dintr-un JSON scris de bars_to_json (clasic sau compact).
+        
+        Args:
+            filepath: Cale fișier JSON
+        
+        Returns:
+            Lista de Bar-uri (goală dacă fișierul lipsește sau e invalid)
+        """
+        try:
+            data = self._read_json(filepath)
+            if data is None:
+                return []
+            if data.get("format") == "columnar":
+                bars = self._columnar_to_series(data).to_bars()
+                for bar, source in zip(bars, data["bars"].get("source") or []):
+                    bar.source = source
+                return bars
+            return self._rows_to_bars(data)
+        except Exception as e:
+            self.logger.error(f"JSON import error: {e}")
+            return []
+    
+    def json_to_series(self, filepath: str, return_sources: bool = False):
+        """Încarcă un JSON scris de bars_to_json direct ca BarSeries.
+        
+        Args:
+            filepath: Cale fișier JSON
+            return_sources: Returnează și sursa per rând (None dacă fișierul nu o are)
+        
+        Returns:
+            BarSeries (goală dacă fișierul lipsește sau e invalid);
+            cu return_sources: (BarSeries, np.ndarray sau None)
+        """
+        series, sources = BarSeries.empty(), None
+        try:
+            data = self._read_json(filepath)
+            if data is not None and data.get("format") == "columnar":
+                series = self._columnar_to_series(data)
+                if data["bars"].get("source") is not None:
+                    sources = np.array(data["bars"]["source"], dtype=object)
+            elif data is not None:
+                bars = self._rows_to_bars(data)
+                series = BarSeries.from_bars(bars)
+                sources = np.array([bar.source for bar in bars], dtype=object)
+        except Exception as e:
+            self.logger.error(f"JSON import error: {e}")
+        return (series, sources) if return_sources else series
+    
+    def _rows_to_bars(self, data: dict) -> List[Bar]:
+        """Secțiunea "bars" a unui JSON clasic (un obiect per bar) → Bar-uri (rândurile invalide se sar)."""
+        bars = []
+        skipped = 0
+        for item in data.get("bars", []):
+            item = dict(item)
+            item["timestamp"] = datetime.fromisoformat(item["timestamp"])
+            try:
+                bars.append(Bar(**item))
+            except ValueError:
+                skipped += 1
+        if skipped:
+            self.logger.warning(f"JSON import {data.get('symbol') or ''}: skipped {skipped} invalid rows")
+        return bars
+    
+    @staticmethod
+    def _read_json(filepath: str) -> Optional[dict]:
+        if not Path(filepath).exists():
+            return None
+        with open(filepath, 'rb') as f:
+            return _json_loads(f.read())
+    
+    @staticmethod
+    def _columnar_to_series(data: dict) -> BarSeries:
+        """Secțiunea "bars" a unui JSON compact → BarSeries."""
+        columns = data["bars"]
+        count = np.array([COUNT_MISSING if c is None else c for c in columns["count"]], np.int32)
+        wap = np.array([np.nan if w is None else w for w in columns["wap"]], np.float64)
+        has_gaps = np.array([GAPS_MISSING if g is None else g for g in columns["hasGaps"]], np.int8)
+        tz = BarSeries.tz_from_name(data.get("tz"))
+        if tz is None and columns["timestamp"]:
+            # Offset fix fără nume de timezone: păstrăm offset-ul primului bar
+            tz = datetime.fromisoformat(columns["timestamp"][0]).tzinfo
+        stamps = pd.to_datetime(columns["timestamp"], utc=tz is not None)
+        metadata = data.get("metadata", {})
+        source = metadata.get("source")
+        return BarSeries(
+            symbol=data.get("symbol"),
+            timeframe=data.get("timeframe"),
+            timestamps=pd.DatetimeIndex(stamps).as_unit("ns").asi8,
+            open=columns["open"],
+            high=columns["high"],
+            low=columns["low"],
+            close=columns["close"],
+            volume=columns["volume"],
+            count=count,
+            wap=wap,
+            has_gaps=has_gaps,
+            source=None if source == "UNKNOWN" else source,
+            tz=tz,
+            normalized=metadata.get("normalized"),
+        )
+    
+    def find_missing_ranges(
+        self,
+        bars: Union[List[Bar], BarSeries],
+        timeframe: Optional[str] = None,
+        useRTH: Optional[bool] = None
+    ) -> List[MissingRange]:
+        """Intervalele cu bars lipsă față de calendarul bursei (între primul și ultimul bar).
+        
+        Args:
+            bars: Lista de Bar-uri sau BarSeries
+            timeframe: Timeframe (default: cel al seriei)
+            useRTH: Sesiune regulară (None = dedusă din timestamp-uri)
+        
+        Returns:
+            Intervale [start, end) UTC (goală pentru timeframe necunoscut)
+        """
+        series = bars if isinstance(bars, BarSeries) else BarSeries.from_bars(bars, timeframe=timeframe)
+        try:
+            return self.calendar.missing_ranges(series, timeframe, useRTH)
+        except ValueError as e:
+            self.logger.warning(f"Gap detection skipped: {e}")
+            return []
     
-    def _count_duplicates(self, bars: List[Bar]) -> int:
+    def _count_duplicates(self, bars: Union[List[Bar], BarSeries]) -> int:
         """Detectează duplicate timestamp."""
-        if not bars:
-            return 0
-        timestamps = [b.timestamp for b in bars]
-        return len(timestamps) - len(set(timestamps))
+        series = bars if isinstance(bars, BarSeries) else BarSeries.from_bars(bars)
+        return len(series) - len(np.unique(series.timestamps))
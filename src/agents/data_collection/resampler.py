@@ -0,0 +1,153 @@
+"""
+Resampler - Timeframe-uri mari derivate local din bars mai fine (ex: 1m → 5m/15m/1H/4H/1D)
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.agents.data_collection.market_calendar import NS, ExchangeCalendar
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import BarSeries, COUNT_MISSING, GAPS_MISSING
+from src.common.utils.helpers import timeframe_to_seconds
+
+
+class Resampler:
+    """Agregă bars fine în bars mai mari, pe sesiunile calendarului bursei.
+
+    Bars țintă sunt aliniate la deschiderea sesiunii (ca ExchangeCalendar) și
+    nu traversează închiderea: ultimul bar al zilei e trunchiat (ex: 4H RTH =
+    09:30-13:30 + 13:30-16:00), zilele scurte se închid la 13:00. Agregarea e
+    vectorizată (np.*.reduceat pe grupuri contigue):
+
+    - open/close: primul/ultimul bar, high/low: max/min, volume: sumă
+    - wap: medie ponderată cu volumul (media simplă dacă volumul e 0)
+    - count: sumă (lipsă doar dacă lipsește la toate bars din grup)
+    - hasGaps: True dacă oricare bar are goluri
+    """
+
+    def __init__(self, calendar: Optional[ExchangeCalendar] = None):
+        """
+        Args:
+            calendar: Calendarul bursei (default: NYSE)
+        """
+        self.calendar = calendar or ExchangeCalendar()
+        self.logger = get_logger(__name__)
+
+    def resample(self, series: BarSeries, timeframe: str, useRTH: Optional[bool] = None) -> BarSeries:
+        """Agregă seria în timeframe-ul cerut.
+
+        Args:
+            series: Bars sursă (timeframe mai fin; timeframe-ul țintă trebuie să fie multiplu)
+            timeframe: Timeframe țintă ('5m', '15m', '1H', '4H', '1D')
+            useRTH: Sesiune regulară; None = dedusă din timestamp-uri
+
+        Returns:
+            BarSeries în timeframe-ul țintă (bars din afara sesiunii sunt ignorate)
+
+        Raises:
+            ValueError: Timeframe necunoscut sau care nu e multiplu al celui sursă
+        """
+        target_ns = timeframe_to_seconds(timeframe) * NS
+        if series.timeframe:
+            source_ns = timeframe_to_seconds(series.timeframe) * NS
+            if target_ns <= source_ns or target_ns % source_ns:
+                raise ValueError(f"Cannot resample {series.timeframe} to {timeframe}")
+        if not len(series):
+            return BarSeries.empty(series.symbol, timeframe, series.source)
+        if np.any(np.diff(series.timestamps) <= 0):
+            series = series.unique()
+
+        stamps = series.timestamps
+        daily = target_ns >= 86400 * NS
+        if useRTH is None:
+            useRTH = self.calendar.is_rth(stamps)
+
+        # Slotul țintă al fiecărui bar sursă
+        lo, hi = int(stamps[0]), int(stamps[-1]) + 1
+        if daily:
+            first = pd.Timestamp(lo, tz="UTC").tz_convert(self.calendar.tz).date()
+            last = pd.Timestamp(hi - 1, tz="UTC").tz_convert(self.calendar.tz).date()
+            days, slots, slot_ends = self.calendar.sessions(first, last, useRTH)
+        else:
+            slots, slot_ends = self.calendar.slots(lo, hi, timeframe, useRTH)
+        pos = np.searchsorted(slots, stamps, side="right") - 1
+        inside = pos >= 0
+        inside[inside] &= stamps[inside] < slot_ends[pos[inside]]
+        if not inside.all():
+            self.logger.debug(f"{series.symbol}: {int((~inside).sum())} bars outside sessions ignored")
+            series, pos = series[inside], pos[inside]
+        if not len(series):
+            return BarSeries.empty(series.symbol, timeframe, series.source)
+
+        starts = np.flatnonzero(np.r_[True, pos[1:] != pos[:-1]])
+        ends = np.r_[starts[1:], len(pos)] - 1
+
+        volume = series.volume
+        count_known = series.count != COUNT_MISSING
+        count = np.add.reduceat(np.where(count_known, series.count, 0).astype(np.int64), starts)
+        count = np.where(np.logical_or.reduceat(count_known, starts), count, COUNT_MISSING)
+
+        wap_known = ~np.isnan(series.wap)
+        weight = np.add.reduceat(np.where(wap_known, volume, 0), starts)
+        weighted = np.add.reduceat(np.where(wap_known, series.wap * volume, 0.0), starts)
+        plain = np.add.reduceat(np.where(wap_known, series.wap, 0.0), starts)
+        known = np.add.reduceat(wap_known.astype(np.int64), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            wap = np.where(weight > 0, weighted / weight, np.where(known > 0, plain / known, np.nan))
+
+        has_gaps = np.where(
+            np.logical_or.reduceat(series.has_gaps == 1, starts), 1,
+            np.where(np.logical_or.reduceat(series.has_gaps != GAPS_MISSING, starts), 0, GAPS_MISSING)
+        )
+
+        if daily:
+            # Bar zilnic: miezul nopții zilei de sesiune (naive sau în timezone-ul bursei)
+            session_days = days[pos[starts]]
+            if series.tz is None:
+                timestamps = session_days.astype("datetime64[ns]").astype(np.int64)
+            else:
+                timestamps = pd.DatetimeIndex(session_days.astype("datetime64[ns]")).tz_localize(self.calendar.tz).asi8
+        else:
+            timestamps = slots[pos[starts]]
+
+        return BarSeries(
+            symbol=series.symbol,
+            timeframe=timeframe,
+            timestamps=timestamps,
+            open=series.open[starts],
+            high=np.maximum.reduceat(series.high, starts),
+            low=np.minimum.reduceat(series.low, starts),
+            close=series.close[ends],
+            volume=np.add.reduceat(volume, starts),
+            count=count.astype(np.int32),
+            wap=wap,
+            has_gaps=has_gaps.astype(np.int8),
+            source=series.source,
+            tz=series.tz,
+            normalized=series.normalized,
+        )
+
+    def resample_many(
+        self,
+        series: BarSeries,
+        timeframes: Iterable[str],
+        useRTH: Optional[bool] = None
+    ) -> Dict[str, BarSeries]:
+        """Toate timeframe-urile cerute, din aceeași serie sursă.
+
+        Returns:
+            Dict timeframe → BarSeries (timeframe-urile invalide lipsesc, cu warning)
+        """
+        if useRTH is None and len(series):
+            useRTH = self.calendar.is_rth(series.timestamps)
+        results = {}
+        for timeframe in dict.fromkeys(timeframes):
+            if timeframe == series.timeframe:
+                continue
+            try:
+                results[timeframe] = self.resample(series, timeframe, useRTH)
+            except ValueError as e:
+                self.logger.warning(f"Resample skipped: {e}")
+        return results
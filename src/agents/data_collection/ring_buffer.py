@@ -0,0 +1,164 @@
+"""
+Ring Buffer - Istoric live de dimensiune fixă per (simbol, timeframe), în memorie
+"""
+
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.common.models.market_data import Bar, BarSeries, COUNT_MISSING, GAPS_MISSING
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_ns(ts) -> int:
+    """datetime/date → ns de la epoch (naive = UTC), fără pandas."""
+    if not isinstance(ts, datetime):
+        ts = datetime.combine(ts, time())
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // _MICROSECOND * 1000
+
+
+class BarRingBuffer:
+    """Ultimele `depth` bars ale unui simbol, în coloane NumPy prealocate.
+
+    Fiecare bar se scrie de două ori (la poziția p și p + depth), astfel că
+    ultimele n bars sunt mereu contigue: last(n) e un view, fără copiere.
+    append() e O(1); un bar cu același timestamp ca ultimul îl înlocuiește
+    (update-urile bar-ului în formare).
+
+    View-urile întoarse de last() văd scrierile ulterioare; se copiază
+    (copy=True) dacă trebuie păstrate peste append-uri.
+    """
+
+    _COLUMNS = BarSeries._COLUMNS
+
+    def __init__(self, symbol: str, timeframe: str, depth: int, source: Optional[str] = None):
+        """
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe
+            depth: Numărul maxim de bars păstrate
+            source: Sursa bars
+        """
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.depth = depth
+        self.source = source
+        self.tz = None
+        self.normalized = None
+        size = 2 * depth
+        self.timestamps = np.zeros(size, np.int64)
+        self.open = np.zeros(size, np.float64)
+        self.high = np.zeros(size, np.float64)
+        self.low = np.zeros(size, np.float64)
+        self.close = np.zeros(size, np.float64)
+        self.volume = np.zeros(size, np.int64)
+        self.count = np.full(size, COUNT_MISSING, np.int32)
+        self.wap = np.full(size, np.nan, np.float64)
+        self.has_gaps = np.full(size, GAPS_MISSING, np.int8)
+        self._pos = -1          # poziția (0..depth-1) a ultimului bar scris
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, bar: Bar) -> None:
+        """Adaugă un bar (sau înlocuiește ultimul dacă are același timestamp)."""
+        if self._size == 0:
+            self.tz = getattr(bar.timestamp, "tzinfo", None)
+            self.normalized = bar.normalized
+            if self.source is None:
+                self.source = bar.source
+        self.append_values(
+            _to_ns(bar.timestamp), bar.open, bar.high, bar.low, bar.close, bar.volume,
+            COUNT_MISSING if bar.count is None else bar.count,
+            np.nan if bar.wap is None else bar.wap,
+            GAPS_MISSING if bar.hasGaps is None else bar.hasGaps,
+        )
+
+    def append_values(self, timestamp_ns: int, open: float, high: float, low: float, close: float,
+                      volume: int, count: int = COUNT_MISSING, wap: float = np.nan,
+                      has_gaps: int = GAPS_MISSING) -> None:
+        """append() pe valori brute (timestamp în ns UTC)."""
+        if self._size and self.timestamps[self._pos + self.depth] == timestamp_ns:
+            pos = self._pos
+        else:
+            pos = self._pos + 1
+            if pos == self.depth:
+                pos = 0
+            self._pos = pos
+            if self._size < self.depth:
+                self._size += 1
+        for i in (pos, pos + self.depth):
+            self.timestamps[i] = timestamp_ns
+            self.open[i] = open
+            self.high[i] = high
+            self.low[i] = low
+            self.close[i] = close
+            self.volume[i] = volume
+            self.count[i] = count
+            self.wap[i] = wap
+            self.has_gaps[i] = has_gaps
+
+    def last(self, n: Optional[int] = None, copy: bool = False) -> BarSeries:
+        """Ultimele n bars (default: toate), în ordine cronologică.
+
+        Args:
+            n: Număr de bars (limitat la len())
+            copy: True = coloane copiate (independente de append-uri ulterioare)
+
+        Returns:
+            BarSeries cu view-uri peste buffer (sau copii)
+        """
+        n = self._size if n is None else max(0, min(n, self._size))
+        end = self._pos + self.depth + 1
+        window = slice(end - n, end)
+        columns = {name: getattr(self, name)[window] for name in self._COLUMNS}
+        if copy:
+            columns = {name: column.copy() for name, column in columns.items()}
+        return BarSeries(symbol=self.symbol, timeframe=self.timeframe, source=self.source,
+                         tz=self.tz, normalized=self.normalized, **columns)
+
+    def latest(self) -> Optional[Bar]:
+        """Ultimul bar (sau None dacă buffer-ul e gol)."""
+        return self.last(1)[0] if self._size else None
+
+
+class RingBufferStore:
+    """Ring buffer-ele unei surse, create la primul bar al fiecărui (simbol, timeframe)."""
+
+    def __init__(self, depth: int = 500):
+        """
+        Args:
+            depth: Numărul de bars păstrate per (simbol, timeframe)
+        """
+        self.depth = depth
+        self._buffers: Dict[Tuple[str, str], BarRingBuffer] = {}
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._buffers
+
+    def buffer(self, symbol: str, timeframe: str) -> BarRingBuffer:
+        """Buffer-ul pentru (simbol, timeframe), creat la nevoie."""
+        key = (symbol, timeframe)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = BarRingBuffer(symbol, timeframe, self.depth)
+        return buffer
+
+    def append(self, bar: Bar) -> None:
+        self.buffer(bar.symbol, bar.timeframe).append(bar)
+
+    def last(self, symbol: str, timeframe: str, n: Optional[int] = None) -> BarSeries:
+        """Ultimele n bars pentru (simbol, timeframe); serie goală dacă nu există."""
+        buffer = self._buffers.get((symbol, timeframe))
+        if buffer is None:
+            return BarSeries.empty(symbol, timeframe)
+        return buffer.last(n)
@@ -0,0 +1,196 @@
+"""
+Request Scheduler - Pacing per sursă de date (token bucket + limite de concurență)
+"""
+
+from typing import Dict, Hashable, Optional
+from collections import deque
+from contextlib import asynccontextmanager
+import asyncio
+import time
+
+from src.common.logging_utils.logger import get_logger
+
+
+# Limite implicite per sursă (suprascrise din data_collector.pacing)
+DEFAULT_PACING = {
+    "IBKR": {
+        "max_requests": 60,                 # max 60 requests historical ...
+        "period_seconds": 600,              # ... în orice fereastră de 10 minute
+        "max_concurrent": 6,
+        "identical_interval_seconds": 15,   # request identic: min 15 sec distanță
+        "same_contract_requests": 5,        # a 6-a cerere pe același contract în 2 sec = violare
+        "same_contract_period_seconds": 2,
+    },
+    "YAHOO": {
+        "max_requests": 120,
+        "period_seconds": 60,
+        "max_concurrent": 8,
+    },
+}
+
+
+class TokenBucket:
+    """Token bucket cu fereastră glisantă.
+
+    Fiecare token consumat revine în bucket exact după `period` secunde, deci
+    în orice fereastră de `period` secunde se fac cel mult `capacity` cereri
+    (semantica regulilor de pacing IBKR, spre deosebire de refill continuu).
+    """
+
+    def __init__(self, capacity: int, period: float):
+        """
+        Args:
+            capacity: Număr maxim de tokeni în fereastră
+            period: Lungimea ferestrei în secunde
+        """
+        if capacity <= 0 or period <= 0:
+            raise ValueError("capacity and period must be positive")
+        self.capacity = int(capacity)
+        self.period = float(period)
+        self._spent: deque = deque()
+        self._lock = asyncio.Lock()
+
+    def _release_expired(self, now: float) -> None:
+        while self._spent and now - self._spent[0] >= self.period:
+            self._spent.popleft()
+
+    @property
+    def available(self) -> int:
+        """Tokeni disponibili acum."""
+        self._release_expired(time.monotonic())
+        return self.capacity - len(self._spent)
+
+    async def acquire(self) -> None:
+        """Așteaptă până când un token e disponibil și îl consumă."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._release_expired(now)
+                if len(self._spent) < self.capacity:
+                    self._spent.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self._spent[0]))
+
+
+class SourcePacer:
+    """Pacing pentru o singură sursă: bucket global, concurență, reguli per request."""
+
+    def __init__(
+        self,
+        name: str,
+        max_requests: int,
+        period_seconds: float,
+        max_concurrent: int = 1,
+        identical_interval_seconds: float = 0,
+        same_contract_requests: int = 0,
+        same_contract_period_seconds: float = 0,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(max_requests, period_seconds)
+        self.semaphore = asyncio.Semaphore(max(1, int(max_concurrent)))
+        self.identical_interval = float(identical_interval_seconds)
+        self.same_contract_requests = int(same_contract_requests)
+        self.same_contract_period = float(same_contract_period_seconds)
+        self._last_identical: Dict[Hashable, float] = {}
+        self._identical_locks: Dict[Hashable, asyncio.Lock] = {}
+        self._contract_buckets: Dict[Hashable, TokenBucket] = {}
+
+    async def _wait_identical(self, request_key: Hashable) -> None:
+        """Respectă intervalul minim între request-uri identice."""
+        lock = self._identical_locks.setdefault(request_key, asyncio.Lock())
+        async with lock:
+            last = self._last_identical.get(request_key)
+            if last is not None:
+                wait = self.identical_interval - (time.monotonic() - last)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            self._last_identical[request_key] = time.monotonic()
+
+    async def wait_request_rules(
+        self,
+        request_key: Optional[Hashable] = None,
+        contract_key: Optional[Hashable] = None,
+    ) -> None:
+        """Aplică regulile per request (identic, per contract)."""
+        if request_key is not None and self.identical_interval > 0:
+            await self._wait_identical(request_key)
+        if contract_key is not None and self.same_contract_requests > 0:
+            bucket = self._contract_buckets.get(contract_key)
+            if bucket is None:
+                bucket = TokenBucket(self.same_contract_requests, self.same_contract_period)
+                self._contract_buckets[contract_key] = bucket
+            await bucket.acquire()
+
+
+class RequestScheduler:
+    """Scheduler de request-uri cu pacing separat pentru fiecare sursă."""
+
+    def __init__(self, pacing: Optional[Dict[str, dict]] = None):
+        """
+        Args:
+            pacing: Limite per sursă ({'IBKR': {...}, 'YAHOO': {...}});
+                    sursele lipsă folosesc DEFAULT_PACING
+        """
+        self.logger = get_logger(__name__)
+        self._limits: Dict[str, dict] = {
+            name: dict(limits) for name, limits in DEFAULT_PACING.items()
+        }
+        for name, limits in (pacing or {}).items():
+            merged = dict(self._limits.get(name.upper(), {}))
+            merged.update(limits or {})
+            self._limits[name.upper()] = merged
+        self._pacers: Dict[str, SourcePacer] = {}
+
+    @classmethod
+    def from_config(cls, data_collector_config: dict) -> "RequestScheduler":
+        """Creează scheduler din secțiunea data_collector (cheia `pacing`)."""
+        return cls(data_collector_config.get("pacing"))
+
+    def limits_for(self, source: str) -> dict:
+        """Limitele efective pentru o sursă.
+
+        O conexiune a unei surse ('IBKR#2') are limitele proprii dacă sunt
+        configurate, altfel pe cele ale sursei ('IBKR'), cu pacer separat.
+        """
+        key = source.upper()
+        limits = self._limits.get(key) or self._limits.get(key.split("#", 1)[0])
+        return limits or {"max_requests": 1, "period_seconds": 10}
+
+    def _pacer(self, source: str) -> SourcePacer:
+        key = source.upper()
+        pacer = self._pacers.get(key)
+        if pacer is None:
+            pacer = SourcePacer(key, **self.limits_for(key))
+            self._pacers[key] = pacer
+        return pacer
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        source: str,
+        request_key: Optional[Hashable] = None,
+        contract_key: Optional[Hashable] = None,
+        requests: int = 1,
+    ):
+        """Rezervă un slot pentru un request către `source`.
+
+        Args:
+            source: Numele sursei ('IBKR', 'YAHOO', ...)
+            request_key: Cheie pentru regula de request identic
+            contract_key: Cheie pentru limita per contract
+            requests: Tokeni consumați (ex: un download multi-ticker Yahoo
+                face câte un request HTTP per simbol)
+
+        Usage:
+            async with scheduler.slot('IBKR', request_key=(...)):
+                bars = await source.fetch_historical_data(...)
+        """
+        pacer = self._pacer(source)
+        await pacer.wait_request_rules(request_key, contract_key)
+        async with pacer.semaphore:
+            # Tokenul se consumă abia când request-ul chiar pleacă
+            if pacer.bucket.available < requests:
+                self.logger.debug(f"{pacer.name} pacing limit reached, waiting for a free slot")
+            for _ in range(max(1, int(requests))):
+                await pacer.bucket.acquire()
+            yield
@@ -0,0 +1,65 @@
+"""
+Sharding - Hash consistent pentru împărțirea simbolurilor între conexiuni
+"""
+
+from typing import Dict, Generic, Hashable, Iterable, List, Sequence, TypeVar
+import hashlib
+
+import numpy as np
+
+
+Node = TypeVar("Node", bound=Hashable)
+
+
+def _hash64(text: str) -> int:
+    """Hash stabil între procese și rulări (spre deosebire de hash())."""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ConsistentHashRing(Generic[Node]):
+    """Inel de hash consistent cu noduri virtuale.
+
+    Fiecare nod ocupă `replicas` puncte pe inel; o cheie aparține primului
+    punct de după hash-ul ei. Adăugarea sau scoaterea unui nod mută doar
+    ~1/N din chei (restul rămân pe aceeași conexiune, cu contractele și
+    pacing-ul deja încălzite).
+    """
+
+    def __init__(self, nodes: Iterable[Node], replicas: int = 128):
+        """
+        Args:
+            nodes: Nodurile inelului (ex: indicii conexiunilor)
+            replicas: Puncte virtuale per nod (mai multe = distribuție mai uniformă)
+
+        Raises:
+            ValueError: Inel fără noduri
+        """
+        self.nodes: List[Node] = list(dict.fromkeys(nodes))
+        if not self.nodes:
+            raise ValueError("Consistent hash ring needs at least one node")
+        self.replicas = replicas
+        points = [(_hash64(f"{node}#{i}"), n) for n, node in enumerate(self.nodes) for i in range(replicas)]
+        points.sort()
+        self._points = np.array([p for p, _ in points], dtype=np.uint64)
+        self._owners = np.array([n for _, n in points], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def node_for(self, key: str) -> Node:
+        """Nodul care deține cheia."""
+        return self.nodes[self._owner(np.array([_hash64(key)], dtype=np.uint64))[0]]
+
+    def assign(self, keys: Sequence[str]) -> Dict[Node, List[str]]:
+        """Cheile grupate pe noduri (ordinea cheilor se păstrează; nodurile fără chei lipsesc)."""
+        if not len(keys):
+            return {}
+        owners = self._owner(np.array([_hash64(key) for key in keys], dtype=np.uint64))
+        groups: Dict[Node, List[str]] = {}
+        for key, owner in zip(keys, owners.tolist()):
+            groups.setdefault(self.nodes[owner], []).append(key)
+        return groups
+
+    def _owner(self, hashes: np.ndarray) -> np.ndarray:
+        pos = np.searchsorted(self._points, hashes, side="left")
+        return self._owners[pos % len(self._points)]
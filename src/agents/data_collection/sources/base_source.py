@@ -3,13 +3,71 @@ Base Data Source - Abstract class pentru orice sursă de date
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.common.models.market_data import Bar
+from typing import Dict, List, Optional
+from src.common.models.market_data import Bar, BarSeries
+from src.agents.data_collection.bus import BackpressurePolicy, BarBus, Subscription
+from src.agents.data_collection.ring_buffer import RingBufferStore
 
 
 class BaseDataSource(ABC):
     """Abstract class pentru orice sursă de date."""
     
+    # Nume sursă (folosit pentru pacing și câmpul Bar.source)
+    name: str = "UNKNOWN"
+    
+    # True dacă sursa descarcă nativ mai multe simboluri într-un request
+    supports_batch: bool = False
+    batch_size: int = 1
+    
+    # Bus pentru update-uri live (creat la prima utilizare sau partajat de agent)
+    _bus: Optional[BarBus] = None
+    _streams: Optional[set] = None
+    # Istoric live în memorie (ring buffer per simbol/timeframe), umplut de callback-ul live
+    _history: Optional[RingBufferStore] = None
+    
+    @property
+    def bus(self) -> BarBus:
+        """Bus-ul pe care sursa publică bars live."""
+        if self._bus is None:
+            self._bus = BarBus()
+        return self._bus
+    
+    @bus.setter
+    def bus(self, bus: BarBus) -> None:
+        self._bus = bus
+    
+    @property
+    def history(self) -> RingBufferStore:
+        """Ring buffer-ele cu bars live recente."""
+        if self._history is None:
+            self._history = RingBufferStore()
+        return self._history
+    
+    @history.setter
+    def history(self, history: RingBufferStore) -> None:
+        self._history = history
+    
+    def pacing_key(self, symbol: Optional[str] = None) -> str:
+        """Numele sub care se aplică pacing-ul pentru un request (default: numele sursei).
+        
+        Sursele cu mai multe conexiuni întorc conexiunea simbolului (ex: 'IBKR#1'),
+        fiecare cu limitele ei.
+        """
+        return self.name
+    
+    def get_history(self, symbol: str, timeframe: str, n: Optional[int] = None) -> BarSeries:
+        """Ultimele n bars live din memorie (view, fără copiere și fără disc).
+        
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe
+            n: Număr de bars (default: tot buffer-ul)
+        
+        Returns:
+            BarSeries (goală dacă simbolul nu e abonat)
+        """
+        return self.history.last(symbol, timeframe, n)
+    
     @abstractmethod
     async def connect(self) -> bool:
         """Conectează la sursă.
@@ -28,6 +86,26 @@ class BaseDataSource(ABC):
         """
         pass
     
+    async def prepare(self, symbols: List[str]) -> None:
+        """Pregătire înaintea unei colectări (ex: calificare contracte IBKR).
+        
+        Implementarea implicită nu face nimic.
+        
+        Args:
+            symbols: Simbolurile care urmează să fie descărcate
+        """
+        return None
+    
+    async def is_healthy(self) -> bool:
+        """Verifică dacă sursa e utilizabilă (conexiune activă).
+        
+        Sursele care nu țin evidența conexiunii sunt considerate sănătoase.
+        
+        Returns:
+            True dacă sursa poate servi request-uri
+        """
+        return getattr(self, "_connected", True)
+    
     @abstractmethod
     async def fetch_historical_data(
         self, 
@@ -49,20 +127,128 @@ class BaseDataSource(ABC):
         """
         pass
     
+    async def fetch_historical_series(
+        self, 
+        symbol: str, 
+        timeframe: str, 
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> BarSeries:
+        """Descarcă date istorice ca BarSeries (columnar).
+        
+        Implementarea implicită convertește rezultatul fetch_historical_data;
+        sursele care pot construi coloanele direct suprascriu metoda.
+        
+        Args:
+            symbol: Simbol stoc (ex: 'AAPL')
+            timeframe: Timeframe (ex: '1H', '1D', '5m')
+            lookback_days: Număr de zile înapoi
+            useRTH: Folosește ore regulate de trading (IBKR)
+        
+        Returns:
+            BarSeries (goală dacă nu există date)
+        """
+        bars = await self.fetch_historical_data(symbol, timeframe, lookback_days, useRTH)
+        return BarSeries.from_bars(bars, symbol=symbol, timeframe=timeframe)
+    
+    async def fetch_historical_batch(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> Dict[str, BarSeries]:
+        """Descarcă date istorice pentru mai multe simboluri.
+        
+        Implementarea implicită apelează fetch_historical_series pentru
+        fiecare simbol, secvențial; sursele cu supports_batch o suprascriu.
+        
+        Args:
+            symbols: Lista de simboluri
+            timeframe: Timeframe (ex: '1H', '1D', '5m')
+            lookback_days: Număr de zile înapoi
+            useRTH: Folosește ore regulate de trading (IBKR)
+        
+        Returns:
+            Dict simbol → BarSeries
+        """
+        results = {}
+        for symbol in symbols:
+            results[symbol] = await self.fetch_historical_series(symbol, timeframe, lookback_days, useRTH)
+        return results
+    
     @abstractmethod
     async def subscribe_to_bars(
         self, 
         symbol: str, 
         timeframe: str
-    ) -> None:
+    ) -> bool:
         """Subscribe la stream live de bars.
         
+        Sursa publică pe self.bus fiecare update (bar în formare și bar închis)
+        și îl adaugă în self.history.
+        Consumatorii folosesc subscribe(), nu această metodă.
+        
         Args:
             symbol: Simbol stoc
             timeframe: Timeframe
+        
+        Returns:
+            True dacă stream-ul a pornit
         """
         pass
     
+    async def subscribe(
+        self,
+        symbol: str,
+        timeframe: str,
+        maxsize: Optional[int] = None,
+        policy: Optional[BackpressurePolicy] = None,
+        closed_only: bool = False
+    ) -> Optional[Subscription]:
+        """Abonament la bars live: pornește stream-ul (o singură dată) și întoarce coada.
+        
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe
+            maxsize: Dimensiune coadă (default: a bus-ului)
+            policy: Politica de backpressure (default: a bus-ului)
+            closed_only: Doar bars închise
+        
+        Returns:
+            Subscription (iterator async de BarUpdate), sau None dacă
+            subscribe_to_bars() nu pornește stream-ul (ex: sursă fără live,
+            ca Yahoo); coada creată se închide, un apel ulterior reîncearcă
+        """
+        sub = self.bus.subscribe(symbol, timeframe, maxsize, policy, closed_only)
+        if self._streams is None:
+            self._streams = set()
+        if (symbol, timeframe) not in self._streams:
+            # Înregistrat înainte de await: abonații concurenți nu pornesc al doilea stream
+            self._streams.add((symbol, timeframe))
+            if not await self.subscribe_to_bars(symbol, timeframe):
+                self._streams.discard((symbol, timeframe))
+                sub.close()
+                return None
+        return sub
+    
+    async def resubscribe(self) -> int:
+        """Repornește stream-urile live înregistrate (ex: după o reconectare).
+        
+        Stream-urile care nu mai pornesc se scot din evidență (un subscribe()
+        ulterior le reîncearcă).
+        
+        Returns:
+            Numărul de stream-uri repornite
+        """
+        restarted = 0
+        for symbol, timeframe in sorted(self._streams or ()):
+            if await self.subscribe_to_bars(symbol, timeframe):
+                restarted += 1
+            else:
+                self._streams.discard((symbol, timeframe))
+        return restarted
+    
     @abstractmethod
     def get_latest_bar(self, symbol: str) -> Optional[Bar]:
         """Primește ultimul bar din cache/memorie.
@@ -0,0 +1,364 @@
+"""
+Cached Data Source - Cache pe disc (+ strat în memorie) pentru răspunsuri istorice, cu TTL și LRU
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import time
+
+from src.agents.data_collection.bus import BarBus
+from src.agents.data_collection.ring_buffer import RingBufferStore
+from src.agents.data_collection.sources.base_source import BaseDataSource
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import Bar, BarSeries
+
+
+# Cât rămâne valid un răspuns, per timeframe (secunde): cât durează până apare un bar nou
+DEFAULT_TTL_SECONDS = {
+    "1m": 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "1H": 30 * 60,
+    "4H": 60 * 60,
+    "1D": 4 * 60 * 60,
+}
+
+
+CacheKey = Tuple[str, str, str, int, bool]
+
+
+class CachedDataSource(BaseDataSource):
+    """Învelește orice BaseDataSource cu un cache de răspunsuri istorice.
+
+    Cheia e (sursă, simbol, timeframe, lookback_days, useRTH). Un hit nu face
+    niciun request: din memorie (LRU de `memory_entries` serii) în
+    microsecunde, de pe disc (.npz + index JSON) în milisecunde. Intrările
+    expiră după TTL-ul timeframe-ului; peste `max_bytes` pe disc se șterg
+    cele folosite cel mai demult. Răspunsurile goale nu se cache-uiesc.
+
+    Seriile returnate sunt partajate între apelanți și nu trebuie modificate
+    in-place. Restul API-ului (connect, live, fetch_window, ib...) se
+    deleagă sursei învelite.
+    """
+
+    def __init__(
+        self,
+        source: BaseDataSource,
+        cache_dir: str,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        max_bytes: int = 512 * 1024 * 1024,
+        memory_entries: int = 64
+    ):
+        """
+        Args:
+            source: Sursa reală
+            cache_dir: Directorul cache-ului (index.json + câte un .npz per intrare)
+            ttl_seconds: Suprascrieri pentru DEFAULT_TTL_SECONDS (timeframe → secunde)
+            max_bytes: Dimensiunea maximă pe disc
+            memory_entries: Serii ținute și în memorie (0 = fără strat în memorie)
+        """
+        self.source = source
+        self.name = source.name
+        self.supports_batch = source.supports_batch
+        self.batch_size = source.batch_size
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = {**DEFAULT_TTL_SECONDS, **(ttl_seconds or {})}
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.logger = get_logger(__name__)
+        self._memory: "OrderedDict[CacheKey, Tuple[float, BarSeries]]" = OrderedDict()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self._load_index()
+
+    @classmethod
+    def from_config(cls, source: BaseDataSource, cache_cfg: dict, data_dir: str = "data/processed") -> "CachedDataSource":
+        """Cache din blocul data_collector.cache (dir, max_mb, memory_entries, ttl_seconds)."""
+        return cls(
+            source,
+            cache_dir=cache_cfg.get("dir", f"{data_dir}/_cache"),
+            ttl_seconds=cache_cfg.get("ttl_seconds"),
+            max_bytes=int(cache_cfg.get("max_mb", 512) * 1024 * 1024),
+            memory_entries=cache_cfg.get("memory_entries", 64),
+        )
+
+    def __getattr__(self, item: str) -> Any:
+        # Apelat doar pentru atribute lipsă: ib, contracts, fetch_window, cancel_requests...
+        if item == "source":
+            raise AttributeError(item)
+        return getattr(self.source, item)
+
+    # --- Delegare (conexiune, live) ---
+
+    @property
+    def bus(self) -> BarBus:
+        return self.source.bus
+
+    @bus.setter
+    def bus(self, bus: BarBus) -> None:
+        self.source.bus = bus
+
+    @property
+    def history(self) -> RingBufferStore:
+        return self.source.history
+
+    @history.setter
+    def history(self, history: RingBufferStore) -> None:
+        self.source.history = history
+
+    def pacing_key(self, symbol: Optional[str] = None) -> str:
+        return self.source.pacing_key(symbol)
+
+    async def connect(self) -> bool:
+        return await self.source.connect()
+
+    async def disconnect(self) -> bool:
+        return await self.source.disconnect()
+
+    async def prepare(self, symbols: List[str]) -> None:
+        await self.source.prepare(symbols)
+
+    async def is_healthy(self) -> bool:
+        return await self.source.is_healthy()
+
+    async def subscribe_to_bars(self, symbol: str, timeframe: str) -> bool:
+        return await self.source.subscribe_to_bars(symbol, timeframe)
+
+    def get_latest_bar(self, symbol: str) -> Optional[Bar]:
+        return self.source.get_latest_bar(symbol)
+
+    # --- Istoric (cache-uit) ---
+
+    async def fetch_historical_data(
+        self,
+        symbol: str,
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> List[Bar]:
+        series = await self.fetch_historical_series(symbol, timeframe, lookback_days, useRTH)
+        return series.to_bars()
+
+    async def fetch_historical_series(
+        self,
+        symbol: str,
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> BarSeries:
+        key = self._key(symbol, timeframe, lookback_days, useRTH)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        series = await self.source.fetch_historical_series(symbol, timeframe, lookback_days, useRTH)
+        self.put(key, series)
+        return series
+
+    async def fetch_historical_batch(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> Dict[str, BarSeries]:
+        results: Dict[str, BarSeries] = {}
+        missing = []
+        for symbol in symbols:
+            cached = self.get(self._key(symbol, timeframe, lookback_days, useRTH))
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+        if missing:
+            # Doar simbolurile lipsă ajung la sursă, tot într-un singur batch
+            fetched = await self.source.fetch_historical_batch(missing, timeframe, lookback_days, useRTH)
+            for symbol, series in fetched.items():
+                self.put(self._key(symbol, timeframe, lookback_days, useRTH), series)
+            results.update(fetched)
+        return results
+
+    # --- Cache ---
+
+    @property
+    def hit_rate(self) -> float:
+        """Fracțiunea de cereri servite din cache (0.0 fără cereri)."""
+        total = self.hits_memory + self.hits_disk + self.misses
+        return (self.hits_memory + self.hits_disk) / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistici cache: hits (memorie/disc), misses, hit rate, intrări și bytes pe disc."""
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "entries": len(self._index),
+            "bytes": sum(entry["bytes"] for entry in self._index.values()),
+        }
+
+    def lookup(self, symbol: str, timeframe: str, lookback_days: int, useRTH: bool = True) -> Optional[BarSeries]:
+        """Seria din cache, fără request la sursă (None = miss, nenumărat în stats).
+
+        Folosit de agent înaintea slotului de pacing, ca hit-urile să nu aștepte.
+        """
+        return self.get(self._key(symbol, timeframe, lookback_days, useRTH), count_miss=False)
+
+    def get(self, key: CacheKey, count_miss: bool = True) -> Optional[BarSeries]:
+        """Seria din cache pentru cheie (None dacă lipsește sau a expirat)."""
+        now = time.time()
+        ttl = self._ttl(key)
+
+        hot = self._memory.get(key)
+        if hot is not None and now - hot[0] < ttl:
+            self._memory.move_to_end(key)
+            self.hits_memory += 1
+            return hot[1]
+
+        digest = self._digest(key)
+        entry = self._index.get(digest)
+        if entry is not None and now - entry["created"] < ttl:
+            try:
+                series = BarSeries.load_npz(str(self.cache_dir / entry["file"]))
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.warning(f"Dropping unreadable cache entry {entry['file']}: {e}")
+                self._remove(digest)
+                self._save_index()
+            else:
+                entry["accessed"] = now
+                self._remember(key, entry["created"], series)
+                self.hits_disk += 1
+                return series
+
+        if count_miss:
+            self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, series: BarSeries) -> None:
+        """Salvează seria (goală = nu se salvează) și aplică limita de dimensiune."""
+        if not len(series):
+            return
+        now = time.time()
+        digest = self._digest(key)
+        filename = f"{digest}.npz"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_dir / f".{filename}.tmp"
+            series.save_npz(str(tmp_path))
+            os.replace(tmp_path, self.cache_dir / filename)
+        except OSError as e:
+            self.logger.warning(f"Cannot write cache entry for {key}: {e}")
+            return
+        self._index[digest] = {
+            "key": list(key),
+            "file": filename,
+            "created": now,
+            "accessed": now,
+            "bytes": (self.cache_dir / filename).stat().st_size,
+        }
+        self._remember(key, now, series)
+        self._evict()
+        self._save_index()
+
+    def expire(self, timeframe: Optional[str] = None, created_before: Optional[float] = None) -> int:
+        """Invalidează intrările unui timeframe (None = toate) create înainte de un moment.
+
+        Folosit la închiderea unui bar: răspunsurile anterioare nu conțin încă
+        bar-ul nou, chiar dacă TTL-ul nu a expirat.
+
+        Args:
+            timeframe: Timeframe-ul intrărilor (None = toate)
+            created_before: Epoch secunde (None = acum)
+
+        Returns:
+            Numărul de intrări invalidate
+        """
+        created_before = time.time() if created_before is None else created_before
+        stale = [
+            digest for digest, entry in self._index.items()
+            if (timeframe is None or entry["key"][2] == timeframe) and entry["created"] < created_before
+        ]
+        for digest in stale:
+            self._remove(digest)
+        for key, (created, _) in list(self._memory.items()):
+            if (timeframe is None or key[2] == timeframe) and created < created_before:
+                del self._memory[key]
+        if stale:
+            self._save_index()
+        return len(stale)
+
+    def clear(self) -> None:
+        """Golește cache-ul (memorie și disc)."""
+        for digest in list(self._index):
+            self._remove(digest)
+        self._memory.clear()
+        self._save_index()
+
+    def _remember(self, key: CacheKey, created: float, series: BarSeries) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (created, series)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Șterge intrările expirate, apoi pe cele mai vechi accesate până sub max_bytes."""
+        now = time.time()
+        for digest, entry in list(self._index.items()):
+            if now - entry["created"] >= self._ttl(tuple(entry["key"])):
+                self._remove(digest)
+        total = sum(entry["bytes"] for entry in self._index.values())
+        for digest, entry in sorted(self._index.items(), key=lambda item: item[1]["accessed"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["bytes"]
+            self._remove(digest)
+
+    def _remove(self, digest: str) -> None:
+        entry = self._index.pop(digest, None)
+        if entry is None:
+            return
+        self._memory.pop(tuple(entry["key"]), None)
+        try:
+            (self.cache_dir / entry["file"]).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _load_index(self) -> None:
+        index_path = self.cache_dir / "index.json"
+        if not index_path.exists():
+            return
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f) or {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cannot read cache index {index_path}: {e}")
+            self._index = {}
+
+    def _save_index(self) -> None:
+        """Index scris atomic (tmp + rename); accesările se persistă la următoarea scriere."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            index_path = self.cache_dir / "index.json"
+            tmp_path = self.cache_dir / ".index.json.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            self.logger.warning(f"Cannot save cache index: {e}")
+
+    def _key(self, symbol: str, timeframe: str, lookback_days: int, useRTH: bool) -> CacheKey:
+        return (self.name, symbol, timeframe, int(lookback_days), bool(useRTH))
+
+    def _ttl(self, key) -> float:
+        return self.ttl_seconds.get(key[2], min(self.ttl_seconds.values()))
+
+    @staticmethod
+    def _digest(key) -> str:
+        return hashlib.sha1(json.dumps(list(key)).encode("utf-8")).hexdigest()[:20]
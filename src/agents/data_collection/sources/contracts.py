@@ -0,0 +1,201 @@
+"""
+Contract Resolver - Contracte IBKR calificate, cache-uite în memorie și pe disc
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import json
+import os
+
+from src.common.logging_utils.logger import get_logger
+
+
+# Câmpurile persistate; cu conId setat IB nu mai cere calificare
+_CONTRACT_FIELDS = ("conId", "symbol", "secType", "exchange", "primaryExchange", "currency",
+                    "localSymbol", "tradingClass")
+
+
+class ContractError(LookupError):
+    """Simbolul nu poate fi calificat (necunoscut sau ambiguu)."""
+
+
+class ContractResolver:
+    """Rezolvă simbol → contract calificat, o singură dată per simbol.
+
+    Simbolurile se califică în grupuri (qualifyContractsAsync) la prepare(),
+    rezultatul stă într-un dict în memorie și într-un cache JSON pe disc cu
+    TTL, deci rulările următoare pornesc fără niciun lookup. Simbolurile care
+    nu se califică sunt raportate la prepare() și refuzate imediat după.
+    """
+
+    def __init__(
+        self,
+        ib,
+        make_contract: Callable[[str], Any],
+        contract_cls: Callable[..., Any],
+        cache_file: Optional[str] = None,
+        ttl_days: float = 7,
+        batch_size: int = 50
+    ):
+        """
+        Args:
+            ib: Instanța IB (ib_insync.IB sau SimulatedIB)
+            make_contract: Contract necalificat pentru un simbol (ex: Stock(symbol, 'SMART', 'USD'))
+            contract_cls: Clasa Contract, pentru reconstrucția din cache
+            cache_file: Fișier JSON pentru cache (None = doar în memorie)
+            ttl_days: Vechimea maximă a unei intrări din cache
+            batch_size: Simboluri calificate per grup
+        """
+        self.ib = ib
+        self._make_contract = make_contract
+        self._contract_cls = contract_cls
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.ttl = timedelta(days=ttl_days)
+        self.batch_size = max(1, batch_size)
+        self.logger = get_logger(__name__)
+        self._contracts: Dict[str, Any] = {}
+        self._resolved_at: Dict[str, datetime] = {}
+        self._failed: Dict[str, str] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.lookups = 0           # simboluri trimise la IB pentru calificare
+        self.load()
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._contracts
+
+    def load(self) -> None:
+        """Încarcă intrările nevechi din cache-ul de pe disc."""
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f) or {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cannot read contract cache {self.cache_file}: {e}")
+            return
+        now = datetime.now(timezone.utc)
+        for symbol, entry in entries.items():
+            try:
+                resolved_at = datetime.fromisoformat(entry["resolved_at"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if now - resolved_at > self.ttl:
+                continue
+            fields = {name: entry[name] for name in _CONTRACT_FIELDS if entry.get(name) not in (None, "")}
+            self._contracts[symbol] = self._contract_cls(**fields)
+            self._resolved_at[symbol] = resolved_at
+
+    def save(self, merge: bool = True, drop: Iterable[str] = ()) -> bool:
+        """Scrie cache-ul pe disc (tmp + rename atomic).
+
+        Args:
+            merge: Păstrează intrările de pe disc scrise de alte conexiuni (același fișier)
+            drop: Simboluri scoase și din intrările de pe disc
+
+        Returns:
+            True dacă scrierea reușește (sau nu există cache pe disc)
+        """
+        if self.cache_file is None:
+            return True
+        entries = {}
+        if merge and self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    entries = json.load(f) or {}
+            except (OSError, ValueError):
+                entries = {}
+        for symbol in drop:
+            entries.pop(symbol, None)
+        for symbol, contract in self._contracts.items():
+            entry = {name: getattr(contract, name, None) for name in _CONTRACT_FIELDS}
+            entry["resolved_at"] = self._resolved_at[symbol].isoformat()
+            entries[symbol] = entry
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_name(self.cache_file.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_file)
+            return True
+        except OSError as e:
+            self.logger.error(f"Cannot save contract cache: {e}")
+            return False
+
+    async def prepare(self, symbols: Iterable[str]) -> Dict[str, Any]:
+        """Califică simbolurile care nu sunt încă în cache, în grupuri concurente.
+
+        Args:
+            symbols: Simboluri de pregătit
+
+        Returns:
+            Dict simbol → contract calificat (simbolurile eșuate lipsesc)
+        """
+        symbols = list(dict.fromkeys(symbols))
+        waiting = [self._pending[s] for s in symbols if s in self._pending]
+        missing = [s for s in symbols
+                   if s not in self._contracts and s not in self._failed and s not in self._pending]
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {s: loop.create_future() for s in missing}
+            self._pending.update(futures)
+            try:
+                chunks = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+                await asyncio.gather(*[self._qualify(chunk) for chunk in chunks])
+                self.save()
+            finally:
+                for symbol, future in futures.items():
+                    self._pending.pop(symbol, None)
+                    if not future.done():
+                        future.set_result(None)
+        if waiting:
+            await asyncio.gather(*waiting)
+        return {s: self._contracts[s] for s in symbols if s in self._contracts}
+
+    async def resolve(self, symbol: str) -> Any:
+        """Contractul calificat pentru un simbol (calificat acum dacă lipsește).
+
+        Raises:
+            ContractError: Simbolul nu poate fi calificat
+        """
+        contract = self._contracts.get(symbol)
+        if contract is not None:
+            return contract
+        await self.prepare([symbol])
+        contract = self._contracts.get(symbol)
+        if contract is None:
+            raise ContractError(self._failed.get(symbol, f"Cannot qualify contract for {symbol}"))
+        return contract
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Uită un simbol (sau tot cache-ul); următorul resolve() îl recalifică."""
+        if symbol is None:
+            self._contracts.clear()
+            self._resolved_at.clear()
+            self._failed.clear()
+            self.save(merge=False)
+        else:
+            self._contracts.pop(symbol, None)
+            self._resolved_at.pop(symbol, None)
+            self._failed.pop(symbol, None)
+            self.save(drop=[symbol])
+
+    async def _qualify(self, chunk: List[str]) -> None:
+        """Un grup de simboluri; qualifyContractsAsync completează contractele in-place."""
+        contracts = [self._make_contract(symbol) for symbol in chunk]
+        self.lookups += len(chunk)
+        try:
+            await self.ib.qualifyContractsAsync(*contracts)
+        except Exception as e:
+            self.logger.error(f"Contract qualification failed for {len(chunk)} symbols: {e}")
+            return          # nu marcăm ca eșuate: eroare de conexiune, se reîncearcă
+        now = datetime.now(timezone.utc)
+        for symbol, contract in zip(chunk, contracts):
+            if getattr(contract, "conId", 0):
+                self._contracts[symbol] = contract
+                self._resolved_at[symbol] = now
+            else:
+                self._failed[symbol] = f"Unknown or ambiguous contract: {symbol}"
+                self.logger.error(self._failed[symbol])
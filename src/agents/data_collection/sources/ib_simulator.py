@@ -0,0 +1,627 @@
+"""
+IB Simulator - Înlocuitor local pentru ib_insync.IB (fără TWS/Gateway)
+
+Acoperă suprafața folosită de IBKRDataSource: connect/connectAsync,
+disconnect, isConnected, qualifyContracts/qualifyContractsAsync,
+reqHistoricalData/reqHistoricalDataAsync (cu și fără keepUpToDate),
+updateEvent, cancelHistoricalData și errorEvent. Bars sunt sintetice și deterministe:
+același (seed, simbol, timestamp) dă mereu același bar, deci ferestre
+suprapuse coincid. Latența și regulile de pacing IBKR sunt configurabile.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import asyncio
+import math
+import random
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from src.agents.data_collection.scheduler import DEFAULT_PACING
+from src.common.logging_utils.logger import get_logger
+
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+_BAR_SECONDS = {
+    "1 min": 60,
+    "5 mins": 5 * 60,
+    "15 mins": 15 * 60,
+    "1 hour": 60 * 60,
+    "4 hours": 4 * 60 * 60,
+    "1 day": 24 * 60 * 60,
+}
+
+_DURATION_SECONDS = {"S": 1, "D": 86400, "W": 7 * 86400, "M": 30 * 86400, "Y": 365 * 86400}
+
+# Sesiunea (secunde de la miezul nopții ET): RTH 09:30-16:00, ETH 04:00-20:00
+_RTH = (9 * 3600 + 30 * 60, 16 * 3600)
+_ETH = (4 * 3600, 20 * 3600)
+
+PACING_VIOLATION = 162
+
+
+# --- Stand-ins pentru obiectele ib_insync ---
+
+@dataclass
+class Contract:
+    """Stand-in pentru ib_insync.Contract (doar câmpurile folosite)."""
+
+    secType: str = ""
+    symbol: str = ""
+    exchange: str = ""
+    currency: str = ""
+    primaryExchange: str = ""
+    conId: int = 0
+    localSymbol: str = ""
+    tradingClass: str = ""
+
+
+class Stock(Contract):
+    """Stand-in pentru ib_insync.Stock."""
+
+    def __init__(self, symbol: str = "", exchange: str = "", currency: str = "", **kwargs):
+        super().__init__(secType="STK", symbol=symbol, exchange=exchange, currency=currency, **kwargs)
+
+
+@dataclass
+class BarData:
+    """Stand-in pentru ib_insync.BarData."""
+
+    date: Any
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    average: float
+    barCount: int
+
+
+class Event:
+    """Eveniment minimal compatibil cu ib_insync/eventkit (+=, -=, emit)."""
+
+    def __init__(self):
+        self._handlers: List[Callable] = []
+
+    def __iadd__(self, handler: Callable) -> "Event":
+        self._handlers.append(handler)
+        return self
+
+    def __isub__(self, handler: Callable) -> "Event":
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def emit(self, *args) -> None:
+        for handler in list(self._handlers):
+            handler(*args)
+
+
+class BarDataList(list):
+    """Stand-in pentru ib_insync.BarDataList: lista de bars + updateEvent."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.reqId = 0
+        self.contract: Optional[Contract] = None
+        self.barSizeSetting = ""
+        self.keepUpToDate = False
+        self.updateEvent = Event()
+        self.lastEmit = 0.0            # perf_counter() la ultimul update (pentru măsurare latență)
+
+
+@dataclass
+class SimulatorStats:
+    """Contoare pentru benchmark-uri și teste."""
+
+    requests: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    pacing_violations: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    contracts_qualified: int = 0
+    updates: int = 0
+
+
+# --- Generator determinist ---
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+
+
+def _uniform(k: np.ndarray, key: int) -> np.ndarray:
+    """Hash splitmix64 al indicilor k → uniform [0, 1), determinist și vectorizat."""
+    with np.errstate(over="ignore"):
+        z = k.astype(np.uint64) + np.uint64((key * _GOLDEN) & _MASK)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+class SyntheticMarket:
+    """Prețuri sintetice: funcție deterministă de (seed, simbol, timestamp)."""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+
+    def _key(self, symbol: str, salt: int = 0) -> int:
+        return (zlib.crc32(symbol.encode()) << 16) ^ (self.seed * 1_000_003) ^ salt
+
+    def _log_price(self, symbol: str, t_sec: np.ndarray, bar_index: np.ndarray) -> np.ndarray:
+        key = self._key(symbol)
+        phase = (key % 1000) / 1000 * 2 * math.pi
+        days = t_sec / 86400.0
+        trend = (0.15 * np.sin(2 * math.pi * days / 97 + phase)
+                 + 0.05 * np.sin(2 * math.pi * days / 13 + 2 * phase)
+                 + 0.01 * np.sin(2 * math.pi * days / 1.3 + 3 * phase))
+        noise = _uniform(bar_index, key) * 2 - 1
+        return math.log(50 + key % 400) + trend + 0.002 * noise
+
+    def bars(self, symbol: str, timestamps_ns: np.ndarray, bar_seconds: int) -> Dict[str, np.ndarray]:
+        """Coloane OHLCV pentru bars care încep la timestamps_ns (UTC)."""
+        t_sec = timestamps_ns // 1_000_000_000
+        k = t_sec // bar_seconds
+        close = np.exp(self._log_price(symbol, t_sec, k))
+        open_ = np.exp(self._log_price(symbol, t_sec - bar_seconds, k - 1))    # = close-ul barului anterior
+        u_high = _uniform(k, self._key(symbol, 1))
+        u_low = _uniform(k, self._key(symbol, 2))
+        u_volume = _uniform(k, self._key(symbol, 3))
+        high = np.round(np.maximum(open_, close) * (1 + 0.002 * u_high), 2)
+        low = np.round(np.minimum(open_, close) * (1 - 0.002 * u_low), 2)
+        close = np.round(close, 2)
+        open_ = np.round(open_, 2)
+        volume = ((1000 + u_volume * 9000) * max(1.0, bar_seconds / 60)).astype(np.int64)
+        return {
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "average": np.round((high + low + close) / 3, 2),
+            "barCount": volume // 50 + 1,
+        }
+
+
+# --- IB simulat ---
+
+class SimulatedIB:
+    """Înlocuitor pentru ib_insync.IB, pentru teste, CI și benchmark-uri.
+
+    Metodele sincrone blochează thread-ul apelant pe durata latenței
+    simulate (ca API-ul sincron ib_insync); variantele *Async doar
+    așteaptă pe event loop. Update-urile live
+    (keepUpToDate) rulează ca task-uri pe event loop-ul capturat la
+    construcție sau la connect(), deci handler-ele updateEvent sunt apelate
+    din thread-ul loop-ului.
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        connect_latency: float = 0.0,
+        pacing: Optional[Dict[str, float]] = None,
+        error_rate: float = 0.0,
+        stream_interval: float = 1.0,
+        updates_per_bar: int = 4,
+        unknown_symbols: Iterable[str] = (),
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        """
+        Args:
+            seed: Seed pentru prețuri, latență și erori
+            latency: Latența medie a unui request (secunde)
+            jitter: Variație uniformă adăugată latenței (secunde)
+            connect_latency: Durata connect() (secunde)
+            pacing: Limite de pacing verificate (default: DEFAULT_PACING['IBKR']); {} = fără verificare
+            error_rate: Probabilitatea unei violări de pacing aleatoare per request
+            stream_interval: Secunde între update-uri live
+            updates_per_bar: Update-uri per bar înainte de închidere
+            unknown_symbols: Simboluri care nu se califică (necunoscute/ambigue)
+            loop: Event loop pentru stream-uri (default: loop-ul curent)
+        """
+        self.market = SyntheticMarket(seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.pacing = dict(DEFAULT_PACING["IBKR"]) if pacing is None else dict(pacing)
+        self.error_rate = error_rate
+        self.stream_interval = stream_interval
+        self.updates_per_bar = max(1, updates_per_bar)
+        self.unknown_symbols = set(unknown_symbols)
+        self.errorEvent = Event()
+        self.stats = SimulatorStats()
+        self.logger = get_logger(__name__)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._connected = False
+        self._next_req_id = 1
+        self._history: Deque[float] = deque()
+        self._last_identical: Dict[Tuple, float] = {}
+        self._per_contract: Dict[str, Deque[float]] = {}
+        self._streams: Dict[int, Tuple[BarDataList, asyncio.Task]] = {}
+        self._loop = loop
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+    @classmethod
+    def from_config(cls, options: Optional[dict] = None) -> "SimulatedIB":
+        """Construiește simulatorul din ibkr.simulator_options (latențe în ms)."""
+        options = dict(options or {})
+        return cls(
+            seed=options.get("seed", 42),
+            latency=options.get("latency_ms", 0) / 1000,
+            jitter=options.get("jitter_ms", 0) / 1000,
+            connect_latency=options.get("connect_latency_ms", 0) / 1000,
+            pacing=options.get("pacing"),
+            error_rate=options.get("error_rate", 0.0),
+            stream_interval=options.get("stream_interval", 1.0),
+            updates_per_bar=options.get("updates_per_bar", 4),
+            unknown_symbols=options.get("unknown_symbols", ()),
+        )
+
+    # --- Conexiune ---
+
+    def connect(self, host: str = "127.0.0.1", port: int = 7497, clientId: int = 1,
+                timeout: float = 4, readonly: bool = False, account: str = "") -> "SimulatedIB":
+        if self.connect_latency:
+            time.sleep(self.connect_latency)
+        self._capture_loop()
+        self._connected = True
+        return self
+
+    async def connectAsync(self, host: str = "127.0.0.1", port: int = 7497, clientId: int = 1,
+                           timeout: float = 4, readonly: bool = False, account: str = "") -> "SimulatedIB":
+        if self.connect_latency:
+            await asyncio.sleep(self.connect_latency)
+        self._capture_loop()
+        self._connected = True
+        return self
+
+    def disconnect(self) -> None:
+        for reqId in list(self._streams):
+            self._stop_stream(reqId)
+        self._connected = False
+
+    def isConnected(self) -> bool:
+        return self._connected
+
+    # --- Contracte ---
+
+    def qualifyContracts(self, *contracts: Contract) -> List[Contract]:
+        """Completează contractele in-place (conId etc.); întoarce doar cele calificate."""
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._qualify(contracts)
+
+    async def qualifyContractsAsync(self, *contracts: Contract) -> List[Contract]:
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._qualify(contracts)
+
+    def _qualify(self, contracts) -> List[Contract]:
+        qualified = []
+        for contract in contracts:
+            if contract.symbol in self.unknown_symbols:
+                self.errorEvent.emit(0, 200, "No security definition has been found for the request", contract)
+                continue
+            contract.conId = zlib.crc32(contract.symbol.encode()) & 0x7FFFFFFF or 1
+            contract.primaryExchange = "NASDAQ"
+            contract.localSymbol = contract.symbol
+            contract.tradingClass = "NMS"
+            qualified.append(contract)
+        with self._lock:
+            self.stats.contracts_qualified += len(contracts)
+        return qualified
+
+    # --- Date istorice ---
+
+    def reqHistoricalData(
+        self,
+        contract: Contract,
+        endDateTime: Any = "",
+        durationStr: str = "1 D",
+        barSizeSetting: str = "1 hour",
+        whatToShow: str = "TRADES",
+        useRTH: bool = True,
+        formatDate: int = 1,
+        keepUpToDate: bool = False,
+        chartOptions: Optional[list] = None,
+        timeout: float = 60
+    ) -> BarDataList:
+        """Bars sintetice pentru [end - durationStr, end); [] la violare de pacing."""
+        if not self._connected:
+            raise ConnectionError("Not connected")
+        reqId, violation = self._begin_request(contract, endDateTime, durationStr, barSizeSetting, useRTH)
+        try:
+            delay = self._delay()
+            if delay:
+                time.sleep(delay)
+            return self._complete_request(reqId, violation, contract, endDateTime, durationStr,
+                                          barSizeSetting, useRTH, keepUpToDate)
+        finally:
+            self._end_request()
+
+    async def reqHistoricalDataAsync(
+        self,
+        contract: Contract,
+        endDateTime: Any = "",
+        durationStr: str = "1 D",
+        barSizeSetting: str = "1 hour",
+        whatToShow: str = "TRADES",
+        useRTH: bool = True,
+        formatDate: int = 1,
+        keepUpToDate: bool = False,
+        chartOptions: Optional[list] = None,
+        timeout: float = 60
+    ) -> BarDataList:
+        """Varianta async: latența nu ocupă un thread; timeout > 0 → [] ca ib_insync."""
+        if not self._connected:
+            raise ConnectionError("Not connected")
+        reqId, violation = self._begin_request(contract, endDateTime, durationStr, barSizeSetting, useRTH)
+        try:
+            delay = self._delay()
+            if timeout and delay > timeout:
+                await asyncio.sleep(timeout)
+                with self._lock:
+                    self.stats.timeouts += 1
+                self.logger.warning(f"reqHistoricalData: Timeout for {contract.symbol}")
+                bars = BarDataList()
+                bars.reqId = reqId
+                bars.contract = contract
+                return bars
+            if delay:
+                await asyncio.sleep(delay)
+            return self._complete_request(reqId, violation, contract, endDateTime, durationStr,
+                                          barSizeSetting, useRTH, keepUpToDate)
+        finally:
+            self._end_request()
+
+    def cancelHistoricalData(self, bars: BarDataList) -> None:
+        """Oprește update-urile live pentru o listă keepUpToDate."""
+        bars.keepUpToDate = False
+        self._stop_stream(bars.reqId)
+
+    # --- Intern: request-uri ---
+
+    def _begin_request(self, contract, endDateTime, durationStr, barSizeSetting, useRTH) -> Tuple[int, Optional[str]]:
+        """Înregistrează request-ul; întoarce (reqId, motivul violării de pacing sau None)."""
+        now = time.monotonic()
+        with self._lock:
+            reqId = self._next_req_id
+            self._next_req_id += 1
+            self.stats.requests += 1
+            self.stats.in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+            violation = self._check_pacing(now, contract, endDateTime, durationStr, barSizeSetting, useRTH)
+            if violation is None and self.error_rate and self._random.random() < self.error_rate:
+                violation = "simulated pacing violation"
+        return reqId, violation
+
+    def _end_request(self) -> None:
+        with self._lock:
+            self.stats.in_flight -= 1
+
+    def _check_pacing(self, now, contract, endDateTime, durationStr, barSizeSetting, useRTH) -> Optional[str]:
+        """Regulile de pacing IBKR pentru date istorice (apelat sub lock)."""
+        if not self.pacing:
+            return None
+        period = self.pacing.get("period_seconds", 600)
+        while self._history and now - self._history[0] >= period:
+            self._history.popleft()
+        if len(self._history) >= self.pacing.get("max_requests", 60):
+            return f"more than {self.pacing.get('max_requests', 60)} requests in {period}s"
+        self._history.append(now)
+
+        key = (contract.symbol, str(endDateTime), durationStr, barSizeSetting, useRTH)
+        last = self._last_identical.get(key)
+        self._last_identical[key] = now
+        if last is not None and now - last < self.pacing.get("identical_interval_seconds", 15):
+            return "identical request within interval"
+
+        same = self._per_contract.setdefault(contract.symbol, deque())
+        same_period = self.pacing.get("same_contract_period_seconds", 2)
+        while same and now - same[0] >= same_period:
+            same.popleft()
+        same.append(now)
+        if len(same) > self.pacing.get("same_contract_requests", 5):
+            return f"too many requests for {contract.symbol} within {same_period}s"
+        return None
+
+    def _delay(self) -> float:
+        if not self.latency and not self.jitter:
+            return 0.0
+        with self._lock:
+            return max(0.0, self.latency + self._random.uniform(0, self.jitter))
+
+    def _complete_request(self, reqId, violation, contract, endDateTime, durationStr,
+                          barSizeSetting, useRTH, keepUpToDate) -> BarDataList:
+        bars = BarDataList()
+        bars.reqId = reqId
+        bars.contract = contract
+        bars.barSizeSetting = barSizeSetting
+        if violation is not None:
+            with self._lock:
+                self.stats.pacing_violations += 1
+                self.stats.errors += 1
+            self.logger.debug(f"Simulated pacing violation for {contract.symbol}: {violation}")
+            self.errorEvent.emit(reqId, PACING_VIOLATION,
+                                 f"Historical Market Data Service error message:{violation}", contract)
+            return bars
+
+        bar_seconds = self._bar_seconds(barSizeSetting)
+        end_ns = self._parse_end(endDateTime)
+        start_ns = end_ns - self._duration_seconds(durationStr) * 1_000_000_000
+        bars.extend(self._make_bars(contract.symbol, start_ns, end_ns, bar_seconds, useRTH))
+        if keepUpToDate:
+            bars.keepUpToDate = True
+            self._start_stream(bars, bar_seconds)
+        return bars
+
+    def _make_bars(self, symbol: str, start_ns: int, end_ns: int, bar_seconds: int, useRTH: bool) -> List[BarData]:
+        timestamps = self._timestamps(start_ns, end_ns, bar_seconds, useRTH)
+        return self._bar_objects(symbol, timestamps, bar_seconds)
+
+    def _bar_objects(self, symbol: str, timestamps: np.ndarray, bar_seconds: int) -> List[BarData]:
+        if not len(timestamps):
+            return []
+        columns = self.market.bars(symbol, timestamps, bar_seconds)
+        index = pd.DatetimeIndex(timestamps.view("M8[ns]")).tz_localize("UTC").tz_convert(NEW_YORK)
+        if bar_seconds >= 86400:
+            dates = [ts.date() for ts in index]
+        else:
+            dates = index.to_pydatetime().tolist()
+        return [
+            BarData(d, o, h, l, c, v, a, n)
+            for d, o, h, l, c, v, a, n in zip(
+                dates, columns["open"].tolist(), columns["high"].tolist(), columns["low"].tolist(),
+                columns["close"].tolist(), columns["volume"].tolist(), columns["average"].tolist(),
+                columns["barCount"].tolist()
+            )
+        ]
+
+    @staticmethod
+    def _timestamps(start_ns: int, end_ns: int, bar_seconds: int, useRTH: bool) -> np.ndarray:
+        """Începutul bars din [start, end), în zilele lucrătoare și sesiunea cerută."""
+        first = pd.Timestamp(start_ns, tz="UTC").tz_convert(NEW_YORK).normalize().tz_localize(None)
+        last = pd.Timestamp(end_ns, tz="UTC").tz_convert(NEW_YORK).normalize().tz_localize(None)
+        days = pd.bdate_range(first, last).tz_localize(NEW_YORK).as_unit("ns").asi8
+        if bar_seconds >= 86400:
+            # Bar zilnic: începe la deschiderea sesiunii
+            stamps = days + _RTH[0] * 1_000_000_000
+        else:
+            session_open, session_close = _RTH if useRTH else _ETH
+            offsets = np.arange(session_open, session_close, bar_seconds, dtype=np.int64) * 1_000_000_000
+            stamps = (days[:, None] + offsets[None, :]).ravel()
+        return stamps[(stamps >= start_ns) & (stamps < end_ns)]
+
+    @staticmethod
+    def _bar_seconds(bar_size: str) -> int:
+        try:
+            return _BAR_SECONDS[bar_size]
+        except KeyError:
+            raise ValueError(f"Unsupported barSizeSetting: {bar_size}")
+
+    @staticmethod
+    def _duration_seconds(duration: str) -> int:
+        amount, unit = duration.split()
+        return int(amount) * _DURATION_SECONDS[unit.upper()]
+
+    @staticmethod
+    def _parse_end(endDateTime: Any) -> int:
+        """endDateTime ib_insync ('' = acum, datetime, date sau 'YYYYMMDD HH:MM:SS [tz]') → ns UTC."""
+        if endDateTime in ("", None):
+            return time.time_ns()
+        if isinstance(endDateTime, (datetime, date)):
+            ts = pd.Timestamp(endDateTime)
+        else:
+            text = str(endDateTime).replace("-", " ")
+            parts = text.split()
+            ts = pd.Timestamp(datetime.strptime(" ".join(parts[:2]), "%Y%m%d %H:%M:%S"))
+            if len(parts) > 2:
+                ts = ts.tz_localize(parts[2])
+        if ts.tzinfo is None:
+            ts = ts.tz_localize("UTC")
+        return ts.value
+
+    # --- Intern: stream-uri live ---
+
+    def _capture_loop(self) -> None:
+        if self._loop is None or self._loop.is_closed():
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+    def _start_stream(self, bars: BarDataList, bar_seconds: int) -> None:
+        loop = self._loop
+        if loop is None:
+            self.logger.warning("No event loop for simulated live updates")
+            return
+
+        def start() -> None:
+            task = loop.create_task(self._stream(bars, bar_seconds))
+            self._streams[bars.reqId] = (bars, task)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            start()
+        else:
+            loop.call_soon_threadsafe(start)
+
+    def _stop_stream(self, reqId: int) -> None:
+        entry = self._streams.pop(reqId, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    async def _stream(self, bars: BarDataList, bar_seconds: int) -> None:
+        """Update-uri periodice: bar-ul curent se formează în updates_per_bar pași, apoi se închide."""
+        symbol = bars.contract.symbol
+        bar_ns = bar_seconds * 1_000_000_000
+        if bars:
+            current_ns = self._bar_start_ns(bars[-1].date)
+        else:
+            current_ns = (time.time_ns() // bar_ns) * bar_ns
+        step = self.updates_per_bar          # bar-ul inițial e considerat complet
+        try:
+            while bars.keepUpToDate and self._connected:
+                await asyncio.sleep(self.stream_interval)
+                has_new_bar = step >= self.updates_per_bar
+                if has_new_bar:
+                    current_ns += bar_ns
+                    step = 0
+                step += 1
+                final = self._bar_objects(symbol, np.array([current_ns], np.int64), bar_seconds)[0]
+                partial = self._partial(final, step / self.updates_per_bar)
+                if has_new_bar:
+                    bars.append(partial)
+                else:
+                    bars[-1] = partial
+                self.stats.updates += 1
+                bars.lastEmit = time.perf_counter()
+                bars.updateEvent.emit(bars, has_new_bar)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._streams.pop(bars.reqId, None)
+
+    @staticmethod
+    def _bar_start_ns(bar_date: Any) -> int:
+        """Începutul unui bar (datetime intraday sau date zilnic) → ns UTC."""
+        if isinstance(bar_date, datetime):
+            return pd.Timestamp(bar_date).value
+        return pd.Timestamp(bar_date).tz_localize(NEW_YORK).value + _RTH[0] * 1_000_000_000
+    
+    @staticmethod
+    def _partial(bar: BarData, progress: float) -> BarData:
+        """Bar-ul în formare după fracțiunea `progress` (1.0 = bar-ul final)."""
+        if progress >= 1.0:
+            return bar
+        close = round(bar.open + (bar.close - bar.open) * progress, 2)
+        high = max(bar.open, close)
+        low = min(bar.open, close)
+        volume = int(bar.volume * progress)
+        return BarData(bar.date, bar.open, high, low, close, volume,
+                       round((high + low + close) / 3, 2), max(1, int(bar.barCount * progress)))
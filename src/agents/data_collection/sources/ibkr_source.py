@@ -2,19 +2,36 @@
 IBKR Data Source - Implementare pentru Interactive Brokers
 """
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set, Tuple
 from datetime import datetime, timedelta
 import asyncio
 
 from src.agents.data_collection.sources.base_source import BaseDataSource
-from src.common.models.market_data import Bar
+from src.agents.data_collection.sources.contracts import ContractResolver
+from src.common.models.market_data import Bar, BarSeries
 from src.common.logging_utils.logger import get_logger
 
 
+class RequestCancelled(Exception):
+    """Request IBKR anulat explicit (cancel_requests / disconnect)."""
+
+
 class IBKRDataSource(BaseDataSource):
     """Data source pentru Interactive Brokers."""
     
-    def __init__(self, host: str, port: int, clientId: int):
+    name = "IBKR"
+    
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        clientId: int,
+        ib=None,
+        request_timeout: float = 60.0,
+        connect_timeout: float = 10.0,
+        contract_cache: Optional[str] = None,
+        contract_cache_ttl_days: float = 7
+    ):
         """
         Inițializează IBKR data source.
         
@@ -22,34 +39,54 @@ class IBKRDataSource(BaseDataSource):
             host: Adresa IBKR Gateway/TWS
             port: Port (7497 paper, 7496 live)
             clientId: Client ID unic
+            ib: Instanță IB injectată (ex: SimulatedIB); None = ib_insync.IB()
+            request_timeout: Timeout per request istoric (secunde)
+            connect_timeout: Timeout pentru handshake-ul de conectare (secunde)
+            contract_cache: Fișier JSON pentru contractele calificate (None = doar în memorie)
+            contract_cache_ttl_days: Vechimea maximă a unui contract din cache
         """
         # Lazy import pentru a evita event loop issues în Streamlit
         try:
             from ib_insync import IB, Stock, Contract
-            self.IB = IB
-            self.Stock = Stock
-            self.Contract = Contract
         except ImportError as e:
-            raise ImportError(f"ib_insync nu este instalat: {e}")
+            if ib is None:
+                raise ImportError(f"ib_insync nu este instalat: {e}")
+            # Cu IB injectat (simulator) contractele folosesc stand-in-urile locale
+            from src.agents.data_collection.sources.ib_simulator import Stock, Contract
+            IB = type(ib)
+        self.IB = IB
+        self.Stock = Stock
+        self.Contract = Contract
         
-        self.ib = self.IB()
+        self.ib = ib if ib is not None else self.IB()
         self.host = host
         self.port = port
         self.clientId = clientId
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
         self.bars_cache: Dict[str, Bar] = {}
         self.logger = get_logger(__name__)
         self._connected = False
+        # Request-uri în curs (anulate la disconnect) și stream-uri live active
+        self._inflight: Set[asyncio.Task] = set()
+        self._cancelled: Set[asyncio.Task] = set()
+        self._live: Dict[Tuple[str, str], object] = {}
+        # Contracte calificate o singură dată per simbol (memorie + cache pe disc)
+        self.contracts = ContractResolver(
+            self.ib,
+            make_contract=lambda symbol: self.Stock(symbol, 'SMART', 'USD'),
+            contract_cls=self.Contract,
+            cache_file=contract_cache,
+            ttl_days=contract_cache_ttl_days
+        )
     
     async def connect(self) -> bool:
-        """Conectează la IBKR cu retry logic."""
+        """Conectează la IBKR cu retry logic (connectAsync, pe event loop-ul curent)."""
         retries = 3
         for attempt in range(retries):
             try:
-                # ib_insync folosește sync API, dar putem rula în executor
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    None,
-                    lambda: self.ib.connect(self.host, self.port, clientId=self.clientId)
+                await self.ib.connectAsync(
+                    self.host, self.port, clientId=self.clientId, timeout=self.connect_timeout
                 )
                 self._connected = True
                 self.logger.info(f"IBKR connected: {self.host}:{self.port}")
@@ -62,17 +99,63 @@ class IBKRDataSource(BaseDataSource):
         return False
     
     async def disconnect(self) -> bool:
-        """Deconectează IBKR."""
+        """Deconectează IBKR (anulează request-urile în curs și stream-urile live).
+        
+        Un stream care nu se poate anula nu oprește deconectarea: conexiunea
+        se închide și starea (_connected, _live) se resetează oricum.
+        """
+        connected = self._connected
+        disconnected = True
         try:
-            if self._connected:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, self.ib.disconnect)
-                self._connected = False
-                self.logger.info("IBKR disconnected")
-            return True
+            self.cancel_requests()
+            if connected:
+                for (symbol, timeframe), bars in self._live.items():
+                    try:
+                        self.ib.cancelHistoricalData(bars)
+                    except Exception as e:
+                        self.logger.warning(f"Cannot cancel live stream {symbol} {timeframe}: {e}")
         except Exception as e:
             self.logger.error(f"Disconnect error: {e}")
-            return False
+            disconnected = False
+        finally:
+            self._live.clear()
+            self._connected = False
+            if connected:
+                try:
+                    self.ib.disconnect()
+                    self.logger.info("IBKR disconnected")
+                except Exception as e:
+                    self.logger.error(f"Disconnect error: {e}")
+                    disconnected = False
+        return disconnected
+    
+    def cancel_requests(self) -> int:
+        """Anulează toate request-urile istorice în curs.
+        
+        Apelanții lor primesc RequestCancelled (fetch_historical_data întoarce []).
+        
+        Returns:
+            Numărul de request-uri anulate
+        """
+        pending = [task for task in self._inflight if not task.done()]
+        for task in pending:
+            self._cancelled.add(task)
+            task.cancel()
+        return len(pending)
+    
+    async def prepare(self, symbols: List[str]) -> None:
+        """Califică în avans contractele simbolurilor (doar cele lipsă din cache)."""
+        if not self._connected:
+            return
+        resolved = await self.contracts.prepare(symbols)
+        self.logger.info(
+            f"Contracts ready: {len(resolved)}/{len(set(symbols))} "
+            f"({self.contracts.lookups} lookups this session)"
+        )
+    
+    async def is_healthy(self) -> bool:
+        """Conexiunea e activă atât local cât și în ib_insync."""
+        return self._connected and self.ib.isConnected()
     
     async def fetch_historical_data(
         self, 
@@ -98,82 +181,168 @@ class IBKRDataSource(BaseDataSource):
             return []
         
         try:
-            # Creează contract (folosește lazy import)
-            contract = self.Stock(symbol, 'SMART', 'USD')
-            
-            # Parametri
-            duration_str = f"{lookback_days} D"
-            bar_size = self._convert_timeframe(timeframe)
-            
-            # Request (sync în executor)
             self.logger.info(f"Fetching {symbol} {timeframe} for {lookback_days} days...")
-            loop = asyncio.get_event_loop()
-            bars_raw = await loop.run_in_executor(
-                None,
-                lambda: self.ib.reqHistoricalData(
-                    contract,
-                    endDateTime='',          # Until now
-                    durationStr=duration_str,
-                    barSizeSetting=bar_size,
-                    whatToShow='TRADES',     # Real trades
-                    useRTH=useRTH,
-                    keepUpToDate=False       # Historic only
-                )
+            bars_normalized = await self._request_bars(
+                symbol, timeframe, '', f"{lookback_days} D", useRTH      # endDateTime '' = până acum
             )
-            
-            # Convert și normalizare
-            bars_normalized = []
-            for bar in bars_raw:
-                normalized = self._normalize_bar(bar, symbol, timeframe, 'IBKR')
-                bars_normalized.append(normalized)
-            
             self.logger.info(f"Fetched {len(bars_normalized)} bars for {symbol}")
             return bars_normalized
             
+        except RequestCancelled:
+            self.logger.warning(f"Fetch cancelled for {symbol}")
+            return []
+        except asyncio.TimeoutError:
+            self.logger.error(f"Fetch timeout for {symbol} after {self.request_timeout:.0f}s")
+            return []
         except Exception as e:
             self.logger.error(f"Fetch error for {symbol}: {e}")
             return []
     
+    async def fetch_window(
+        self,
+        symbol: str,
+        timeframe: str,
+        end: datetime,
+        duration_str: str,
+        useRTH: bool = True
+    ) -> BarSeries:
+        """
+        Descarcă o singură fereastră istorică (folosit de backfill).
+        
+        Spre deosebire de fetch_historical_data, erorile se propagă, ca
+        fereastra să rămână neterminată în checkpoint.
+        
+        Args:
+            symbol: Simbol stoc
+            timeframe: Timeframe
+            end: Sfârșitul ferestrei (aware)
+            duration_str: Durata IBKR (ex: '1 D', '30 D', '1 Y')
+            useRTH: Ore regulate de trading
+        
+        Returns:
+            BarSeries cu bars din fereastră
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected to IBKR")
+        bars = await self._request_bars(symbol, timeframe, end, duration_str, useRTH)
+        return BarSeries.from_bars(bars, symbol=symbol, timeframe=timeframe, source=self.name)
+    
+    async def _request_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        end,
+        duration_str: str,
+        useRTH: bool
+    ) -> List[Bar]:
+        """Un reqHistoricalDataAsync (cu timeout, anulabil) → Bar-uri normalizate."""
+        contract = await self._contract(symbol)
+        bar_size = self._convert_timeframe(timeframe)
+        
+        bars_raw = await self._run(self.ib.reqHistoricalDataAsync(
+            contract,
+            endDateTime=end,
+            durationStr=duration_str,
+            barSizeSetting=bar_size,
+            whatToShow='TRADES',     # Real trades
+            useRTH=useRTH,
+            keepUpToDate=False,      # Historic only
+            timeout=0                # timeout-ul e aplicat de _run (ridică eroare, nu [])
+        ))
+        
+        # Convert și normalizare
+        return [self._normalize_bar(bar, symbol, timeframe, 'IBKR') for bar in bars_raw]
+    
+    async def _contract(self, symbol: str):
+        """Contractul calificat (din cache; altfel calificare ca request anulabil)."""
+        if symbol in self.contracts:
+            return await self.contracts.resolve(symbol)
+        return await self._run(self.contracts.resolve(symbol))
+    
+    async def _run(self, coro):
+        """Rulează un request ca task urmărit, cu timeout.
+        
+        Timeout-ul ib_insync ar întoarce o listă goală, indistinctă de „fără
+        date” (backfill-ul ar marca fereastra ca terminată), așa că timeout-ul
+        se aplică aici și ridică excepție.
+        
+        Raises:
+            asyncio.TimeoutError: Request-ul nu s-a terminat în timp
+            RequestCancelled: Request-ul a fost anulat de cancel_requests()
+        """
+        task = asyncio.ensure_future(coro)
+        self._inflight.add(task)
+        try:
+            return await asyncio.wait_for(task, self.request_timeout)
+        except asyncio.CancelledError:
+            if task in self._cancelled:
+                raise RequestCancelled("IBKR request cancelled")
+            raise
+        finally:
+            self._inflight.discard(task)
+            self._cancelled.discard(task)
+    
     async def subscribe_to_bars(
         self, 
         symbol: str, 
         timeframe: str
-    ) -> None:
-        """Subscribe la stream live."""
+    ) -> bool:
+        """Subscribe la stream live (True dacă stream-ul a pornit)."""
         if not self._connected:
             self.logger.error("Not connected to IBKR")
-            return
+            return False
         
         try:
-            contract = self.Stock(symbol, 'SMART', 'USD')
+            contract = await self._contract(symbol)
             bar_size = self._convert_timeframe(timeframe)
             
-            # Request cu keepUpToDate=True
-            loop = asyncio.get_event_loop()
-            bars = await loop.run_in_executor(
-                None,
-                lambda: self.ib.reqHistoricalData(
-                    contract,
-                    endDateTime='',
-                    durationStr='1 D',       # Doar astăzi + live
-                    barSizeSetting=bar_size,
-                    whatToShow='TRADES',
-                    useRTH=True,
-                    keepUpToDate=True        # LIVE STREAM
-                )
-            )
+            # Request cu keepUpToDate=True (lista rămâne actualizată de ib_insync)
+            bars = await self._run(self.ib.reqHistoricalDataAsync(
+                contract,
+                endDateTime='',
+                durationStr='1 D',       # Doar astăzi + live
+                barSizeSetting=bar_size,
+                whatToShow='TRADES',
+                useRTH=True,
+                keepUpToDate=True,       # LIVE STREAM
+                timeout=0
+            ))
+            self._live[(symbol, timeframe)] = bars
             
-            # Setup callback
-            bars.updateEvent += lambda bar: self._on_bar_update(bar, symbol, timeframe)
+            # Istoricul inițial umple ring buffer-ul; bars[-1] e încă în formare
+            for bar in bars:
+                self.history.append(self._normalize_bar(bar, symbol, timeframe, 'IBKR'))
+            
+            # Setup callback (ib_insync emite (bars, hasNewBar) la fiecare update)
+            bars.updateEvent += lambda bars, hasNewBar: self._on_bar_update(bars, hasNewBar, symbol, timeframe)
             
             self.logger.info(f"Subscribed to {symbol} {timeframe} live bars")
+            return True
         except Exception as e:
             self.logger.error(f"Subscribe error: {e}")
+            return False
+    
+    def unsubscribe_from_bars(self, symbol: str, timeframe: str) -> None:
+        """Oprește stream-ul live al unui simbol (ex: mutat pe altă conexiune)."""
+        bars = self._live.pop((symbol, timeframe), None)
+        if bars is not None and self._connected:
+            self.ib.cancelHistoricalData(bars)
     
-    def _on_bar_update(self, bar, symbol: str, timeframe: str):
-        """Callback la update bar."""
-        normalized = self._normalize_bar(bar, symbol, timeframe, 'IBKR')
+    def _on_bar_update(self, bars, hasNewBar: bool, symbol: str, timeframe: str):
+        """Callback la update bar: actualizează cache-ul, ring buffer-ul și publică pe bus.
+        
+        hasNewBar=True: bars[-2] tocmai s-a închis, bars[-1] e noul bar în formare.
+        """
+        if not bars:
+            return
+        if hasNewBar and len(bars) >= 2:
+            closed = self._normalize_bar(bars[-2], symbol, timeframe, 'IBKR')
+            self.history.append(closed)
+            self.bus.publish_nowait(closed, closed=True)
+        normalized = self._normalize_bar(bars[-1], symbol, timeframe, 'IBKR')
         self.bars_cache[symbol] = normalized
+        self.history.append(normalized)      # același timestamp → înlocuiește bar-ul în formare
+        self.bus.publish_nowait(normalized, closed=False)
         self.logger.debug(f"Bar update: {symbol} {normalized.close}")
     
     def get_latest_bar(self, symbol: str) -> Optional[Bar]:
@@ -193,9 +362,15 @@ class IBKRDataSource(BaseDataSource):
         return mapping.get(tf, '1 hour')
     
     def _normalize_bar(self, raw_bar, symbol: str, timeframe: str, source: str) -> Bar:
-        """Normalizare raw bar → Bar standardizat."""
+        """Normalizare raw bar → Bar standardizat.
+        
+        Acceptă BarData (date, barCount) din reqHistoricalData și
+        RealTimeBar (time) din reqRealTimeBars.
+        """
+        timestamp = raw_bar.date if hasattr(raw_bar, 'date') else raw_bar.time
+        count = getattr(raw_bar, 'barCount', getattr(raw_bar, 'count', None))
         return Bar(
-            timestamp=raw_bar.time,
+            timestamp=timestamp,
             open=round(raw_bar.open, 2),
             high=round(raw_bar.high, 2),
             low=round(raw_bar.low, 2),
@@ -203,7 +378,7 @@ class IBKRDataSource(BaseDataSource):
             volume=int(raw_bar.volume),
             symbol=symbol,
             timeframe=timeframe,
-            count=int(raw_bar.count) if hasattr(raw_bar, 'count') else None,
+            count=int(count) if count is not None else None,
             wap=round(raw_bar.average, 2) if hasattr(raw_bar, 'average') else None,
             hasGaps=bool(raw_bar.hasGaps) if hasattr(raw_bar, 'hasGaps') else None,
             source=source,
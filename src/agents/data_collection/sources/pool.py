@@ -0,0 +1,110 @@
+"""
+Source Pool - Surse de date conectate lazy și refolosite pe durata agentului
+"""
+
+from typing import Callable, Dict, Iterator, Optional
+import asyncio
+import time
+
+from src.agents.data_collection.sources.base_source import BaseDataSource
+from src.common.logging_utils.logger import get_logger
+
+
+class SourcePool:
+    """Pool de surse de date, identificate după nume ('IBKR', 'YAHOO', ...).
+
+    Fiecare sursă se creează și se conectează la prima cerere, apoi e
+    refolosită pentru toate simbolurile și toate rulările. O sursă care nu
+    mai e sănătoasă se reconectează la următorul get() (cu stream-urile ei
+    live); după o conectare eșuată, încercările se reiau abia după
+    `retry_after` secunde.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Optional[BaseDataSource]],
+        retry_after: float = 60.0
+    ):
+        """
+        Args:
+            factory: Creează o sursă (neconectată) după nume; None = necunoscută
+            retry_after: Secunde de așteptare după o conectare eșuată
+        """
+        self._factory = factory
+        self.retry_after = retry_after
+        self._sources: Dict[str, BaseDataSource] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._failed_at: Dict[str, float] = {}
+        self.logger = get_logger(__name__)
+
+    def __contains__(self, source: BaseDataSource) -> bool:
+        return any(source is s for s in self._sources.values())
+
+    def __iter__(self) -> Iterator[BaseDataSource]:
+        """Sursele create până acum (conectate sau nu)."""
+        return iter(list(self._sources.values()))
+
+    async def get(self, name: str) -> Optional[BaseDataSource]:
+        """Sursa conectată cu numele dat (creată/reconectată la nevoie).
+
+        Returns:
+            Sursa sau None dacă nu poate fi creată sau conectată
+        """
+        key = name.upper()
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            source = self._sources.get(key)
+            if source is not None and await source.is_healthy():
+                return source
+
+            failed_at = self._failed_at.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+                return None
+
+            reconnect = source is not None
+            if source is None:
+                source = self._factory(key)
+                if source is None:
+                    self._failed_at[key] = time.monotonic()
+                    return None
+                self._sources[key] = source
+            else:
+                self.logger.warning(f"Source {key} unhealthy, reconnecting")
+                await source.disconnect()
+
+            if not await source.connect():
+                self.logger.warning(f"Cannot connect source {key}, retry in {self.retry_after:.0f}s")
+                self._failed_at[key] = time.monotonic()
+                return None
+
+            self._failed_at.pop(key, None)
+            if reconnect:
+                restarted = await source.resubscribe()
+                if restarted:
+                    self.logger.info(f"Source {key}: {restarted} live streams restarted")
+            return source
+
+    async def health_check(self) -> Dict[str, bool]:
+        """Starea fiecărei surse create până acum.
+
+        Returns:
+            Dict nume → True dacă sursa e sănătoasă
+        """
+        return {name: await source.is_healthy() for name, source in self._sources.items()}
+
+    async def close_all(self) -> bool:
+        """Deconectează toate sursele din pool.
+
+        Returns:
+            True dacă toate deconectările reușesc
+        """
+        ok = True
+        for name, source in list(self._sources.items()):
+            try:
+                ok = await source.disconnect() and ok
+            except Exception as e:
+                self.logger.error(f"Disconnect error for {name}: {e}")
+                ok = False
+        self._sources.clear()
+        self._failed_at.clear()
+        return ok
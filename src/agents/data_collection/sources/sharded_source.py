@@ -0,0 +1,239 @@
+"""
+Sharded Data Source - Simbolurile împărțite între mai multe conexiuni ale aceleiași surse (ex: IBKR clientId-uri)
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import time
+
+from src.agents.data_collection.bus import BarBus
+from src.agents.data_collection.ring_buffer import RingBufferStore
+from src.agents.data_collection.sharding import ConsistentHashRing
+from src.agents.data_collection.sources.base_source import BaseDataSource
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import Bar, BarSeries
+
+
+class ShardedDataSource(BaseDataSource):
+    """Mai multe conexiuni ale aceleiași surse, văzute de agent ca una singură.
+
+    Fiecare simbol aparține unei singure conexiuni (hash consistent pe
+    simbol), deci contractele calificate, request-urile și stream-urile live
+    ale unui simbol rămân pe aceeași conexiune de la o rulare la alta.
+    Pacing-ul e separat per conexiune (`pacing_key` → 'IBKR#0', 'IBKR#1', ...),
+    deci throughput-ul crește cu numărul de conexiuni. O conexiune căzută
+    iese din inel: doar simbolurile ei trec pe celelalte până revine.
+    is_healthy() o reconectează (cel mult o dată la `retry_after` secunde)
+    și, la reușită, o pune înapoi în inel; stream-urile live urmează
+    simbolurile pe conexiunea care le servește.
+    """
+
+    def __init__(self, shards: List[BaseDataSource], replicas: int = 128, retry_after: float = 60.0):
+        """
+        Args:
+            shards: Surse de același tip, fiecare cu propria conexiune (ex: clientId diferit)
+            replicas: Puncte virtuale per conexiune pe inel
+            retry_after: Secunde între încercările de reconectare ale unei conexiuni căzute
+
+        Raises:
+            ValueError: Listă goală
+        """
+        if not shards:
+            raise ValueError("ShardedDataSource needs at least one shard")
+        self.shards = list(shards)
+        self.name = shards[0].name
+        self.replicas = replicas
+        self.retry_after = retry_after
+        self.logger = get_logger(__name__)
+        self._failed_at: Dict[int, float] = {}
+        # Conexiunea pe care rulează fiecare stream live (symbol, timeframe) → indice
+        self._stream_shards: Dict[Tuple[str, str], int] = {}
+        self._lost_streams: Set[Tuple[str, str]] = set()
+        self._ring = ConsistentHashRing(range(len(self.shards)), replicas)
+        self._active = tuple(range(len(self.shards)))
+
+    # --- Rutare ---
+
+    def shard_index(self, symbol: str) -> int:
+        """Indicele conexiunii care servește simbolul."""
+        return self._ring.node_for(symbol)
+
+    def shard_for(self, symbol: str) -> BaseDataSource:
+        """Conexiunea care servește simbolul."""
+        return self.shards[self.shard_index(symbol)]
+
+    def assign(self, symbols: List[str]) -> Dict[int, List[str]]:
+        """Simbolurile grupate pe conexiuni (indice → simboluri)."""
+        return self._ring.assign(symbols)
+
+    def pacing_key(self, symbol: Optional[str] = None) -> str:
+        if symbol is None:
+            return self.name
+        return f"{self.name}#{self.shard_index(symbol)}"
+
+    def _rebuild(self, active: List[int]) -> None:
+        """Inelul peste conexiunile active (toate, dacă niciuna nu e activă)."""
+        active = tuple(active) or tuple(range(len(self.shards)))
+        if active != self._active:
+            self.logger.warning(f"{self.name} shards active: {list(active)} of {len(self.shards)}")
+            self._ring = ConsistentHashRing(active, self.replicas)
+            self._active = active
+
+    # --- Conexiune ---
+
+    @property
+    def bus(self) -> BarBus:
+        return self.shards[0].bus
+
+    @bus.setter
+    def bus(self, bus: BarBus) -> None:
+        for shard in self.shards:
+            shard.bus = bus
+
+    @property
+    def history(self) -> RingBufferStore:
+        return self.shards[0].history
+
+    @history.setter
+    def history(self, history: RingBufferStore) -> None:
+        for shard in self.shards:
+            shard.history = history
+
+    async def connect(self) -> bool:
+        """Conectează toate conexiunile în paralel; reușește dacă măcar una e conectată."""
+        results = await asyncio.gather(*[shard.connect() for shard in self.shards])
+        now = time.monotonic()
+        self._failed_at = {i: now for i, ok in enumerate(results) if not ok}
+        self._rebuild([i for i, ok in enumerate(results) if ok])
+        connected = sum(results)
+        self.logger.info(f"{self.name}: {connected}/{len(self.shards)} connections up")
+        return connected > 0
+
+    async def disconnect(self) -> bool:
+        results = await asyncio.gather(*[shard.disconnect() for shard in self.shards])
+        return all(results)
+
+    async def is_healthy(self) -> bool:
+        """True dacă măcar o conexiune e sănătoasă; cele căzute se reconectează (după retry_after)."""
+        healthy = list(await asyncio.gather(*[shard.is_healthy() for shard in self.shards]))
+        if any(healthy):
+            dead = [i for i, ok in enumerate(healthy) if not ok and self._retry_due(i)]
+            reconnected = set()
+            for i, ok in zip(dead, await asyncio.gather(*[self._reconnect(i) for i in dead])):
+                healthy[i] = ok
+                if ok:
+                    reconnected.add(i)
+            self._rebuild([i for i, ok in enumerate(healthy) if ok])
+            await self._move_streams(healthy, reconnected)
+        return any(healthy)
+
+    def _retry_due(self, index: int) -> bool:
+        failed_at = self._failed_at.get(index)
+        return failed_at is None or time.monotonic() - failed_at >= self.retry_after
+
+    async def _reconnect(self, index: int) -> bool:
+        """Reconectează o conexiune căzută (fără să atingă celelalte)."""
+        shard = self.shards[index]
+        self.logger.warning(f"{self.name} shard {index} down, reconnecting")
+        try:
+            await shard.disconnect()
+            ok = await shard.connect()
+        except Exception as e:
+            self.logger.error(f"{self.name} shard {index} reconnect error: {e}")
+            ok = False
+        if ok:
+            self._failed_at.pop(index, None)
+            self.logger.info(f"{self.name} shard {index} reconnected")
+        else:
+            self._failed_at[index] = time.monotonic()
+        return ok
+
+    async def prepare(self, symbols: List[str]) -> None:
+        """Fiecare conexiune își pregătește (califică) doar simbolurile ei."""
+        groups = self.assign(symbols)
+        await asyncio.gather(*[self.shards[i].prepare(group) for i, group in groups.items()])
+
+    def cancel_requests(self) -> int:
+        return sum(getattr(shard, "cancel_requests", lambda: 0)() for shard in self.shards)
+
+    # --- Istoric ---
+
+    async def fetch_historical_data(
+        self,
+        symbol: str,
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> List[Bar]:
+        return await self.shard_for(symbol).fetch_historical_data(symbol, timeframe, lookback_days, useRTH)
+
+    async def fetch_historical_series(
+        self,
+        symbol: str,
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> BarSeries:
+        return await self.shard_for(symbol).fetch_historical_series(symbol, timeframe, lookback_days, useRTH)
+
+    async def fetch_historical_batch(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> Dict[str, BarSeries]:
+        """Fiecare conexiune își descarcă grupul, toate în paralel."""
+        results: Dict[str, BarSeries] = {}
+        groups = self.assign(symbols)
+        batches = await asyncio.gather(*[
+            self.shards[i].fetch_historical_batch(group, timeframe, lookback_days, useRTH)
+            for i, group in groups.items()
+        ])
+        for batch in batches:
+            results.update(batch)
+        return results
+
+    async def fetch_window(
+        self,
+        symbol: str,
+        timeframe: str,
+        end: datetime,
+        duration_str: str,
+        useRTH: bool = True
+    ) -> BarSeries:
+        return await self.shard_for(symbol).fetch_window(symbol, timeframe, end, duration_str, useRTH)
+
+    # --- Live ---
+
+    async def subscribe_to_bars(self, symbol: str, timeframe: str) -> bool:
+        index = self.shard_index(symbol)
+        ok = await self.shards[index].subscribe_to_bars(symbol, timeframe)
+        if ok:
+            self._stream_shards[(symbol, timeframe)] = index
+            self._lost_streams.discard((symbol, timeframe))
+        return ok
+
+    async def _move_streams(self, healthy: List[bool], reconnected: set) -> None:
+        """Repornește stream-urile pierdute la reconectare sau mutate pe altă conexiune.
+
+        Cele care nu repornesc rămân în evidență și se reîncearcă la următorul is_healthy().
+        """
+        for key, index in list(self._stream_shards.items()):
+            symbol, timeframe = key
+            owner = self.shard_index(symbol)
+            alive = healthy[index] and index not in reconnected
+            if alive and index == owner and key not in self._lost_streams:
+                continue
+            if alive and index != owner:
+                # Conexiunea veche încă rulează stream-ul: oprit, altfel bars ar veni dublat
+                unsubscribe = getattr(self.shards[index], "unsubscribe_from_bars", None)
+                if unsubscribe is not None:
+                    unsubscribe(symbol, timeframe)
+            if not await self.subscribe_to_bars(symbol, timeframe):
+                self._lost_streams.add(key)
+                self.logger.warning(f"{self.name}: cannot restart live stream {symbol} {timeframe}, will retry")
+
+    def get_latest_bar(self, symbol: str) -> Optional[Bar]:
+        return self.shard_for(symbol).get_latest_bar(symbol)
@@ -2,29 +2,42 @@
 Yahoo Finance Data Source - Backup source pentru date istorice
 """
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta
 import asyncio
 
+import numpy as np
+import pandas as pd
+
 try:
     import yfinance as yf
     YAHOO_AVAILABLE = True
 except ImportError:
     YAHOO_AVAILABLE = False
 
+from src.agents.data_collection.corporate_actions import CorporateAction, actions_from_frame
 from src.agents.data_collection.sources.base_source import BaseDataSource
-from src.common.models.market_data import Bar
+from src.agents.data_collection.validator import DataValidator
+from src.common.models.market_data import Bar, BarSeries
 from src.common.logging_utils.logger import get_logger
 
 
 class YahooDataSource(BaseDataSource):
     """Data source pentru Yahoo Finance (backup)."""
     
-    def __init__(self):
-        """Inițializează Yahoo Finance data source."""
+    name = "YAHOO"
+    supports_batch = True
+    
+    def __init__(self, batch_size: int = 50):
+        """Inițializează Yahoo Finance data source.
+        
+        Args:
+            batch_size: Număr maxim de simboluri per request multi-ticker
+        """
         if not YAHOO_AVAILABLE:
             raise ImportError("yfinance not installed. Install with: pip install yfinance")
         
+        self.batch_size = max(1, int(batch_size))
         self.bars_cache: Dict[str, Bar] = {}
         self.logger = get_logger(__name__)
         self._connected = True  # Yahoo nu necesită conexiune explicită
@@ -60,13 +73,36 @@ class YahooDataSource(BaseDataSource):
         Returns:
             Lista de Bar-uri normalizate
         """
+        series = await self.fetch_historical_series(symbol, timeframe, lookback_days, useRTH)
+        return series.to_bars()
+    
+    async def fetch_historical_series(
+        self, 
+        symbol: str, 
+        timeframe: str, 
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> BarSeries:
+        """
+        Descarcă date istorice din Yahoo Finance direct ca BarSeries.
+        
+        Conversia DataFrame → coloane e vectorizată (fără iterrows).
+        
+        Args:
+            symbol: Simbol stoc (ex: 'AAPL')
+            timeframe: Timeframe (ex: '1H', '1D', '5m')
+            lookback_days: Zile de descărcat
+            useRTH: Ignorat pentru Yahoo (nu suportă RTH)
+        
+        Returns:
+            BarSeries (goală dacă nu există date)
+        """
         try:
             # Convert timeframe Yahoo format
             interval = self._convert_timeframe(timeframe)
             
             # Calculare perioadă
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=lookback_days)
+            start_date, end_date = self._period(lookback_days)
             
             self.logger.info(f"Fetching {symbol} {timeframe} from Yahoo Finance ({lookback_days} days)...")
             
@@ -84,36 +120,109 @@ class YahooDataSource(BaseDataSource):
                     start=start_date,
                     end=end_date,
                     interval=interval,
-                    prepost=False  # Nu include pre/post market
+                    prepost=False,       # Nu include pre/post market
+                    auto_adjust=False,   # Istoric raw; ajustarea o face CorporateActionAdjuster
+                    actions=True         # Split-urile din perioadă, pentru _unadjust_splits
                 )
             )
             
             if hist.empty:
                 self.logger.warning(f"No data from Yahoo Finance for {symbol}")
-                return []
+                return BarSeries.empty(symbol, timeframe, self.name)
             
-            # Convert și normalizare
-            bars_normalized = []
-            for idx, row in hist.iterrows():
-                # idx este pandas Timestamp, convert la datetime
-                timestamp = idx.to_pydatetime() if hasattr(idx, 'to_pydatetime') else datetime.fromtimestamp(idx.timestamp())
-                normalized = self._normalize_bar(row, symbol, timeframe, 'YAHOO', timestamp)
-                bars_normalized.append(normalized)
+            series = self._frame_to_series(hist, symbol, timeframe)
             
-            self.logger.info(f"Fetched {len(bars_normalized)} bars from Yahoo Finance for {symbol}")
-            return bars_normalized
+            self.logger.info(f"Fetched {len(series)} bars from Yahoo Finance for {symbol}")
+            return series
             
         except Exception as e:
             self.logger.error(f"Yahoo Finance fetch error for {symbol}: {e}")
-            return []
+            return BarSeries.empty(symbol, timeframe, self.name)
+    
+    async def fetch_historical_batch(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        lookback_days: int,
+        useRTH: bool = True
+    ) -> Dict[str, BarSeries]:
+        """
+        Descarcă mai multe simboluri cu câte un request multi-ticker per grup.
+        
+        Args:
+            symbols: Lista de simboluri
+            timeframe: Timeframe (ex: '1H', '1D', '5m')
+            lookback_days: Zile de descărcat
+            useRTH: Ignorat pentru Yahoo (nu suportă RTH)
+        
+        Returns:
+            Dict simbol → BarSeries (serie goală pentru simbolurile fără date)
+        """
+        interval = self._convert_timeframe(timeframe)
+        start_date, end_date = self._period(lookback_days)
+        loop = asyncio.get_event_loop()
+        results: Dict[str, BarSeries] = {}
+        
+        for i in range(0, len(symbols), self.batch_size):
+            chunk = list(symbols[i:i + self.batch_size])
+            self.logger.info(f"Fetching {len(chunk)} symbols {timeframe} from Yahoo Finance ({lookback_days} days)...")
+            try:
+                data = await loop.run_in_executor(
+                    None,
+                    lambda: yf.download(
+                        tickers=chunk,
+                        start=start_date,
+                        end=end_date,
+                        interval=interval,
+                        group_by="ticker",
+                        auto_adjust=False,   # Ca Ticker.history()
+                        actions=True,
+                        prepost=False,       # Nu include pre/post market
+                        threads=True,
+                        progress=False
+                    )
+                )
+            except Exception as e:
+                self.logger.error(f"Yahoo Finance batch fetch error: {e}")
+                data = None
+            
+            for symbol in chunk:
+                hist = self._split_batch(data, symbol)
+                if hist is None or hist.empty:
+                    self.logger.warning(f"No data from Yahoo Finance for {symbol}")
+                    results[symbol] = BarSeries.empty(symbol, timeframe, self.name)
+                else:
+                    results[symbol] = self._frame_to_series(hist, symbol, timeframe)
+        
+        self.logger.info(f"Fetched {sum(len(s) for s in results.values())} bars for {len(symbols)} symbols from Yahoo Finance")
+        return results
+    
+    async def fetch_corporate_actions(self, symbol: str) -> Optional[List[CorporateAction]]:
+        """
+        Split-urile și dividendele simbolului (tot istoricul, Ticker.actions).
+        
+        Args:
+            symbol: Simbol stoc
+        
+        Returns:
+            Lista de CorporateAction (dividende la suma plătită efectiv) sau None la eroare
+        """
+        try:
+            loop = asyncio.get_event_loop()
+            frame = await loop.run_in_executor(None, lambda: yf.Ticker(symbol).actions)
+            return actions_from_frame(symbol, frame)
+        except Exception as e:
+            self.logger.error(f"Yahoo Finance corporate actions error for {symbol}: {e}")
+            return None
     
     async def subscribe_to_bars(
         self, 
         symbol: str, 
         timeframe: str
-    ) -> None:
+    ) -> bool:
         """Yahoo Finance nu suportă live stream - doar istoric."""
         self.logger.warning("Yahoo Finance does not support live streaming. Use IBKR for live data.")
+        return False
     
     def get_latest_bar(self, symbol: str) -> Optional[Bar]:
         """Ultimul bar din cache (Yahoo nu are live stream)."""
@@ -133,20 +242,89 @@ class YahooDataSource(BaseDataSource):
         }
         return mapping.get(tf, '1d')
     
-    def _normalize_bar(self, row, symbol: str, timeframe: str, source: str, timestamp: datetime) -> Bar:
-        """Normalizare Yahoo Finance row → Bar standardizat."""
-        return Bar(
-            timestamp=timestamp,
-            open=round(float(row['Open']), 2),
-            high=round(float(row['High']), 2),
-            low=round(float(row['Low']), 2),
-            close=round(float(row['Close']), 2),
-            volume=int(row['Volume']) if 'Volume' in row else 0,
+    def _period(self, lookback_days: int) -> Tuple[datetime, datetime]:
+        """Intervalul (start, end) pentru ultimele lookback_days zile."""
+        end_date = datetime.now()
+        return end_date - timedelta(days=lookback_days), end_date
+    
+    def _split_batch(self, data: Optional[pd.DataFrame], symbol: str) -> Optional[pd.DataFrame]:
+        """Extrage DataFrame-ul unui simbol din rezultatul yf.download(group_by='ticker')."""
+        if data is None or data.empty:
+            return None
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol in data.columns.get_level_values(0):
+                hist = data[symbol]
+            elif symbol in data.columns.get_level_values(1):
+                hist = data.xs(symbol, axis=1, level=1)
+            else:
+                return None
+        else:
+            hist = data  # un singur ticker, coloane simple
+        # Tickerele au calendare diferite: rândurile complet goale aparțin altor simboluri
+        return hist.dropna(how="all")
+    
+    def _frame_to_series(self, hist: pd.DataFrame, symbol: str, timeframe: str) -> BarSeries:
+        """Normalizare DataFrame Yahoo Finance → BarSeries, pe coloane întregi.
+        
+        Rotunjire la 2 zecimale, cast-uri și conversia timezone → UTC se fac
+        vectorizat; timezone-ul original se păstrează în BarSeries.tz.
+        Prețurile se readuc la valorile raw (_unadjust_splits), ca istoricul
+        din Yahoo să se ajusteze la fel ca cel din IBKR.
+        Rândurile care nu trec validarea (DataValidator) se elimină.
+        """
+        hist = self._unadjust_splits(hist)
+        # Rânduri fără preț (ex: zile doar cu dividende) nu sunt bars
+        hist = hist.dropna(subset=["Open", "High", "Low", "Close"])
+        
+        index = pd.DatetimeIndex(hist.index)
+        tz = index.tz
+        if tz is not None:
+            index = index.tz_convert("UTC")
+        
+        if "Volume" in hist:
+            volume = hist["Volume"].fillna(0).to_numpy(np.int64)
+        else:
+            volume = np.zeros(len(hist), dtype=np.int64)
+        
+        series = BarSeries(
             symbol=symbol,
             timeframe=timeframe,
-            count=None,  # Yahoo nu oferă count
-            wap=None,    # Yahoo nu oferă WAP direct
-            hasGaps=None,  # Yahoo nu oferă hasGaps
-            source=source,
+            timestamps=index.as_unit("ns").asi8,
+            open=np.round(hist["Open"].to_numpy(np.float64), 2),
+            high=np.round(hist["High"].to_numpy(np.float64), 2),
+            low=np.round(hist["Low"].to_numpy(np.float64), 2),
+            close=np.round(hist["Close"].to_numpy(np.float64), 2),
+            volume=volume,
+            count=None,     # Yahoo nu oferă count
+            wap=None,       # Yahoo nu oferă WAP direct
+            has_gaps=None,  # Yahoo nu oferă hasGaps
+            source=self.name,
+            tz=tz,
             normalized=True
         )
+        # Fără Bar(...) per rând: rândurile inconsistente (ex: Close > High) se elimină aici
+        validation = DataValidator().validate_frame(series, symbol)
+        return series if not validation.invalid_count else series[validation.mask]
+    
+    def _unadjust_splits(self, hist: pd.DataFrame) -> pd.DataFrame:
+        """Anulează ajustarea la split-uri pe care Yahoo o aplică și cu auto_adjust=False.
+        
+        Prețurile Yahoo sunt împărțite (volumul înmulțit) la toate split-urile
+        de până la momentul descărcării. Perioada cerută se termină acum, deci
+        coloana 'Stock Splits' (actions=True) conține exact aceste split-uri:
+        fiecare rând se înmulțește cu produsul split-urilor de după el.
+        """
+        if "Stock Splits" not in hist:
+            return hist
+        splits = hist["Stock Splits"].fillna(0).to_numpy(np.float64)
+        if not (splits > 0).any():
+            return hist
+        ratios = np.where(splits > 0, splits, 1.0)
+        # Produs cumulativ de la coadă, fără rândul curent (split-ul e efectiv din ziua lui)
+        later = np.r_[np.cumprod(ratios[::-1])[::-1][1:], 1.0]
+        hist = hist.copy()
+        for column in ("Open", "High", "Low", "Close"):
+            hist[column] = hist[column] * later
+        if "Volume" in hist:
+            hist["Volume"] = np.rint(hist["Volume"].fillna(0).to_numpy(np.float64) / later)
+        return hist
@@ -0,0 +1,141 @@
+"""
+Teste pentru backfill-ul pe ferestre (planner, concurență, checkpoint)
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.agents.data_collection.backfill import BackfillPlanner, Backfiller
+from src.agents.data_collection.scheduler import RequestScheduler
+from src.common.models.market_data import BarSeries
+
+
+class WindowSource:
+    """Sursă falsă cu fetch_window: bars orare în fereastra cerută."""
+
+    name = "IBKR"
+
+    def __init__(self, fail_windows=()):
+        self.fail_windows = set(fail_windows)
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def fetch_window(self, symbol, timeframe, end, duration_str, useRTH=True):
+        self.calls.append(end)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if end in self.fail_windows:
+            raise RuntimeError("pacing violation")
+        days = int(duration_str.split()[0])
+        # Ca IBKR: fereastra include ultima oră de dinainte (suprapunere cu fereastra vecină)
+        stamps = pd.date_range(end=end, periods=days * 24 + 1, freq="h", inclusive="both")
+        n = len(stamps)
+        return BarSeries(symbol, timeframe, stamps.as_unit("ns").asi8, np.full(n, 100.0),
+                         np.full(n, 101.0), np.full(n, 99.0), np.full(n, 100.5),
+                         np.full(n, 1000), source="IBKR", tz=timezone.utc)
+
+
+def _scheduler():
+    return RequestScheduler({"IBKR": {"max_requests": 1000, "period_seconds": 1, "max_concurrent": 3,
+                                      "identical_interval_seconds": 0, "same_contract_requests": 1000}})
+
+
+class TestBackfillPlanner:
+    """Teste pentru BackfillPlanner."""
+
+    def test_windows_cover_range(self):
+        """Test: ferestrele acoperă exact intervalul, fără goluri."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2025, 3, 15, tzinfo=timezone.utc)
+        windows = BackfillPlanner().plan(start, end, "1H")
+
+        assert len(windows) == 3
+        assert windows[0].end == end
+        assert windows[-1].start == start
+        for newer, older in zip(windows, windows[1:]):
+            assert older.end == newer.start
+        assert windows[0].duration_str == "30 D"
+        assert windows[-1].duration_str == "13 D"
+
+    def test_minute_bars_use_daily_windows(self):
+        """Test: 1m → ferestre de o zi; 1D → '1 Y'."""
+        start = datetime(2024, 1, 1)
+        end = datetime(2025, 1, 1)
+        assert len(BackfillPlanner().plan(start, end, "1m")) == 366
+        assert BackfillPlanner().plan(start, end, "1D")[0].duration_str == "1 Y"
+
+    def test_unknown_timeframe(self):
+        """Test: timeframe necunoscut."""
+        with pytest.raises(ValueError):
+            BackfillPlanner().plan(datetime(2024, 1, 1), datetime(2024, 2, 1), "2m")
+
+
+class TestBackfiller:
+    """Teste pentru Backfiller."""
+
+    def test_concurrent_windows_stitched(self):
+        """Test: ferestrele rulează concurent (max_concurrent) și rezultatul e fără duplicate."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2025, 1, 11, tzinfo=timezone.utc)
+        source = WindowSource()
+        backfiller = Backfiller(source, _scheduler(), BackfillPlanner({"1H": 1}))
+
+        result = asyncio.run(backfiller.run("AAPL", "1H", start, end))
+
+        assert result.complete == True
+        assert len(source.calls) == 10
+        assert source.peak == 3
+        series = result.series
+        assert len(series) == 10 * 24
+        assert np.all(np.diff(series.timestamps) > 0)
+        assert series[0].timestamp == start
+        assert series[-1].timestamp == end - timedelta(hours=1)
+
+    def test_resume_from_checkpoint(self, tmp_path):
+        """Test: ferestrele eșuate se reiau, cele terminate se citesc din checkpoint."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2025, 1, 6, tzinfo=timezone.utc)
+        planner = BackfillPlanner({"1H": 1})
+        failing = WindowSource(fail_windows=[datetime(2025, 1, 3, tzinfo=timezone.utc)])
+
+        first = asyncio.run(Backfiller(failing, _scheduler(), planner, str(tmp_path)).run("AAPL", "1H", start, end))
+        assert first.complete == False
+        assert first.failed == [3]
+        assert (tmp_path / "AAPL_1H" / "state.json").exists()
+
+        source = WindowSource()
+        second = asyncio.run(Backfiller(source, _scheduler(), planner, str(tmp_path)).run("AAPL", "1H", start, end))
+        assert second.complete == True
+        assert source.calls == [datetime(2025, 1, 3, tzinfo=timezone.utc)]
+        assert len(second.series) == 5 * 24
+        assert not (tmp_path / "AAPL_1H").exists()
+
+    def test_resume_without_explicit_end(self, tmp_path):
+        """Test: fără end (CLI), reluarea folosește end-ul din checkpoint, nu „acum”."""
+        start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=4)
+        planner = BackfillPlanner({"1H": 1})
+        cutoff = start + timedelta(days=2)
+
+        class OldWindowsFail(WindowSource):
+            async def fetch_window(self, symbol, timeframe, end, duration_str, useRTH=True):
+                if end <= cutoff:
+                    self.fail_windows.add(end)
+                return await super().fetch_window(symbol, timeframe, end, duration_str, useRTH)
+
+        failing = OldWindowsFail()
+        first = asyncio.run(Backfiller(failing, _scheduler(), planner, str(tmp_path)).run("AAPL", "1H", start))
+        assert first.complete == False
+        assert len(first.failed) == 2
+
+        source = WindowSource()
+        second = asyncio.run(Backfiller(source, _scheduler(), planner, str(tmp_path)).run("AAPL", "1H", start))
+        assert second.complete == True
+        assert sorted(source.calls) == sorted(failing.fail_windows)
+        assert second.series[-1].timestamp == first.series[-1].timestamp
@@ -0,0 +1,122 @@
+"""
+Teste pentru BarBus (fan-out live și backpressure)
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.agents.data_collection.bus import BackpressurePolicy, BarBus, SubscriptionClosed
+from src.common.models.market_data import Bar
+
+
+def _bar(minute: int, close: float = 100.0, symbol: str = "AAPL") -> Bar:
+    return Bar(
+        timestamp=datetime(2026, 1, 15, 15, 30) + timedelta(minutes=minute),
+        open=100.0, high=101.0, low=99.0, close=close, volume=100,
+        symbol=symbol, timeframe="1m", source="IBKR"
+    )
+
+
+class TestBarBus:
+    """Teste pentru BarBus."""
+
+    def test_fan_out_and_filters(self):
+        """Test: fiecare abonat primește update-urile lui; closed_only filtrează bars în formare."""
+        bus = BarBus()
+        everything = bus.subscribe("AAPL", "1m")
+        closes = bus.subscribe("AAPL", "1m", closed_only=True)
+        recorder = bus.subscribe()
+        other = bus.subscribe("MSFT", "1m")
+
+        bus.publish_nowait(_bar(0, 100.5), closed=False)
+        bus.publish_nowait(_bar(0, 100.7), closed=True)
+        bus.publish_nowait(_bar(1, 100.2), closed=False)
+
+        assert len(everything) == 3
+        assert len(closes) == 1
+        assert len(recorder) == 3
+        assert len(other) == 0
+        update = asyncio.run(closes.get())
+        assert update.closed == True
+        assert update.bar.close == 100.7
+
+    def test_consumer_woken_without_polling(self):
+        """Test: consumatorul care așteaptă primește bar-ul publicat ulterior."""
+        async def run():
+            bus = BarBus()
+            sub = bus.subscribe("AAPL", "1m")
+            received = []
+
+            async def consume():
+                async for update in sub:
+                    received.append(update.bar.close)
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0)
+            bus.publish_nowait(_bar(0, 100.5), closed=True)
+            bus.publish_nowait(_bar(1, 100.8), closed=True)
+            await asyncio.sleep(0)
+            sub.close()
+            await task
+            return received
+
+        assert asyncio.run(run()) == [100.5, 100.8]
+
+    def test_drop_oldest(self):
+        """Test: DROP_OLDEST păstrează ultimele maxsize update-uri."""
+        bus = BarBus(maxsize=2)
+        sub = bus.subscribe("AAPL", "1m")
+        for minute in range(5):
+            bus.publish_nowait(_bar(minute), closed=True)
+
+        assert len(sub) == 2
+        assert sub.dropped == 3
+        assert asyncio.run(sub.get()).bar.timestamp == _bar(3).timestamp
+
+    def test_coalesce_keeps_latest_per_bar(self):
+        """Test: COALESCE înlocuiește update-urile aceluiași bar în formare, nu bars închise."""
+        bus = BarBus(policy=BackpressurePolicy.COALESCE)
+        sub = bus.subscribe("AAPL", "1m")
+        for close in (100.1, 100.2, 100.3):
+            bus.publish_nowait(_bar(0, close), closed=False)
+        bus.publish_nowait(_bar(0, 100.4), closed=True)
+        bus.publish_nowait(_bar(1, 100.5), closed=False)
+
+        assert len(sub) == 2
+        assert sub.coalesced == 3
+        first = asyncio.run(sub.get())
+        assert first.closed == True
+        assert first.bar.close == 100.4
+
+    def test_block_waits_for_consumer(self):
+        """Test: BLOCK - publish() așteaptă până consumatorul eliberează loc, fără pierderi."""
+        async def run():
+            bus = BarBus(maxsize=1, policy=BackpressurePolicy.BLOCK)
+            sub = bus.subscribe("AAPL", "1m")
+            await bus.publish(_bar(0), closed=True)
+            blocked = asyncio.create_task(bus.publish(_bar(1), closed=True))
+            await asyncio.sleep(0.01)
+            assert not blocked.done()
+            first = await sub.get()
+            await asyncio.wait_for(blocked, 1)
+            second = await sub.get()
+            return first, second, sub.dropped
+
+        first, second, dropped = asyncio.run(run())
+        assert first.bar.timestamp < second.bar.timestamp
+        assert dropped == 0
+
+    def test_closed_subscription(self):
+        """Test: după close, coada se golește apoi get() semnalează închiderea."""
+        bus = BarBus()
+        sub = bus.subscribe("AAPL", "1m")
+        bus.publish_nowait(_bar(0), closed=True)
+        sub.close()
+        bus.publish_nowait(_bar(1), closed=True)
+
+        assert bus.has_subscribers("AAPL", "1m") == False
+        assert asyncio.run(sub.get()).bar.timestamp == _bar(0).timestamp
+        with pytest.raises(SubscriptionClosed):
+            asyncio.run(sub.get())
@@ -0,0 +1,147 @@
+"""
+Teste pentru CachedDataSource
+"""
+
+import asyncio
+import time
+
+import yaml
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.sources.base_source import BaseDataSource
+from src.agents.data_collection.sources.cached_source import CachedDataSource
+from src.agents.data_collection.sources.ib_simulator import SimulatedIB
+from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+
+
+class CountingSource(BaseDataSource):
+    """Sursă falsă care numără request-urile (bars din IB simulat)."""
+
+    name = "FAKE"
+
+    def __init__(self):
+        self.inner = IBKRDataSource("127.0.0.1", 7497, 1, ib=SimulatedIB(pacing={}))
+        self.calls = []
+
+    async def connect(self):
+        return await self.inner.connect()
+
+    async def disconnect(self):
+        return await self.inner.disconnect()
+
+    async def fetch_historical_data(self, symbol, timeframe, lookback_days, useRTH=True):
+        self.calls.append(symbol)
+        return await self.inner.fetch_historical_data(symbol, timeframe, lookback_days, useRTH)
+
+    async def subscribe_to_bars(self, symbol, timeframe):
+        pass
+
+    def get_latest_bar(self, symbol):
+        return None
+
+
+class TestCachedDataSource:
+    """Teste pentru CachedDataSource."""
+
+    def test_hits_skip_source(self, tmp_path):
+        """Test: al doilea fetch vine din memorie, al treilea (instanță nouă) de pe disc."""
+        async def run():
+            inner = CountingSource()
+            cached = CachedDataSource(inner, str(tmp_path))
+            await cached.connect()
+            first = await cached.fetch_historical_series("AAPL", "1H", 5)
+            start = time.perf_counter()
+            second = await cached.fetch_historical_series("AAPL", "1H", 5)
+            memory_hit = time.perf_counter() - start
+            other = await cached.fetch_historical_series("AAPL", "1H", 5, useRTH=False)
+
+            reopened = CachedDataSource(inner, str(tmp_path))
+            third = await reopened.fetch_historical_series("AAPL", "1H", 5)
+            await cached.disconnect()
+            return inner, cached, reopened, first, second, third, other, memory_hit
+
+        inner, cached, reopened, first, second, third, other, memory_hit = asyncio.run(run())
+        assert inner.calls == ["AAPL", "AAPL"]          # al doilea = useRTH diferit
+        assert second is first
+        assert memory_hit < 0.001
+        assert third.timestamps.tolist() == first.timestamps.tolist()
+        assert third.tz == first.tz
+        assert len(other) > len(first)
+        assert cached.stats()["hits_memory"] == 1
+        assert cached.stats()["misses"] == 2
+        assert reopened.stats()["hits_disk"] == 1
+        assert reopened.hit_rate == 1.0
+
+    def test_ttl_and_lru(self, tmp_path):
+        """Test: intrarea expirată se descarcă din nou; peste max_bytes se șterge cea mai veche."""
+        async def run():
+            inner = CountingSource()
+            await inner.connect()
+            cached = CachedDataSource(inner, str(tmp_path), ttl_seconds={"1H": 0.05}, memory_entries=0)
+            await cached.fetch_historical_series("AAPL", "1H", 5)
+            await asyncio.sleep(0.06)
+            await cached.fetch_historical_series("AAPL", "1H", 5)
+            ttl_calls = len(inner.calls)
+
+            entry_bytes = cached.stats()["bytes"]
+            small = CachedDataSource(inner, str(tmp_path / "lru"), max_bytes=int(entry_bytes * 2.5))
+            for symbol in ("AAPL", "MSFT", "AMD"):
+                await small.fetch_historical_series(symbol, "1D", 30)
+            await small.fetch_historical_series("MSFT", "1D", 30)
+            await small.fetch_historical_series("AMD", "1D", 30)
+            files = sorted(p.name for p in (tmp_path / "lru").glob("*.npz"))
+            return ttl_calls, small.stats(), files
+
+        ttl_calls, stats, files = asyncio.run(run())
+        assert ttl_calls == 2
+        assert stats["entries"] == 2
+        assert len(files) == 2
+        assert stats["bytes"] <= stats["bytes"] * 2.5
+
+    def test_expire_before_bar_close(self, tmp_path):
+        """Test expire(): doar intrările timeframe-ului, create înainte de moment."""
+        async def run():
+            inner = CountingSource()
+            await inner.connect()
+            cached = CachedDataSource(inner, str(tmp_path))
+            await cached.fetch_historical_series("AAPL", "1H", 5)
+            await cached.fetch_historical_series("AAPL", "1D", 30)
+            expired = cached.expire("1H", created_before=time.time() + 1)
+            await cached.fetch_historical_series("AAPL", "1H", 5)
+            await cached.fetch_historical_series("AAPL", "1D", 30)
+            return expired, len(inner.calls)
+
+        expired, calls = asyncio.run(run())
+        assert expired == 1
+        assert calls == 3
+
+    def test_agent_wraps_source(self, tmp_path):
+        """Test: cache.enabled → a doua colectare nu mai face request-uri."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "ibkr": {"simulator": True, "simulator_options": {"pacing": {}}},
+            "data_collector": {
+                "symbols": ["AAPL", "MSFT"],
+                "timeframe": "1H",
+                "lookback_days": 5,
+                "data_source": "IBKR",
+                "data_dir": str(tmp_path),
+                "output_format": ["csv"],
+                "cache": {"enabled": True, "dir": str(tmp_path / "cache")},
+            },
+        }))
+
+        async def run():
+            agent = DataCollectionAgent(str(config_path))
+            assert await agent.initialize() == True
+            await agent.collect_all()
+            await agent.collect_all()
+            source = agent.data_source
+            await agent.shutdown()
+            return source
+
+        source = asyncio.run(run())
+        assert isinstance(source, CachedDataSource)
+        assert isinstance(source.ib, SimulatedIB)
+        assert source.ib.stats.requests == 2
+        assert source.stats()["hits_memory"] == 2
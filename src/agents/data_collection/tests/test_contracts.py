@@ -0,0 +1,81 @@
+"""
+Teste pentru ContractResolver (calificare în grup, cache în memorie și pe disc)
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.agents.data_collection.sources.contracts import ContractError, ContractResolver
+from src.agents.data_collection.sources.ib_simulator import Contract, SimulatedIB, Stock
+from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+
+
+def _resolver(ib, cache_file=None, **kwargs):
+    return ContractResolver(ib, lambda s: Stock(s, "SMART", "USD"), Contract, cache_file, **kwargs)
+
+
+class TestContractResolver:
+    """Teste pentru ContractResolver."""
+
+    def test_prepare_qualifies_once(self):
+        """Test: prepare califică simbolurile lipsă; resolve ulterior nu mai face lookup."""
+        async def run():
+            ib = SimulatedIB(pacing={}).connect()
+            resolver = _resolver(ib, batch_size=2)
+            resolved = await resolver.prepare(["AAPL", "MSFT", "AMD", "AAPL"])
+            contract = await resolver.resolve("MSFT")
+            return ib, resolver, resolved, contract
+
+        ib, resolver, resolved, contract = asyncio.run(run())
+        assert sorted(resolved) == ["AAPL", "AMD", "MSFT"]
+        assert contract.conId > 0
+        assert resolver.lookups == 3
+        assert ib.stats.contracts_qualified == 3
+
+    def test_unknown_symbol_fails_early(self):
+        """Test: simbol necalificabil → raportat la prepare, ContractError la resolve, fără re-lookup."""
+        async def run():
+            ib = SimulatedIB(pacing={}, unknown_symbols=["XYZQ"]).connect()
+            resolver = _resolver(ib)
+            resolved = await resolver.prepare(["AAPL", "XYZQ"])
+            with pytest.raises(ContractError):
+                await resolver.resolve("XYZQ")
+            return resolver, resolved
+
+        resolver, resolved = asyncio.run(run())
+        assert list(resolved) == ["AAPL"]
+        assert resolver.lookups == 2
+
+    def test_disk_cache_and_ttl(self, tmp_path):
+        """Test: a doua rulare pornește fără lookup-uri; intrările expirate se recalifică."""
+        cache_file = tmp_path / "contracts.json"
+
+        async def run(resolver):
+            await resolver.prepare(["AAPL", "MSFT"])
+            return resolver.lookups
+
+        ib = SimulatedIB(pacing={}).connect()
+        assert asyncio.run(run(_resolver(ib, str(cache_file)))) == 2
+        assert asyncio.run(run(_resolver(ib, str(cache_file)))) == 0
+
+        entries = json.loads(cache_file.read_text())
+        entries["AAPL"]["resolved_at"] = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+        cache_file.write_text(json.dumps(entries))
+        assert asyncio.run(run(_resolver(ib, str(cache_file), ttl_days=7))) == 1
+
+    def test_source_uses_cached_contracts(self, tmp_path):
+        """Test: IBKRDataSource califică la prepare și refolosește contractele la fetch."""
+        async def run():
+            ib = SimulatedIB(pacing={})
+            source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib, contract_cache=str(tmp_path / "c.json"))
+            await source.connect()
+            await source.prepare(["AAPL", "MSFT"])
+            await source.fetch_historical_data("AAPL", "1H", 2)
+            await source.fetch_historical_data("MSFT", "1H", 2)
+            await source.disconnect()
+            return ib.stats.contracts_qualified
+
+        assert asyncio.run(run()) == 2
@@ -0,0 +1,202 @@
+"""
+Teste pentru CorporateActionStore și CorporateActionAdjuster
+"""
+
+import asyncio
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.corporate_actions import (
+    CorporateActionAdjuster,
+    CorporateActionStore,
+    actions_from_frame,
+)
+from src.common.models.market_data import BarSeries
+
+
+def _daily(symbol: str, start: str, days: int, close: float = 100.0, source: str = "IBKR") -> BarSeries:
+    """Bars zilnice (miezul nopții, naive), preț constant."""
+    stamps = pd.bdate_range(start, periods=days).as_unit("ns").asi8
+    price = np.full(days, close)
+    return BarSeries(symbol, "1D", stamps, price, price + 1, price - 1, price,
+                     np.full(days, 1000, dtype=np.int64), wap=price, source=source)
+
+
+class TestCorporateActionAdjuster:
+    """Teste pentru factorii de ajustare."""
+
+    def test_split(self):
+        """Test split 4:1: bars dinainte de ex-date /4 la preț, ×4 la volum."""
+        store = CorporateActionStore()
+        store.add_split("AAPL", date(2020, 8, 31), 4)
+        series = _daily("AAPL", "2020-08-26", 6)          # 26, 27, 28, 31 aug, 1, 2 sep
+
+        adjusted = CorporateActionAdjuster(store).adjust(series)
+
+        assert adjusted.close.tolist() == [25.0, 25.0, 25.0, 100.0, 100.0, 100.0]
+        assert adjusted.volume.tolist() == [4000, 4000, 4000, 1000, 1000, 1000]
+        assert adjusted.wap[0] == 25.0
+        assert adjusted.normalized == True
+        assert series.close[0] == 100.0
+
+    def test_dividend_uses_previous_close(self):
+        """Test dividend: factor 1 - d / close-ul din ziua dinaintea ex-date."""
+        store = CorporateActionStore()
+        store.add_dividend("MSFT", date(2024, 3, 6), 2.0)
+        series = _daily("MSFT", "2024-03-04", 4)           # 4, 5, 6, 7 mar
+
+        price, volume = CorporateActionAdjuster(store).factors(series)
+
+        assert np.allclose(price, [0.98, 0.98, 1.0, 1.0])
+        assert volume.tolist() == [1.0, 1.0, 1.0, 1.0]
+        no_dividends = CorporateActionAdjuster(store, dividends=False).factors(series)[0]
+        assert no_dividends.tolist() == [1.0, 1.0, 1.0, 1.0]
+
+    def test_matches_per_bar_reference(self):
+        """Test: produsul cumulativ vectorizat = calculul bar cu bar."""
+        rng = np.random.default_rng(7)
+        store = CorporateActionStore()
+        series = _daily("AMD", "2015-01-01", 2000)
+        series.close[:] = rng.uniform(20, 200, len(series))
+        days = pd.DatetimeIndex(series.timestamps.view("M8[ns]")).date
+        for i in rng.choice(np.arange(1, len(series)), 12, replace=False):
+            if rng.random() < 0.3:
+                store.add_split("AMD", days[i], float(rng.choice([2, 3, 0.5])))
+            else:
+                store.add_dividend("AMD", days[i], float(rng.uniform(0.1, 1.0)))
+
+        price, volume = CorporateActionAdjuster(store).factors(series)
+
+        expected_price = np.ones(len(series))
+        expected_volume = np.ones(len(series))
+        for action in store.actions("AMD"):
+            before = days < action.ex_date
+            if action.kind == "split":
+                expected_price[before] /= action.value
+                expected_volume[before] *= action.value
+            else:
+                prev_close = series.close[np.flatnonzero(before)[-1]]
+                expected_price[before] *= 1 - action.value / prev_close
+        assert np.allclose(price, expected_price)
+        assert np.allclose(volume, expected_volume)
+
+    def test_split_after_yahoo_history_stored(self):
+        """Test: istoric Yahoo salvat înainte de split → și rândurile Yahoo se ajustează."""
+        store = CorporateActionStore()
+        adjuster = CorporateActionAdjuster(store)
+        history = _daily("AAPL", "2020-08-26", 4, source="YAHOO")
+        assert adjuster.view("AAPL", "1D", lambda: history).close.tolist() == [100.0] * 4
+
+        store.add_split("AAPL", date(2020, 8, 31), 4)
+        adjusted = adjuster.view("AAPL", "1D", lambda: history)
+
+        assert adjusted.close.tolist() == [25.0, 25.0, 25.0, 100.0]
+        assert adjusted.volume.tolist() == [4000, 4000, 4000, 1000]
+
+    def test_views_rebuilt_only_for_changed_symbol(self):
+        """Test cache: raw încărcat o dată; split nou → doar view-ul ajustat al simbolului."""
+        store = CorporateActionStore()
+        adjuster = CorporateActionAdjuster(store)
+        loads = []
+
+        def loader(symbol):
+            def load():
+                loads.append(symbol)
+                return _daily(symbol, "2020-08-26", 6)
+            return load
+
+        aapl = adjuster.view("AAPL", "1D", loader("AAPL"))
+        msft = adjuster.view("MSFT", "1D", loader("MSFT"))
+        assert adjuster.view("AAPL", "1D", loader("AAPL")) is aapl
+
+        store.add_split("AAPL", date(2020, 8, 31), 4)
+        rebuilt = adjuster.view("AAPL", "1D", loader("AAPL"))
+
+        assert rebuilt is not aapl
+        assert rebuilt.close[0] == 25.0
+        assert adjuster.view("AAPL", "1D", loader("AAPL"), adjusted=False).close[0] == 100.0
+        assert adjuster.view("MSFT", "1D", loader("MSFT")) is msft
+        assert loads == ["AAPL", "MSFT"]
+
+        adjuster.invalidate("AAPL")
+        adjuster.view("AAPL", "1D", loader("AAPL"))
+        assert loads == ["AAPL", "MSFT", "AAPL"]
+
+
+class TestCorporateActionStore:
+    """Teste pentru store."""
+
+    def test_persistence_and_versions(self, tmp_path):
+        """Test: salvare/încărcare, versiune nouă doar la modificări."""
+        path = tmp_path / "actions.json"
+        store = CorporateActionStore(str(path))
+        assert store.add_split("AAPL", date(2020, 8, 31), 4) == True
+        version = store.version("AAPL")
+        assert store.update("AAPL", store.actions("AAPL")) == False
+        assert store.version("AAPL") == version
+        store.mark_checked("AAPL")
+        assert store.save() == True
+
+        loaded = CorporateActionStore(str(path))
+        assert loaded.actions("AAPL") == store.actions("AAPL")
+        assert loaded.needs_refresh("AAPL", pd.Timedelta(hours=1)) == False
+        assert loaded.needs_refresh("MSFT", pd.Timedelta(hours=1)) == True
+
+    def test_yahoo_dividends_unadjusted(self):
+        """Test: dividendele Yahoo (ajustate la split-uri ulterioare) revin la suma plătită."""
+        frame = pd.DataFrame(
+            {"Dividends": [0.82, 0.0, 0.205], "Stock Splits": [0.0, 4.0, 0.0]},
+            index=pd.DatetimeIndex(["2020-08-07", "2020-08-31", "2020-11-06"], tz="America/New_York"),
+        )
+
+        actions = actions_from_frame("AAPL", frame)
+
+        assert [(a.ex_date, a.kind, a.value) for a in actions] == [
+            (date(2020, 8, 7), "dividend", 3.28),
+            (date(2020, 8, 31), "split", 4.0),
+            (date(2020, 11, 6), "dividend", 0.205),
+        ]
+
+
+class TestAgentLoadBars:
+    """Test integrare: load_bars din istoricul cumulativ."""
+
+    def test_load_bars_adjusted_and_raw(self, tmp_path):
+        """Test: istoric raw pe disc, view ajustat după un split adăugat."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "ibkr": {"simulator": True, "simulator_options": {"pacing": {}}},
+            "data_collector": {
+                "symbols": ["AAPL"],
+                "timeframe": "1D",
+                "lookback_days": 30,
+                "data_source": "IBKR",
+                "data_dir": str(tmp_path),
+                "output_format": ["json"],
+                "incremental": True,
+                "normalize_splits": True,
+                "corporate_actions": {"refresh": False},
+            },
+        }))
+
+        async def run():
+            agent = DataCollectionAgent(str(config_path))
+            await agent.initialize()
+            await agent.collect_all()
+            await agent.shutdown()
+            return agent
+
+        agent = asyncio.run(run())
+        raw = agent.load_bars("AAPL", adjusted=False)
+        last_day = raw.datetime_index()[-1].date()
+        agent.corporate_actions.add_split("AAPL", last_day, 2)
+        adjusted = agent.load_bars("AAPL")
+
+        assert len(raw) > 10
+        assert np.allclose(adjusted.close[:-1], raw.close[:-1] / 2)
+        assert adjusted.close[-1] == raw.close[-1]
+        assert np.array_equal(adjusted.volume[:-1], raw.volume[:-1] * 2)
@@ -0,0 +1,145 @@
+"""
+Teste pentru CollectionSchedule și CollectorDaemon
+"""
+
+import asyncio
+import time
+
+import pandas as pd
+
+from src.agents.data_collection.daemon import CollectionSchedule, CollectorDaemon
+from src.agents.data_collection.market_calendar import NS, ExchangeCalendar
+
+
+def _ns(text: str) -> int:
+    return pd.Timestamp(text, tz="America/New_York").value
+
+
+class FastSchedule:
+    """Program de test: un moment la fiecare `interval` secunde."""
+
+    timeframe = "1m"
+    delay_ns = 0
+
+    def __init__(self, interval: float):
+        self.interval_ns = int(interval * NS)
+
+    def next_close(self, now_ns: int) -> int:
+        return (now_ns // self.interval_ns + 1) * self.interval_ns
+
+
+class SlowAgent:
+    """Agent fals: collect_all durează `duration` secunde."""
+
+    def __init__(self, duration: float):
+        self.duration = duration
+        self.sources = []
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+
+    async def collect_all(self):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.duration)
+        self.active -= 1
+        return True
+
+
+class TestCollectionSchedule:
+    """Teste pentru momentele de colectare."""
+
+    def test_hourly_rth(self):
+        """Test 1H RTH: după închiderea fiecărui bar, ultima la 16:00, apoi ziua următoare."""
+        schedule = CollectionSchedule(ExchangeCalendar(), "1H", useRTH=True, delay_seconds=5)
+
+        assert schedule.next_run(_ns("2024-03-05 10:00")) == _ns("2024-03-05 10:30:05")
+        assert schedule.next_run(_ns("2024-03-05 10:30:04")) == _ns("2024-03-05 10:30:05")
+        assert schedule.next_run(_ns("2024-03-05 10:30:05")) == _ns("2024-03-05 11:30:05")
+        # Ultimul bar e trunchiat la închidere
+        assert schedule.next_run(_ns("2024-03-05 15:45")) == _ns("2024-03-05 16:00:05")
+        # Vineri seara → luni (sesiunea se deschide la 09:30, primul bar se închide la 10:30)
+        assert schedule.next_run(_ns("2024-03-08 17:00")) == _ns("2024-03-11 10:30:05")
+
+    def test_hourly_ibkr_clock_aligned(self):
+        """Test 1H IBKR: bars la ora fixă → colectare la câteva secunde după fiecare oră."""
+        schedule = CollectionSchedule(ExchangeCalendar(), "1H", useRTH=True, delay_seconds=5, align="clock")
+
+        assert schedule.next_run(_ns("2024-03-05 09:31")) == _ns("2024-03-05 10:00:05")
+        assert schedule.next_run(_ns("2024-03-05 10:00:05")) == _ns("2024-03-05 11:00:05")
+        assert schedule.next_run(_ns("2024-03-05 15:10")) == _ns("2024-03-05 16:00:05")
+        assert schedule.next_run(_ns("2024-03-08 17:00")) == _ns("2024-03-11 10:00:05")
+
+    def test_from_config_uses_source_alignment(self):
+        """Test from_config: sursa IBKR → aliniere 'clock', Yahoo → 'open'."""
+        class ConfiguredAgent(SlowAgent):
+            calendar = ExchangeCalendar()
+
+            def __init__(self, source):
+                super().__init__(0)
+                self.config = {"data_collector": {"data_source": source, "timeframe": "1H"}}
+
+        assert CollectorDaemon.from_config(ConfiguredAgent("IBKR")).schedule.align == "clock"
+        assert CollectorDaemon.from_config(ConfiguredAgent("YAHOO")).schedule.align == "open"
+
+    def test_daily_skips_holidays_and_half_days(self):
+        """Test 1D: la închiderea sesiunii, fără sărbători, 13:00 în zilele scurte."""
+        schedule = CollectionSchedule(ExchangeCalendar(), "1D", delay_seconds=60)
+
+        # 2024-11-28 Thanksgiving (închis), 2024-11-29 zi scurtă
+        assert schedule.next_close(_ns("2024-11-27 17:00")) == _ns("2024-11-29 13:00")
+        assert schedule.next_run(_ns("2024-11-29 13:00:30")) == _ns("2024-11-29 13:01")
+
+
+class TestCollectorDaemon:
+    """Teste pentru bucla daemon-ului."""
+
+    def test_skip_overrun(self):
+        """Test 'skip': rulările nu se suprapun, momentele ratate se sar."""
+        agent = SlowAgent(0.25)
+        daemon = CollectorDaemon(agent, FastSchedule(0.1), overrun="skip", run_on_start=True)
+
+        asyncio.run(daemon.run(max_ticks=6))
+
+        assert agent.max_active == 1
+        assert daemon.skipped >= 3
+        assert daemon.runs == agent.calls
+        assert daemon.runs + daemon.skipped == 7
+
+    def test_coalesce_overrun(self):
+        """Test 'coalesce': momentele ratate devin o singură rulare după cea curentă."""
+        agent = SlowAgent(0.5)
+        daemon = CollectorDaemon(agent, FastSchedule(0.1), overrun="coalesce", run_on_start=True)
+
+        asyncio.run(daemon.run(max_ticks=3))
+
+        # Pornire + 3 momente în timpul primei rulări → o singură rulare în plus
+        assert agent.max_active == 1
+        assert agent.calls == 2
+        assert daemon.coalesced == 2
+
+    def test_stop(self):
+        """Test stop(): bucla se oprește fără să aștepte următorul moment."""
+        agent = SlowAgent(0.0)
+        daemon = CollectorDaemon(agent, FastSchedule(3600), run_on_start=True)
+
+        async def scenario():
+            task = asyncio.create_task(daemon.run())
+            await asyncio.sleep(0.05)
+            daemon.stop()
+            await task
+
+        started = time.monotonic()
+        asyncio.run(scenario())
+
+        assert time.monotonic() - started < 1.0
+        assert agent.calls == 1
+
+    def test_invalid_overrun(self):
+        """Test politică necunoscută."""
+        try:
+            CollectorDaemon(SlowAgent(0), FastSchedule(1), overrun="queue")
+            assert False
+        except ValueError:
+            assert True
@@ -0,0 +1,178 @@
+"""
+Teste pentru SimulatedIB și IBKRDataSource peste simulator
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import yaml
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.sources.ib_simulator import PACING_VIOLATION, SimulatedIB, Stock
+from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+
+
+END = datetime(2026, 1, 16, 21, 0, tzinfo=timezone.utc)
+
+
+class TestSimulatedIB:
+    """Teste pentru SimulatedIB."""
+
+    def test_deterministic_bars(self):
+        """Test: același seed → aceleași bars; ferestre suprapuse coincid."""
+        ib = SimulatedIB(seed=7, pacing={})
+        ib.connect()
+        week = ib.reqHistoricalData(Stock("AAPL", "SMART", "USD"), END, "7 D", "1 hour")
+        day = ib.reqHistoricalData(Stock("AAPL", "SMART", "USD"), END, "1 D", "1 hour")
+        other = SimulatedIB(seed=7, pacing={}).connect().reqHistoricalData(
+            Stock("AAPL", "SMART", "USD"), END, "7 D", "1 hour")
+
+        assert len(week) == 5 * 7
+        assert week == other
+        assert week[-len(day):] == day
+        for bar in week:
+            assert bar.low <= min(bar.open, bar.close) <= max(bar.open, bar.close) <= bar.high
+
+    def test_rth_and_daily_bars(self):
+        """Test: 1m RTH = 390 bars/sesiune; 1 day → date, fără weekend."""
+        ib = SimulatedIB(pacing={}).connect()
+        minutes = ib.reqHistoricalData(Stock("MSFT"), END, "1 D", "1 min", useRTH=True)
+        days = ib.reqHistoricalData(Stock("MSFT"), END, "14 D", "1 day")
+
+        assert len(minutes) == 390
+        assert len(days) == 10
+        assert all(d.date.weekday() < 5 for d in days)
+
+    def test_pacing_violation(self):
+        """Test: request identic în fereastra de 15s → [] + errorEvent 162."""
+        ib = SimulatedIB().connect()
+        errors = []
+        ib.errorEvent += lambda reqId, code, msg, contract: errors.append(code)
+
+        first = ib.reqHistoricalData(Stock("AAPL"), END, "1 D", "1 hour")
+        second = ib.reqHistoricalData(Stock("AAPL"), END, "1 D", "1 hour")
+
+        assert len(first) > 0
+        assert len(second) == 0
+        assert errors == [PACING_VIOLATION]
+        assert ib.stats.pacing_violations == 1
+
+
+class TestIBKRSourceOnSimulator:
+    """Teste pentru IBKRDataSource cu IB simulat."""
+
+    def test_concurrent_fetch_on_one_connection(self):
+        """Test: request-urile async rulează concurent pe o singură conexiune."""
+        async def run():
+            ib = SimulatedIB(latency=0.02, pacing={})
+            source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib)
+            assert await source.connect() == True
+            results = await asyncio.gather(*[
+                source.fetch_historical_series(symbol, "1H", 5) for symbol in ("AAPL", "MSFT", "AMD")
+            ])
+            await source.disconnect()
+            return ib, results
+
+        ib, results = asyncio.run(run())
+        assert ib.stats.max_in_flight == 3
+        for series in results:
+            assert len(series) > 0
+            assert series.count[0] > 0
+            assert series.source == "IBKR"
+
+    def test_request_timeout(self):
+        """Test: request mai lent decât request_timeout → [] la fetch, excepție la fetch_window."""
+        async def run():
+            ib = SimulatedIB(latency=0.5, pacing={})
+            source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib, request_timeout=0.05)
+            await source.connect()
+            bars = await source.fetch_historical_data("AAPL", "1H", 5)
+            try:
+                await source.fetch_window("AAPL", "1H", END, "1 D")
+                raised = False
+            except asyncio.TimeoutError:
+                raised = True
+            return bars, raised, ib.stats.in_flight
+
+        bars, raised, in_flight = asyncio.run(run())
+        assert bars == []
+        assert raised == True
+        assert in_flight == 0
+
+    def test_disconnect_cancels_in_flight(self):
+        """Test: disconnect anulează request-urile în curs fără să anuleze apelantul."""
+        async def run():
+            ib = SimulatedIB(latency=5, pacing={})
+            source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib)
+            await source.connect()
+            fetch = asyncio.create_task(source.fetch_historical_data("AAPL", "1H", 5))
+            await asyncio.sleep(0.01)
+            await source.disconnect()
+            return await asyncio.wait_for(fetch, 1)
+
+        assert asyncio.run(run()) == []
+
+    def test_disconnect_when_stream_cancel_fails(self):
+        """Test: o eroare la anularea unui stream nu lasă conexiunea deschisă."""
+        class FailingCancelIB(SimulatedIB):
+            def cancelHistoricalData(self, bars):
+                raise RuntimeError("cancel failed")
+
+        async def run():
+            ib = FailingCancelIB(pacing={}, stream_interval=0.005)
+            source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib)
+            await source.connect()
+            await source.subscribe("AAPL", "1m")
+            await source.subscribe("MSFT", "1m")
+            return await source.disconnect(), ib, source
+
+        disconnected, ib, source = asyncio.run(run())
+        assert disconnected == True
+        assert ib.isConnected() == False
+        assert source._connected == False
+        assert source._live == {}
+
+    def test_live_updates_on_bus(self):
+        """Test: keepUpToDate publică bars în formare și bars închise pe bus."""
+        async def run():
+            ib = SimulatedIB(pacing={}, stream_interval=0.005, updates_per_bar=2)
+            source = IBKRDataSource("127.0.0.1", 7497, 1, ib=ib)
+            await source.connect()
+            sub = await source.subscribe("AAPL", "1m", closed_only=True)
+            initial = len(source.get_history("AAPL", "1m"))
+            closed = [await asyncio.wait_for(sub.get(), 2) for _ in range(2)]
+            await source.disconnect()
+            return closed, initial, len(source.get_history("AAPL", "1m"))
+
+        closed, initial, final = asyncio.run(run())
+        assert closed[0].closed == True
+        assert closed[0].bar.timestamp < closed[1].bar.timestamp
+        assert final >= initial + 2
+
+    def test_selected_from_config(self, tmp_path):
+        """Test: ibkr.simulator=true → agentul folosește SimulatedIB."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "ibkr": {"simulator": True, "simulator_options": {"seed": 1}},
+            "data_collector": {
+                "symbols": ["AAPL", "MSFT"],
+                "timeframe": "1H",
+                "lookback_days": 5,
+                "data_source": "IBKR",
+                "data_dir": str(tmp_path),
+                "output_format": ["csv"],
+            },
+        }))
+
+        async def run():
+            agent = DataCollectionAgent(str(config_path))
+            assert await agent.initialize() == True
+            ok = await agent.collect_all()
+            source = agent.data_source
+            await agent.shutdown()
+            return ok, source
+
+        ok, source = asyncio.run(run())
+        assert ok == True
+        assert isinstance(source.ib, SimulatedIB)
+        assert len(list(tmp_path.glob("AAPL_1H_*.csv"))) == 1
@@ -0,0 +1,141 @@
+"""
+Teste pentru ExchangeCalendar (sesiuni, sărbători, goluri) și completarea golurilor
+"""
+
+import asyncio
+import json
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.market_calendar import ExchangeCalendar
+from src.common.models.market_data import BarSeries
+
+
+def _series(timestamps, timeframe):
+    n = len(timestamps)
+    return BarSeries(
+        symbol="AAPL", timeframe=timeframe, timestamps=np.asarray(timestamps, dtype=np.int64),
+        open=np.ones(n), high=np.ones(n), low=np.ones(n), close=np.ones(n), volume=np.ones(n, np.int64)
+    )
+
+
+class TestExchangeCalendar:
+    """Teste pentru ExchangeCalendar."""
+
+    def test_holidays_and_half_days(self):
+        """Test: sărbători NYSE calculate, zile scurte, număr de zile de tranzacționare."""
+        calendar = ExchangeCalendar()
+
+        assert date(2024, 3, 29) in calendar.holidays(2024)      # Good Friday
+        assert date(2025, 1, 9) in calendar.holidays(2025)       # închidere specială
+        assert date(2026, 7, 3) in calendar.holidays(2026)       # 4 iulie sâmbătă → vineri
+        assert date(2024, 11, 29) in calendar.half_days(2024)
+        assert date(2026, 7, 3) not in calendar.half_days(2026)
+        assert len(calendar.trading_days(date(2024, 1, 1), date(2024, 12, 31))) == 252
+        assert len(calendar.trading_days(date(2025, 1, 1), date(2025, 12, 31))) == 250
+
+    def test_expected_timestamps_sessions(self):
+        """Test: RTH 78 bars de 5m, zi scurtă 42, ETH 192, zi de sărbătoare 0."""
+        calendar = ExchangeCalendar()
+        day = lambda d: (datetime(2024, 11, d, tzinfo=timezone.utc), datetime(2024, 11, d + 1, tzinfo=timezone.utc))
+
+        assert len(calendar.expected_timestamps(*day(26), "5m")) == 78
+        assert len(calendar.expected_timestamps(*day(29), "5m")) == 42
+        assert len(calendar.expected_timestamps(*day(26), "5m", useRTH=False)) == 192
+        assert len(calendar.expected_timestamps(*day(28), "5m")) == 0
+
+    def test_missing_ranges_intraday(self):
+        """Test: sloturi lipsă consecutive → un interval, inclusiv peste noapte."""
+        calendar = ExchangeCalendar()
+        expected = calendar.expected_timestamps(
+            datetime(2024, 11, 25, tzinfo=timezone.utc), datetime(2024, 11, 27, tzinfo=timezone.utc), "5m")
+        keep = np.ones(len(expected), dtype=bool)
+        keep[10:15] = False
+        keep[76:80] = False        # ultimele 2 bars din 25 + primele 2 din 26
+
+        ranges = calendar.missing_ranges(_series(expected[keep], "5m"))
+
+        assert [r.bars for r in ranges] == [5, 4]
+        assert ranges[1].start == datetime(2024, 11, 25, 20, 50, tzinfo=timezone.utc)
+        assert ranges[1].end == datetime(2024, 11, 26, 14, 40, tzinfo=timezone.utc)
+        assert calendar.missing_ranges(_series(expected, "5m")) == []
+
+    def test_ibkr_clock_aligned_hourly(self):
+        """Test: 1H IBKR (09:30, 10:00, ... 15:00) complet → fără goluri; un bar lipsă e găsit."""
+        calendar = ExchangeCalendar()
+        lo, hi = datetime(2026, 10, 13, tzinfo=timezone.utc), datetime(2026, 10, 15, tzinfo=timezone.utc)
+        ibkr = calendar.expected_timestamps(lo, hi, "1H", align="clock")
+        local = [str(t.time())[:5] for t in pd.DatetimeIndex(ibkr[:7], tz="UTC").tz_convert("America/New_York")]
+
+        assert local == ["09:30", "10:00", "11:00", "12:00", "13:00", "14:00", "15:00"]
+        assert calendar.infer_alignment(ibkr, "1H") == "clock"
+        assert calendar.missing_ranges(_series(ibkr, "1H")) == []
+        ranges = calendar.missing_ranges(_series(np.delete(ibkr, 3), "1H"))
+        assert [(r.start, r.bars) for r in ranges] == [(datetime(2026, 10, 13, 16, 0, tzinfo=timezone.utc), 1)]
+
+    def test_missing_ranges_daily(self):
+        """Test: zilnic comparat pe zile de sesiune (sărbătoarea nu e gol)."""
+        calendar = ExchangeCalendar()
+        days = calendar.trading_days(date(2024, 11, 20), date(2024, 12, 6))
+        present = np.delete(days, [3, 5])          # lipsesc 25 și 27 noiembrie
+        stamps = present.astype("datetime64[ns]").astype(np.int64)
+
+        ranges = calendar.missing_ranges(_series(stamps, "1D"))
+
+        assert [r.bars for r in ranges] == [1, 1]
+        assert ranges[0].start.date() == date(2024, 11, 25)
+        assert ranges[1].start.date() == date(2024, 11, 27)
+
+
+class TestGapFill:
+    """Teste pentru completarea golurilor din istoric (agent + IB simulat)."""
+
+    def test_fill_gaps_fetches_only_holes(self, tmp_path):
+        """Test: golurile din istoric apar în JSON și se descarcă doar ele."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "ibkr": {"simulator": True, "simulator_options": {"seed": 3, "pacing": {}}},
+            "data_collector": {
+                "symbols": ["AAPL"],
+                "timeframe": "1H",
+                "data_source": "IBKR",
+                "data_dir": str(tmp_path),
+                "output_format": ["json"],
+                "incremental": True,
+                "backfill": {"checkpoint_dir": str(tmp_path / "_backfill")},
+            },
+        }))
+        start = datetime(2025, 3, 3, tzinfo=timezone.utc)
+        end = datetime(2025, 3, 8, tzinfo=timezone.utc)
+
+        async def run():
+            agent = DataCollectionAgent(str(config_path))
+            assert await agent.initialize() == True
+            assert await agent.backfill(start, end) == True
+            config = agent.config["data_collector"]
+            full = agent._load_history("AAPL", "1H", config)
+            holed = full[np.r_[0:5, 9:len(full)]]
+            await agent._save_bars("AAPL", holed, config)
+            gaps = agent.find_gaps("AAPL")
+            ib = (await agent.sources.get("IBKR")).ib
+            requests_before = ib.stats.requests
+            ok = await agent.fill_gaps()
+            requests = ib.stats.requests - requests_before
+            after = agent.find_gaps("AAPL")
+            restored = agent._load_history("AAPL", "1H", config)
+            await agent.shutdown()
+            return full, gaps, ok, requests, after, restored
+
+        full, gaps, ok, requests, after, restored = asyncio.run(run())
+        data_quality = json.loads((tmp_path / "AAPL_1H.json").read_text())["metadata"]["data_quality"]
+        assert [r.bars for r in gaps] == [4]
+        assert ok == True
+        assert requests == 1
+        assert after == []
+        assert len(restored) == len(full)
+        assert data_quality["missing_bars"] == 0
+        assert data_quality["missing_ranges"] == []
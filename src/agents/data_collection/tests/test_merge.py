@@ -0,0 +1,89 @@
+"""
+Teste pentru BarMerger
+"""
+
+import asyncio
+
+import numpy as np
+import yaml
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.merge import BarMerger
+from src.common.models.market_data import BarSeries
+
+
+MINUTE = 60 * 1_000_000_000
+
+
+def _series(start, n, source, price, symbol="AAPL"):
+    stamps = (np.arange(n) + start) * MINUTE
+    values = np.full(n, price)
+    return BarSeries(symbol, "1m", stamps, values, values, values, values, np.ones(n, np.int64), source=source)
+
+
+class TestBarMerger:
+    """Teste pentru BarMerger."""
+
+    def test_source_priority(self):
+        """Test: IBKR câștigă față de YAHOO indiferent de ordine; rezultat sortat, fără duplicate."""
+        yahoo = _series(0, 10, "YAHOO", 1.0)
+        ibkr = _series(5, 10, "IBKR", 2.0)
+
+        for inputs in ([yahoo, ibkr], [ibkr, yahoo]):
+            result = BarMerger().merge(inputs)
+            assert len(result.series) == 15
+            assert result.duplicates == 5
+            assert np.all(np.diff(result.series.timestamps) > 0)
+            assert result.series.close.tolist() == [1.0] * 5 + [2.0] * 10
+            assert result.sources.tolist() == ["YAHOO"] * 5 + ["IBKR"] * 10
+            assert result.source_counts() == {"YAHOO": 5, "IBKR": 10}
+
+    def test_same_source_newer_wins(self):
+        """Test: la aceeași sursă câștigă seria dată mai târziu; prioritate configurabilă."""
+        old = _series(0, 4, "YAHOO", 1.0)
+        new = _series(2, 4, "YAHOO", 2.0)
+
+        assert BarMerger().merge([old, new]).series.close.tolist() == [1.0, 1.0, 2.0, 2.0, 2.0, 2.0]
+        reversed_priority = BarMerger(["yahoo", "ibkr"]).merge([_series(0, 2, "YAHOO", 1.0), _series(0, 2, "IBKR", 2.0)])
+        assert reversed_priority.series.close.tolist() == [1.0, 1.0]
+
+    def test_row_sources_and_validation(self):
+        """Test: surse per rând ca intrare; simboluri diferite → ValueError."""
+        history = _series(0, 4, None, 1.0)
+        rows = np.array(["IBKR", "YAHOO", "IBKR", None], dtype=object)
+        result = BarMerger().merge([history, _series(0, 4, "YAHOO", 2.0)], sources=[rows, None])
+
+        assert result.series.close.tolist() == [1.0, 2.0, 1.0, 2.0]
+        assert result.sources.tolist() == ["IBKR", "YAHOO", "IBKR", "YAHOO"]
+        try:
+            BarMerger().merge([_series(0, 2, "IBKR", 1.0), _series(0, 2, "IBKR", 1.0, symbol="MSFT")])
+            raised = False
+        except ValueError:
+            raised = True
+        assert raised == True
+
+    def test_history_keeps_winning_source(self, tmp_path):
+        """Test: istoricul salvat păstrează sursa per rând; un YAHOO nou nu suprascrie IBKR."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "data_collector": {
+                "symbols": ["AAPL"],
+                "timeframe": "1m",
+                "data_dir": str(tmp_path),
+                "output_format": ["json"],
+                "json_compact": True,
+                "incremental": True,
+            },
+        }))
+        agent = DataCollectionAgent(str(config_path))
+        config = agent.config["data_collector"]
+
+        first = agent._merge_history("AAPL", "1m", _series(0, 6, "IBKR", 2.0), config)
+        asyncio.run(agent._save_bars("AAPL", first.series, config, sources=first.sources))
+        second = agent._merge_history("AAPL", "1m", _series(3, 6, "YAHOO", 1.0), config)
+        asyncio.run(agent._save_bars("AAPL", second.series, config, sources=second.sources))
+        history, sources = agent._load_history("AAPL", "1m", config, return_sources=True)
+
+        assert second.duplicates == 3
+        assert history.close.tolist() == [2.0] * 6 + [1.0] * 3
+        assert sources.tolist() == ["IBKR"] * 6 + ["YAHOO"] * 3
@@ -2,10 +2,11 @@
 Teste pentru DataNormalizer
 """
 
+import numpy as np
 import pytest
 import tempfile
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from src.agents.data_collection.normalizer import DataNormalizer
 from src.common.models.market_data import Bar
@@ -107,3 +108,172 @@ class TestDataNormalizer:
         finally:
             if os.path.exists(temp_path):
                 os.remove(temp_path)
+    
+    def test_bars_to_json_compact_roundtrip(self, tmp_path):
+        """Test JSON compact: coloane, fără indentare, citit înapoi identic."""
+        import json
+        from datetime import timezone
+        normalizer = DataNormalizer()
+        normalizer.JSON_CHUNK = 7  # mai multe bucăți per coloană
+        bars = [
+            Bar(
+                timestamp=datetime(2026, 1, 16, 14, 30, tzinfo=timezone.utc) + timedelta(minutes=i),
+                open=150.0 + i, high=151.0 + i, low=149.5 + i, close=150.5 + i, volume=1000 + i,
+                symbol="AAPL", timeframe="1m",
+                count=10 if i % 2 else None, wap=150.2 + i if i % 3 else None,
+                hasGaps=(i % 5 == 0) if i % 4 else None,
+                source="IBKR", normalized=True
+            )
+            for i in range(20)
+        ]
+        compact_path = tmp_path / "compact.json"
+        rows_path = tmp_path / "rows.json"
+        
+        assert normalizer.bars_to_json(bars, str(compact_path), "AAPL", "1m", compact=True) == True
+        assert normalizer.bars_to_json(bars, str(rows_path), "AAPL", "1m") == True
+        
+        data = json.loads(compact_path.read_text())
+        assert data["format"] == "columnar"
+        assert data["period"]["total_bars"] == 20
+        assert len(data["bars"]["close"]) == 20
+        assert data["bars"]["count"][0] is None
+        assert "\n" not in compact_path.read_text()
+        assert compact_path.stat().st_size < rows_path.stat().st_size
+        
+        assert normalizer.json_to_bars(str(compact_path)) == bars
+        assert normalizer.json_to_bars(str(rows_path)) == bars
+        series = normalizer.json_to_series(str(compact_path))
+        assert len(series) == 20
+        assert str(series.tz) == "UTC"
+    
+    def test_loaders_skip_invalid_rows(self, tmp_path):
+        """Test: un rând inconsistent în CSV/JSON se sare, restul istoricului se încarcă."""
+        import json
+        normalizer = DataNormalizer()
+        bars = [
+            Bar(timestamp=datetime(2026, 1, 16, 10) + timedelta(hours=i), open=100.0, high=101.0,
+                low=99.0, close=100.5, volume=1000, symbol="AAPL", timeframe="1H")
+            for i in range(3)
+        ]
+        csv_path = tmp_path / "AAPL.csv"
+        json_path = tmp_path / "AAPL.json"
+        assert normalizer.bars_to_csv(bars, str(csv_path)) == True
+        assert normalizer.bars_to_json(bars, str(json_path), "AAPL", "1H") == True
+        
+        lines = csv_path.read_text().splitlines()
+        lines[2] = lines[2].replace(",100.5,", ",105.0,")   # Close > High
+        csv_path.write_text("\n".join(lines) + "\n")
+        data = json.loads(json_path.read_text())
+        data["bars"][1]["close"] = 105.0
+        json_path.write_text(json.dumps(data))
+        
+        assert [bar.timestamp.hour for bar in normalizer.csv_to_bars(str(csv_path))] == [10, 12]
+        assert len(normalizer.json_to_series(str(json_path))) == 2
+    
+    def test_bars_to_parquet_append(self, tmp_path):
+        """Test export Parquet partiționat cu append și deduplicare."""
+        pytest.importorskip("pyarrow")
+        normalizer = DataNormalizer()
+        
+        def make_bar(day, close):
+            return Bar(
+                timestamp=datetime(2025, 12, 30) + timedelta(days=day),
+                open=150.00,
+                high=152.00,
+                low=149.00,
+                close=close,
+                volume=1000000,
+                symbol="AAPL",
+                timeframe="1D",
+                source="IBKR"
+            )
+        
+        assert normalizer.bars_to_parquet([make_bar(i, 150.5) for i in range(4)], str(tmp_path), "AAPL", "1D") == True
+        # Al doilea export suprapune ultima zi și adaugă una nouă
+        assert normalizer.bars_to_parquet([make_bar(3, 151.5), make_bar(4, 151.0)], str(tmp_path), "AAPL", "1D") == True
+        
+        assert (tmp_path / "symbol=AAPL" / "timeframe=1D" / "year=2025" / "data.parquet").exists()
+        assert (tmp_path / "symbol=AAPL" / "timeframe=1D" / "year=2026" / "data.parquet").exists()
+        
+        df = normalizer.read_parquet(str(tmp_path), symbol="AAPL", timeframe="1D")
+        assert len(df) == 5
+        assert df["close"].tolist() == [150.5, 150.5, 150.5, 151.5, 151.0]
+        assert str(df["open"].dtype) == "float64"
+        assert str(df["volume"].dtype) == "int64"
+        
+        # Column pruning + filtru pe interval
+        df = normalizer.read_parquet(str(tmp_path), symbol="AAPL", columns=["close"], start=datetime(2026, 1, 2))
+        assert list(df.columns) == ["timestamp", "close"]
+        assert len(df) == 2
+    
+    def test_bars_to_parquet_touched_partitions_and_priority(self, tmp_path):
+        """Test Parquet incremental: doar partițiile rândurilor noi se rescriu; duplicatele după source_priority."""
+        pytest.importorskip("pyarrow")
+        from src.common.models.market_data import BarSeries
+        normalizer = DataNormalizer()
+        
+        def make_series(days, close, source):
+            return BarSeries.from_bars([
+                Bar(timestamp=datetime(2025, 12, 30) + timedelta(days=day), open=150.0, high=152.0, low=149.0,
+                    close=close, volume=1000, symbol="AAPL", timeframe="1D", source=source)
+                for day in days
+            ])
+        
+        history = make_series(range(4), 150.5, "IBKR")
+        assert normalizer.bars_to_parquet(history, str(tmp_path), "AAPL", "1D") == True
+        old_partition = tmp_path / "symbol=AAPL" / "timeframe=1D" / "year=2025" / "data.parquet"
+        written_at = old_partition.stat().st_mtime_ns
+        
+        # Istoricul complet + o zi nouă din Yahoo; Yahoo suprapune și o zi IBKR din 2026
+        update = BarSeries.concat([history, make_series([3, 4], 151.0, "YAHOO")])
+        sources = np.array(["IBKR"] * 4 + ["YAHOO"] * 2, dtype=object)
+        changed = make_series([3, 4], 151.0, "YAHOO").timestamps
+        assert normalizer.bars_to_parquet(update, str(tmp_path), "AAPL", "1D", sources=sources, changed=changed) == True
+        
+        assert old_partition.stat().st_mtime_ns == written_at
+        df = normalizer.read_parquet(str(tmp_path), symbol="AAPL", timeframe="1D")
+        assert df["close"].tolist() == [150.5, 150.5, 150.5, 150.5, 151.0]
+        assert df["source"].tolist() == ["IBKR", "IBKR", "IBKR", "IBKR", "YAHOO"]
+    
+    def test_export_all_formats(self, tmp_path, monkeypatch):
+        """Test export: o singură conversie în BarSeries, toate formatele scrise, fără fișiere temporare."""
+        from src.common.models.market_data import BarSeries
+        normalizer = DataNormalizer()
+        bars = [
+            Bar(timestamp=datetime(2026, 1, 16, 10) + timedelta(hours=i), open=150.0, high=151.0,
+                low=149.0, close=150.5, volume=1000, symbol="AAPL", timeframe="1H", source="IBKR")
+            for i in range(5)
+        ]
+        conversions = []
+        original = BarSeries.from_bars.__func__
+        monkeypatch.setattr(BarSeries, "from_bars",
+                            classmethod(lambda cls, *a, **k: conversions.append(1) or original(cls, *a, **k)))
+        
+        results = normalizer.export(bars, str(tmp_path / "AAPL_1H"), ["csv", "json", "xml"], "AAPL", "1H")
+        
+        assert results == {"csv": True, "json": True, "xml": False}
+        assert len(conversions) == 1
+        assert len(normalizer.csv_to_bars(str(tmp_path / "AAPL_1H.csv"))) == 5
+        assert len(normalizer.json_to_bars(str(tmp_path / "AAPL_1H.json"))) == 5
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["AAPL_1H.csv", "AAPL_1H.json"]
+    
+    def test_atomic_write_keeps_old_file(self, tmp_path, monkeypatch):
+        """Test: o scriere eșuată lasă fișierul vechi intact și nu lasă temporare."""
+        normalizer = DataNormalizer()
+        path = tmp_path / "AAPL_1H.json"
+        bars = [
+            Bar(timestamp=datetime(2026, 1, 16, 10) + timedelta(hours=i), open=150.0, high=151.0,
+                low=149.0, close=150.5, volume=1000, symbol="AAPL", timeframe="1H")
+            for i in range(3)
+        ]
+        assert normalizer.bars_to_json(bars, str(path), "AAPL", "1H") == True
+        before = path.read_bytes()
+        
+        def broken(series, name):
+            yield [1]
+            raise RuntimeError("disk full")
+        monkeypatch.setattr(normalizer, "_json_column", broken)
+        
+        assert normalizer.bars_to_json(bars, str(path), "AAPL", "1H", compact=True) == False
+        assert path.read_bytes() == before
+        assert [p.name for p in tmp_path.iterdir()] == ["AAPL_1H.json"]
@@ -0,0 +1,155 @@
+"""
+Teste pentru Resampler
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import numpy as np
+import yaml
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.market_calendar import ExchangeCalendar
+from src.agents.data_collection.normalizer import DataNormalizer
+from src.agents.data_collection.resampler import Resampler
+from src.agents.data_collection.sources.ib_simulator import SimulatedIB
+from src.common.models.market_data import BarSeries, COUNT_MISSING, GAPS_MISSING
+
+
+def _minutes(day_start, day_end, useRTH=True):
+    """Bars de 1m pe sesiunile calendarului, cu valori ușor de verificat."""
+    stamps = ExchangeCalendar().expected_timestamps(day_start, day_end, "1m", useRTH)
+    n = len(stamps)
+    price = 100.0 + np.arange(n) * 0.01
+    return BarSeries(
+        symbol="AAPL", timeframe="1m", timestamps=stamps,
+        open=price, high=price + 0.5, low=price - 0.5, close=price + 0.1,
+        volume=np.full(n, 100, dtype=np.int64), count=np.full(n, 3, dtype=np.int32),
+        wap=price, source="IBKR", tz="America/New_York", normalized=True
+    )
+
+
+class TestResampler:
+    """Teste pentru Resampler."""
+
+    def test_ohlcv_wap_count(self):
+        """Test: 1m → 1H: OHLC, volum, count, WAP ponderat corecte pe primul bar."""
+        series = _minutes(datetime(2024, 11, 26, tzinfo=timezone.utc), datetime(2024, 11, 27, tzinfo=timezone.utc))
+        series.volume[1] = 300
+        series.count[2] = COUNT_MISSING
+        series.wap[3] = np.nan
+        series.has_gaps[:] = GAPS_MISSING
+        series.has_gaps[4] = 1
+
+        hourly = Resampler().resample(series, "1H")
+        first = slice(0, 60)
+        wap_mask = ~np.isnan(series.wap[first])
+        expected_wap = np.average(series.wap[first][wap_mask], weights=series.volume[first][wap_mask])
+
+        assert len(hourly) == 7                      # 09:30 ... 15:30 (ultimul de 30 min)
+        assert hourly.open[0] == series.open[0]
+        assert hourly.close[0] == series.close[59]
+        assert hourly.high[0] == series.high[first].max()
+        assert hourly.low[0] == series.low[first].min()
+        assert hourly.volume[0] == series.volume[first].sum()
+        assert hourly.count[0] == 3 * 59
+        assert np.isclose(hourly.wap[0], expected_wap)
+        assert hourly.has_gaps[0] == 1
+        assert hourly.has_gaps[1] == GAPS_MISSING
+        assert hourly.volume[-1] == 30 * 100
+
+    def test_session_boundaries(self):
+        """Test: bars nu traversează închiderea; zi scurtă; 4H trunchiat; zilnic per sesiune."""
+        series = _minutes(datetime(2024, 11, 26, tzinfo=timezone.utc), datetime(2024, 11, 30, tzinfo=timezone.utc))
+        resampler = Resampler()
+
+        four_hours = resampler.resample(series, "4H")
+        daily = resampler.resample(series, "1D")
+        local = four_hours.datetime_index()
+
+        # 26, 27: 09:30 + 13:30; 29 (zi scurtă, 13:00): doar 09:30; 28 Thanksgiving: nimic
+        assert [(t.day, t.hour, t.minute) for t in local] == [
+            (26, 9, 30), (26, 13, 30), (27, 9, 30), (27, 13, 30), (29, 9, 30)
+        ]
+        assert four_hours.volume[1] == 150 * 100
+        assert four_hours.volume[-1] == 210 * 100
+        assert [t.day for t in daily.datetime_index()] == [26, 27, 29]
+        assert daily.volume.sum() == series.volume.sum()
+
+    def test_invalid_target(self):
+        """Test: timeframe țintă mai mic sau nemultiplu → ValueError; resample_many îl sare."""
+        series = _minutes(datetime(2024, 11, 26, tzinfo=timezone.utc), datetime(2024, 11, 27, tzinfo=timezone.utc))
+        resampler = Resampler()
+        try:
+            resampler.resample(resampler.resample(series, "15m"), "5m")
+            raised = False
+        except ValueError:
+            raised = True
+
+        assert raised == True
+        assert set(resampler.resample_many(series, ["5m", "1m", "1D"])) == {"5m", "1D"}
+
+    def test_collector_derives_timeframes(self, tmp_path):
+        """Test: collector cu 1m + derived_timeframes → un request per simbol, fișiere pentru toate."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "ibkr": {"simulator": True, "simulator_options": {"pacing": {}}},
+            "data_collector": {
+                "symbols": ["AAPL", "MSFT"],
+                "timeframe": "1m",
+                "derived_timeframes": ["5m", "1H", "1D"],
+                "lookback_days": 5,
+                "data_source": "IBKR",
+                "data_dir": str(tmp_path),
+                "output_format": ["csv"],
+            },
+        }))
+
+        async def run():
+            agent = DataCollectionAgent(str(config_path))
+            assert await agent.initialize() == True
+            ok = await agent.collect_all()
+            ib = agent.data_source.ib
+            await agent.shutdown()
+            return ok, ib
+
+        ok, ib = asyncio.run(run())
+        assert ok == True
+        assert isinstance(ib, SimulatedIB)
+        assert ib.stats.requests == 2
+        for timeframe in ("1m", "5m", "1H", "1D"):
+            assert len(list(tmp_path.glob(f"AAPL_{timeframe}_*.csv"))) == 1
+
+    def test_derived_history_kept_apart_and_merged(self, tmp_path):
+        """Test incremental: bars derivate în {tf}_derived, istoricul derivat vechi și cel direct rămân."""
+        old = _minutes(datetime(2020, 3, 2, tzinfo=timezone.utc), datetime(2020, 3, 3, tzinfo=timezone.utc))
+        old_hourly = Resampler().resample(old, "1H")
+        normalizer = DataNormalizer()
+        assert normalizer.bars_to_json(old_hourly, str(tmp_path / "AAPL_1H_derived.json"), "AAPL", "1H") == True
+        (tmp_path / "AAPL_1H.json").write_text("direct 1H history")
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "ibkr": {"simulator": True, "simulator_options": {"pacing": {}}},
+            "data_collector": {
+                "symbols": ["AAPL"],
+                "timeframe": "1m",
+                "derived_timeframes": ["1H"],
+                "lookback_days": 3,
+                "data_source": "IBKR",
+                "data_dir": str(tmp_path),
+                "output_format": ["json"],
+                "incremental": True,
+            },
+        }))
+
+        async def run():
+            agent = DataCollectionAgent(str(config_path))
+            await agent.initialize()
+            await agent.collect_all()
+            await agent.shutdown()
+
+        asyncio.run(run())
+        derived = normalizer.json_to_series(str(tmp_path / "AAPL_1H_derived.json"))
+        assert len(derived) > len(old_hourly)
+        assert np.array_equal(derived.timestamps[:len(old_hourly)], old_hourly.timestamps)
+        assert (tmp_path / "AAPL_1H.json").read_text() == "direct 1H history"
@@ -0,0 +1,76 @@
+"""
+Teste pentru BarRingBuffer și RingBufferStore
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src.agents.data_collection.ring_buffer import BarRingBuffer, RingBufferStore
+from src.common.models.market_data import Bar
+
+
+def _bar(i: int, close: float = 100.0) -> Bar:
+    return Bar(
+        timestamp=datetime(2026, 1, 15, 14, 30, tzinfo=timezone.utc) + timedelta(minutes=i),
+        open=100.0, high=110.0, low=90.0, close=close, volume=100 + i,
+        symbol="AAPL", timeframe="1m", source="IBKR"
+    )
+
+
+class TestBarRingBuffer:
+    """Teste pentru BarRingBuffer."""
+
+    def test_wraps_and_keeps_last_depth(self):
+        """Test: după depășirea capacității rămân ultimele `depth` bars, în ordine."""
+        buffer = BarRingBuffer("AAPL", "1m", depth=4)
+        for i in range(10):
+            buffer.append(_bar(i))
+
+        assert len(buffer) == 4
+        window = buffer.last()
+        assert window.volume.tolist() == [106, 107, 108, 109]
+        assert np.all(np.diff(window.timestamps) > 0)
+        assert window[-1] == _bar(9)
+        assert buffer.last(2).volume.tolist() == [108, 109]
+
+    def test_last_is_zero_copy_view(self):
+        """Test: last(n) întoarce view-uri peste buffer; copy=True le desparte."""
+        buffer = BarRingBuffer("AAPL", "1m", depth=8)
+        for i in range(5):
+            buffer.append(_bar(i))
+
+        view = buffer.last(3)
+        copied = buffer.last(3, copy=True)
+        assert np.shares_memory(view.close, buffer.close)
+        assert not np.shares_memory(copied.close, buffer.close)
+
+    def test_same_timestamp_replaces_last(self):
+        """Test: update-ul bar-ului în formare înlocuiește ultimul bar."""
+        buffer = BarRingBuffer("AAPL", "1m", depth=4)
+        buffer.append(_bar(0, 100.0))
+        buffer.append(_bar(1, 101.0))
+        buffer.append(_bar(1, 102.5))
+
+        assert len(buffer) == 2
+        assert buffer.latest().close == 102.5
+
+    def test_invalid_depth(self):
+        """Test: depth invalid."""
+        with pytest.raises(ValueError):
+            BarRingBuffer("AAPL", "1m", depth=0)
+
+
+class TestRingBufferStore:
+    """Teste pentru RingBufferStore."""
+
+    def test_per_symbol_buffers(self):
+        """Test: un buffer per (simbol, timeframe); simbol necunoscut → serie goală."""
+        store = RingBufferStore(depth=3)
+        for i in range(5):
+            store.append(_bar(i))
+
+        assert ("AAPL", "1m") in store
+        assert len(store.last("AAPL", "1m")) == 3
+        assert len(store.last("MSFT", "1m")) == 0
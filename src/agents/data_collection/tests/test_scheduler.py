@@ -0,0 +1,98 @@
+"""
+Teste pentru RequestScheduler
+"""
+
+import asyncio
+import time
+import pytest
+from src.agents.data_collection.scheduler import TokenBucket, RequestScheduler
+
+
+class TestTokenBucket:
+    """Teste pentru TokenBucket."""
+
+    def test_burst_up_to_capacity(self):
+        """Test: primele `capacity` cereri trec imediat."""
+        async def run():
+            bucket = TokenBucket(capacity=5, period=10)
+            start = time.monotonic()
+            for _ in range(5):
+                await bucket.acquire()
+            return time.monotonic() - start, bucket.available
+
+        elapsed, available = asyncio.run(run())
+        assert elapsed < 0.1
+        assert available == 0
+
+    def test_waits_for_window(self):
+        """Test: cererea peste capacitate așteaptă expirarea ferestrei."""
+        async def run():
+            bucket = TokenBucket(capacity=2, period=0.2)
+            start = time.monotonic()
+            for _ in range(3):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.19
+
+    def test_invalid_capacity(self):
+        """Test: capacitate invalidă."""
+        with pytest.raises(ValueError):
+            TokenBucket(capacity=0, period=1)
+
+
+class TestRequestScheduler:
+    """Teste pentru RequestScheduler."""
+
+    def test_config_overrides_defaults(self):
+        """Test: config-ul suprascrie doar cheile date."""
+        scheduler = RequestScheduler.from_config({"pacing": {"yahoo": {"max_concurrent": 2}}})
+        limits = scheduler.limits_for("YAHOO")
+        assert limits["max_concurrent"] == 2
+        assert limits["max_requests"] == 120
+        assert scheduler.limits_for("IBKR")["max_requests"] == 60
+
+    def test_max_concurrent(self):
+        """Test: numărul de request-uri simultane respectă max_concurrent."""
+        scheduler = RequestScheduler({"YAHOO": {"max_requests": 100, "period_seconds": 1, "max_concurrent": 3}})
+        in_flight = 0
+        peak = 0
+
+        async def request():
+            nonlocal in_flight, peak
+            async with scheduler.slot("YAHOO"):
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        async def run():
+            await asyncio.gather(*[request() for _ in range(12)])
+
+        asyncio.run(run())
+        assert peak == 3
+
+    def test_identical_requests_spaced(self):
+        """Test: request-urile identice sunt distanțate."""
+        scheduler = RequestScheduler({"IBKR": {"identical_interval_seconds": 0.2, "max_concurrent": 5}})
+
+        async def run():
+            start = time.monotonic()
+            for _ in range(2):
+                async with scheduler.slot("IBKR", request_key=("AAPL", "1H")):
+                    pass
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.19
+
+
+    def test_slot_consumes_one_token_per_request(self):
+        """Test: un slot multi-request (download multi-ticker) consumă câte un token per request."""
+        scheduler = RequestScheduler({"YAHOO": {"max_requests": 10, "period_seconds": 60}})
+
+        async def run():
+            async with scheduler.slot("YAHOO", requests=4):
+                pass
+            return scheduler._pacer("YAHOO").bucket.available
+
+        assert asyncio.run(run()) == 6
@@ -0,0 +1,228 @@
+"""
+Teste pentru ConsistentHashRing și ShardedDataSource
+"""
+
+import asyncio
+
+import yaml
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.scheduler import RequestScheduler
+from src.agents.data_collection.sharding import ConsistentHashRing
+from src.agents.data_collection.sources.ib_simulator import SimulatedIB
+from src.agents.data_collection.sources.ibkr_source import IBKRDataSource
+from src.agents.data_collection.sources.sharded_source import ShardedDataSource
+
+
+SYMBOLS = [f"SYM{i:03d}" for i in range(300)]
+
+
+def _shards(n: int):
+    return [IBKRDataSource("127.0.0.1", 7497, k + 1, ib=SimulatedIB(pacing={})) for k in range(n)]
+
+
+class TestConsistentHashRing:
+    """Teste pentru inelul de hash consistent."""
+
+    def test_balanced_and_stable(self):
+        """Test: distribuție echilibrată, aceeași între instanțe."""
+        groups = ConsistentHashRing(range(4)).assign(SYMBOLS)
+
+        assert sorted(groups) == [0, 1, 2, 3]
+        assert sum(len(g) for g in groups.values()) == len(SYMBOLS)
+        assert all(40 <= len(g) <= 110 for g in groups.values())
+        assert ConsistentHashRing(range(4)).assign(SYMBOLS) == groups
+        assert all(ConsistentHashRing(range(4)).node_for(s) == n for n, g in groups.items() for s in g)
+
+    def test_adding_node_moves_few_keys(self):
+        """Test: a 5-a conexiune preia ~1/5 din simboluri, restul rămân pe loc."""
+        before = ConsistentHashRing(range(4))
+        after = ConsistentHashRing(range(5))
+
+        moved = [s for s in SYMBOLS if before.node_for(s) != after.node_for(s)]
+
+        assert all(after.node_for(s) == 4 for s in moved)
+        assert 0.1 * len(SYMBOLS) < len(moved) < 0.35 * len(SYMBOLS)
+
+    def test_empty_ring(self):
+        """Test: inel fără noduri."""
+        try:
+            ConsistentHashRing([])
+            assert False
+        except ValueError:
+            assert True
+
+
+class TestShardedDataSource:
+    """Teste pentru rutarea pe conexiuni."""
+
+    def test_routes_symbols_to_their_shard(self):
+        """Test: fiecare conexiune califică și descarcă doar simbolurile ei."""
+        async def run():
+            source = ShardedDataSource(_shards(3))
+            await source.connect()
+            symbols = SYMBOLS[:12]
+            await source.prepare(symbols)
+            results = await asyncio.gather(*[source.fetch_historical_series(s, "1H", 2) for s in symbols])
+            groups = source.assign(symbols)
+            await source.disconnect()
+            return source, symbols, results, groups
+
+        source, symbols, results, groups = asyncio.run(run())
+        assert all(len(series) > 0 and series.source == "IBKR" for series in results)
+        for index, shard in enumerate(source.shards):
+            assert shard.ib.stats.requests == len(groups.get(index, []))
+            assert shard.ib.stats.contracts_qualified == len(groups.get(index, []))
+        assert source.pacing_key(symbols[0]) == f"IBKR#{source.shard_index(symbols[0])}"
+
+    def test_failed_shard_leaves_ring(self):
+        """Test: o conexiune care nu se conectează iese din inel."""
+        async def run():
+            shards = _shards(3)
+
+            async def refuse():
+                return False
+            shards[1].connect = refuse
+            source = ShardedDataSource(shards)
+            ok = await source.connect()
+            return ok, source
+
+        ok, source = asyncio.run(run())
+        assert ok == True
+        assert {source.shard_index(s) for s in SYMBOLS} == {0, 2}
+
+    def test_failed_shard_reconnects(self):
+        """Test: is_healthy() reconectează conexiunea căzută (după retry_after) și o readuce în inel."""
+        async def run():
+            shards = _shards(3)
+            original = shards[1].connect
+            attempts = []
+
+            async def flaky():
+                attempts.append(1)
+                return len(attempts) > 1 and await original()
+            shards[1].connect = flaky
+            throttled = ShardedDataSource(shards, retry_after=3600)
+            await throttled.connect()
+            throttled_healthy = await throttled.is_healthy()
+            throttled_nodes = {throttled.shard_index(s) for s in SYMBOLS}
+
+            source = ShardedDataSource(shards, retry_after=0)
+            attempts.clear()
+            await source.connect()
+            before = {source.shard_index(s) for s in SYMBOLS}
+            healthy = await source.is_healthy()
+            after = {source.shard_index(s) for s in SYMBOLS}
+            await source.disconnect()
+            return throttled_healthy, throttled_nodes, healthy, before, after, len(attempts)
+
+        throttled_healthy, throttled_nodes, healthy, before, after, attempts = asyncio.run(run())
+        assert throttled_healthy == True
+        assert throttled_nodes == {0, 2}
+        assert healthy == True
+        assert before == {0, 2}
+        assert after == {0, 1, 2}
+        assert attempts == 2
+
+    def test_live_streams_follow_shard(self):
+        """Test: stream-ul trece pe altă conexiune când a lui cade și revine când se reconectează."""
+        async def run():
+            source = ShardedDataSource(_shards(3), retry_after=3600)
+            await source.connect()
+            symbol = SYMBOLS[0]
+            owner = source.shard_index(symbol)
+            sub = await source.subscribe(symbol, "1m")
+            started = (symbol, "1m") in source.shards[owner]._live
+
+            shard = source.shards[owner]
+            original = shard.connect
+
+            async def refuse():
+                return False
+            shard.connect = refuse
+            shard.ib.disconnect()
+            await source.is_healthy()
+            fallback = source.shard_index(symbol)
+            moved = (symbol, "1m") in source.shards[fallback]._live
+
+            shard.connect = original
+            source.retry_after = 0
+            await source.is_healthy()
+            back = ((symbol, "1m") in source.shards[owner]._live,
+                    (symbol, "1m") in source.shards[fallback]._live)
+            await source.disconnect()
+            return sub, started, owner, fallback, moved, back
+
+        sub, started, owner, fallback, moved, back = asyncio.run(run())
+        assert sub is not None
+        assert started == True
+        assert fallback != owner
+        assert moved == True
+        assert back == (True, False)
+
+    def test_pacing_per_connection(self):
+        """Test: conexiunile au pacer separat, cu limitele sursei."""
+        scheduler = RequestScheduler({"IBKR": {"max_requests": 7}})
+
+        assert scheduler.limits_for("IBKR#3")["max_requests"] == 7
+        assert scheduler._pacer("IBKR#0") is not scheduler._pacer("IBKR#1")
+
+    def test_batched_fetch_paced_per_connection(self, tmp_path):
+        """Test: fetch-ul batch grupează simbolurile pe conexiune și ia slotul conexiunii."""
+        keys = []
+
+        class RecordingScheduler(RequestScheduler):
+            def slot(self, source, request_key=None, contract_key=None, requests=1):
+                keys.append((source, request_key[0]))
+                assert requests == len(request_key[0])
+                return super().slot(source, request_key, contract_key, requests)
+
+        async def run():
+            source = ShardedDataSource(_shards(3))
+            source.supports_batch = True
+            source.batch_size = 50
+            await source.connect()
+            config_path = tmp_path / "config.yaml"
+            config_path.write_text(yaml.safe_dump({"data_collector": {"data_dir": str(tmp_path)}}))
+            agent = DataCollectionAgent(str(config_path))
+            agent.scheduler = RecordingScheduler({})
+            symbols = SYMBOLS[:12]
+            results = await agent._fetch_batched(source, symbols, "1H", {s: 2 for s in symbols}, True)
+            await source.disconnect()
+            return source, symbols, results
+
+        source, symbols, results = asyncio.run(run())
+        assert sorted(results) == sorted(symbols)
+        assert len(keys) == len(source.assign(symbols))
+        for key, chunk in keys:
+            assert {source.pacing_key(s) for s in chunk} == {key}
+
+    def test_agent_builds_sharded_ibkr(self, tmp_path):
+        """Test: ibkr.connections > 1 → colectare pe mai multe clientId-uri."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "ibkr": {"simulator": True, "simulator_options": {"pacing": {}}, "clientId": 10, "connections": 3},
+            "data_collector": {
+                "symbols": SYMBOLS[:9],
+                "timeframe": "1H",
+                "lookback_days": 2,
+                "data_source": "IBKR",
+                "data_dir": str(tmp_path),
+                "output_format": ["csv"],
+            },
+        }))
+
+        async def run():
+            agent = DataCollectionAgent(str(config_path))
+            await agent.initialize()
+            ok = await agent.collect_all()
+            source = agent.data_source
+            await agent.shutdown()
+            return ok, source
+
+        ok, source = asyncio.run(run())
+        assert ok == True
+        assert isinstance(source, ShardedDataSource)
+        assert [shard.clientId for shard in source.shards] == [10, 11, 12]
+        assert sum(shard.ib.stats.requests for shard in source.shards) == 9
+        assert len(list(tmp_path.glob("*_1H_*.csv"))) == 9
@@ -0,0 +1,133 @@
+"""
+Teste pentru SourcePool
+"""
+
+import asyncio
+from typing import List, Optional
+
+from src.agents.data_collection.sources.base_source import BaseDataSource
+from src.agents.data_collection.sources.pool import SourcePool
+from src.common.models.market_data import Bar
+
+
+class CountingSource(BaseDataSource):
+    """Sursă falsă care numără conectările."""
+
+    def __init__(self, connect_ok: bool = True):
+        self.connect_ok = connect_ok
+        self.connects = 0
+        self.disconnects = 0
+        self.stream_ok = True
+        self.streams_started = []
+        self._connected = False
+
+    async def connect(self) -> bool:
+        self.connects += 1
+        self._connected = self.connect_ok
+        return self.connect_ok
+
+    async def disconnect(self) -> bool:
+        self.disconnects += 1
+        self._connected = False
+        return True
+
+    async def fetch_historical_data(self, symbol, timeframe, lookback_days, useRTH=True) -> List[Bar]:
+        return []
+
+    async def subscribe_to_bars(self, symbol, timeframe) -> bool:
+        if not (self._connected and self.stream_ok):
+            return False
+        self.streams_started.append((symbol, timeframe))
+        return True
+
+    def get_latest_bar(self, symbol) -> Optional[Bar]:
+        return None
+
+
+class TestSourcePool:
+    """Teste pentru SourcePool."""
+
+    def test_lazy_connect_once(self):
+        """Test: sursa se conectează o singură dată pentru cereri concurente."""
+        created = []
+
+        def factory(name):
+            created.append(name)
+            return CountingSource()
+
+        pool = SourcePool(factory)
+
+        async def run():
+            sources = await asyncio.gather(*[pool.get("ibkr") for _ in range(10)])
+            return sources, await pool.health_check()
+
+        sources, health = asyncio.run(run())
+        assert created == ["IBKR"]
+        assert all(s is sources[0] for s in sources)
+        assert sources[0].connects == 1
+        assert health == {"IBKR": True}
+
+    def test_reconnect_when_unhealthy(self):
+        """Test: o sursă deconectată se reconectează la următorul get()."""
+        pool = SourcePool(lambda name: CountingSource())
+
+        async def run():
+            source = await pool.get("YAHOO")
+            source._connected = False
+            again = await pool.get("YAHOO")
+            return source, again
+
+        source, again = asyncio.run(run())
+        assert again is source
+        assert source.connects == 2
+
+    def test_failed_connect_backoff_and_close(self):
+        """Test: după o conectare eșuată nu se reîncearcă imediat; close_all deconectează."""
+        failing = CountingSource(connect_ok=False)
+        pool = SourcePool(lambda name: failing if name == "IBKR" else CountingSource(), retry_after=60)
+
+        async def run():
+            first = await pool.get("IBKR")
+            second = await pool.get("IBKR")
+            yahoo = await pool.get("YAHOO")
+            closed = await pool.close_all()
+            return first, second, yahoo, closed
+
+        first, second, yahoo, closed = asyncio.run(run())
+        assert first is None and second is None
+        assert failing.connects == 1
+        assert closed == True
+        assert yahoo.disconnects == 1
+
+    def test_failed_stream_not_recorded(self):
+        """Test: un stream care nu pornește întoarce None și se reîncearcă la următorul subscribe."""
+        async def run():
+            source = CountingSource()
+            await source.connect()
+            source.stream_ok = False
+            failed = await source.subscribe("AAPL", "1m")
+            source.stream_ok = True
+            sub = await source.subscribe("AAPL", "1m")
+            return source, failed, sub
+
+        source, failed, sub = asyncio.run(run())
+        assert failed is None
+        assert sub is not None
+        assert source.streams_started == [("AAPL", "1m")]
+        assert len(source.bus._subs[("AAPL", "1m")]) == 1
+
+    def test_reconnect_restarts_streams(self):
+        """Test: după reconectarea din pool, stream-urile live înregistrate repornesc."""
+        pool = SourcePool(lambda name: CountingSource())
+
+        async def run():
+            source = await pool.get("IBKR")
+            await source.subscribe("AAPL", "1m")
+            await source.subscribe("MSFT", "5m")
+            source._connected = False
+            await pool.get("IBKR")
+            return source
+
+        source = asyncio.run(run())
+        assert source.connects == 2
+        assert sorted(source.streams_started) == [("AAPL", "1m"), ("AAPL", "1m"), ("MSFT", "5m"), ("MSFT", "5m")]
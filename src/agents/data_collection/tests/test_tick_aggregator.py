@@ -0,0 +1,143 @@
+"""
+Teste pentru TickBarAggregator
+"""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from src.agents.data_collection.bus import BarBus
+from src.agents.data_collection.market_calendar import NS, ExchangeCalendar
+from src.agents.data_collection.tick_aggregator import MIDPOINT, TickBarAggregator
+from src.common.models.market_data import Quote, Tick
+
+
+def _ns(text: str) -> int:
+    return pd.Timestamp(text, tz="America/New_York").value
+
+
+def _dt(text: str) -> datetime:
+    return pd.Timestamp(text, tz="America/New_York").to_pydatetime()
+
+
+class TestTickBarAggregator:
+    """Teste pentru agregarea tick → bar."""
+
+    def test_ohlc_vwap_count_match_reference(self):
+        """Test: OHLCV, VWAP și count identice cu agregarea numpy pe sloturi."""
+        rng = np.random.default_rng(3)
+        n = 5000
+        stamps = np.sort(rng.integers(0, 10 * 60 * NS, n)) + _ns("2024-03-05 10:00")
+        prices = np.round(50 + rng.normal(0, 0.5, n), 2)
+        sizes = rng.integers(1, 300, n)
+        bars = []
+        aggregator = TickBarAggregator("1m", on_bar=bars.append)
+
+        for ts, price, size in zip(stamps.tolist(), prices.tolist(), sizes.tolist()):
+            aggregator.add("AAPL", ts, price, size)
+        aggregator.flush()
+
+        slots = stamps // (60 * NS)
+        assert len(bars) == len(np.unique(slots))
+        for bar, slot in zip(bars, np.unique(slots)):
+            mask = slots == slot
+            assert bar.timestamp == datetime.fromtimestamp(int(slot) * 60, tz=timezone.utc)
+            assert bar.open == prices[mask][0]
+            assert bar.close == prices[mask][-1]
+            assert bar.high == prices[mask].max()
+            assert bar.low == prices[mask].min()
+            assert bar.volume == sizes[mask].sum()
+            assert bar.count == mask.sum()
+            assert abs(bar.wap - (prices[mask] * sizes[mask]).sum() / sizes[mask].sum()) < 1e-9
+
+    def test_emits_exactly_at_close(self):
+        """Test: bar-ul se emite la primul tick de la sfârșitul slotului, nu înainte."""
+        aggregator = TickBarAggregator("5m")
+        start = _ns("2024-03-05 10:00")
+
+        assert aggregator.add("AAPL", start, 10.0, 100) is None
+        assert aggregator.add("AAPL", start + 5 * 60 * NS - 1, 11.0, 100) is None
+        closed = aggregator.add("AAPL", start + 5 * 60 * NS, 12.0, 100)
+
+        assert closed.close == 11.0
+        assert closed.volume == 200
+        assert aggregator.current("AAPL").open == 12.0
+
+    def test_session_slots_and_outside_ticks(self):
+        """Test calendar: 1H aliniat la 09:30, ultimul bar 15:30-16:00, pre-market ignorat."""
+        aggregator = TickBarAggregator("1H", calendar=ExchangeCalendar(), tz=ZoneInfo("America/New_York"))
+
+        assert aggregator.add("AAPL", _ns("2024-03-05 09:00"), 10.0, 1) is None
+        aggregator.add("AAPL", _ns("2024-03-05 09:45"), 10.0, 1)
+        first = aggregator.add("AAPL", _ns("2024-03-05 15:50"), 11.0, 1)
+        last = aggregator.add("AAPL", _ns("2024-03-05 16:05"), 12.0, 1)
+
+        assert aggregator.outside_session == 2
+        assert first.timestamp == _dt("2024-03-05 09:30")
+        assert last.timestamp == _dt("2024-03-05 15:30")
+        assert aggregator.current("AAPL") is None
+
+    def test_advance_closes_idle_symbols(self):
+        """Test advance(): simbolurile fără tick-uri noi se închid la sfârșitul slotului."""
+        bus = BarBus()
+        sub = bus.subscribe("MSFT", "1m", closed_only=True)
+        aggregator = TickBarAggregator("1m", bus=bus)
+        start = _ns("2024-03-05 10:00")
+        aggregator.add("AAPL", start + 10 * NS, 10.0, 1)
+        aggregator.add("MSFT", start + 20 * NS, 20.0, 1)
+        aggregator.add("AAPL", start + 70 * NS, 10.5, 1)
+
+        assert aggregator.next_close() == start + 60 * NS
+        assert [bar.symbol for bar in aggregator.advance(start + 60 * NS - 1)] == []
+        closed = aggregator.advance(start + 60 * NS)
+
+        assert [bar.symbol for bar in closed] == ["MSFT"]
+        assert len(sub) == 1
+        assert aggregator.next_close() == start + 120 * NS
+
+    def test_late_ticks_and_naive_timestamps(self):
+        """Test: tick-uri întârziate ignorate; timestamp naive = UTC."""
+        aggregator = TickBarAggregator("1m")
+        base = datetime(2024, 3, 5, 15, 0)
+
+        aggregator.add_tick(Tick(base + timedelta(seconds=61), "AAPL", 10.0, 5))
+        assert aggregator.add_tick(Tick(base + timedelta(seconds=30), "AAPL", 99.0, 5)) is None
+
+        bar = aggregator.flush()[0]
+        assert aggregator.late_ticks == 1
+        assert bar.timestamp == datetime(2024, 3, 5, 15, 1, tzinfo=timezone.utc)
+        assert bar.high == 10.0
+
+    def test_late_tick_after_advance(self):
+        """Test: tick din slotul închis de advance() nu deschide un bar duplicat."""
+        emitted = []
+        aggregator = TickBarAggregator("1m", on_bar=emitted.append)
+        start = _ns("2024-03-05 10:00")
+        aggregator.add("AAPL", start + 10 * NS, 10.0, 1)
+        aggregator.advance(start + 61 * NS)
+
+        assert aggregator.add("AAPL", start + 50 * NS, 11.0, 1) is None
+        assert aggregator.current("AAPL") is None
+        assert aggregator.late_ticks == 1
+
+        aggregator.add("AAPL", start + 70 * NS, 12.0, 1)
+        aggregator.flush()
+        assert [bar.timestamp for bar in emitted] == [_dt("2024-03-05 10:00"), _dt("2024-03-05 10:01")]
+
+    def test_quotes(self):
+        """Test quotes: bars MIDPOINT din bid/ask; la TRADES doar închid bar-ul expirat."""
+        midpoint = TickBarAggregator("1m", what=MIDPOINT)
+        t0 = datetime(2024, 3, 5, 15, 0, 5, tzinfo=timezone.utc)
+        midpoint.add_quote(Quote(t0, "AAPL", 10.0, 10.2, 100, 100))
+        midpoint.add_quote(Quote(t0 + timedelta(seconds=10), "AAPL", 10.4, 10.6, 100, 100))
+        bar = midpoint.flush()[0]
+        assert (bar.open, bar.high, bar.close, bar.volume, bar.wap) == (10.1, 10.5, 10.5, 0, None)
+
+        trades = TickBarAggregator("1m")
+        trades.add_tick(Tick(t0, "AAPL", 10.0, 5))
+        assert trades.add_quote(Quote(t0 + timedelta(seconds=10), "AAPL", 9.0, 11.0, 1, 1)) is None
+        closed = trades.add_quote(Quote(t0 + timedelta(seconds=60), "AAPL", 9.0, 11.0, 1, 1))
+        assert closed.close == 10.0
+        assert trades.last_quote("AAPL").ask == 11.0
@@ -3,6 +3,8 @@ Teste pentru DataValidator
 """
 
 import pytest
+import numpy as np
+import pandas as pd
 from datetime import datetime
 from src.agents.data_collection.validator import DataValidator
 from src.common.models.market_data import Bar
@@ -110,3 +112,46 @@ class TestDataValidator:
         valid_count, invalid_count = validator.validate_bars(bars)
         assert valid_count == 1
         assert invalid_count == 1
+    
+    def test_validate_frame(self):
+        """Test validare vectorizată pe coloane."""
+        validator = DataValidator()
+        
+        df = pd.DataFrame({
+            "open":   [150.0, 150.0, 0.0,   150.0, 150.0],
+            "high":   [151.0, 150.0, 151.0, 151.0, 151.0],
+            "low":    [149.0, 149.0, 149.0, 149.0, 149.0],
+            "close":  [150.5, 150.5, 150.5, 150.5, 150.5],
+            "volume": [1000,  1000,  1000,  -5,    1000],
+            "wap":    [150.2, np.nan, 150.2, 150.2, 0.0],
+            "count":  [400,   400,   400,   400,   400],
+        })
+        
+        result = validator.validate_frame(df, "AAPL")
+        assert result.mask.tolist() == [True, False, False, False, False]
+        assert result.valid_count == 1
+        assert result.invalid_count == 4
+        assert result.counts["high_below_open_close"] == 1
+        assert result.counts["price_not_positive"] == 1
+        assert result.counts["negative_volume"] == 1
+        assert result.counts["invalid_wap"] == 1
+        assert result.counts["invalid_count"] == 0
+    
+    def test_validate_frame_matches_validate_bars(self):
+        """Test: validate_frame dă aceleași rezultate ca validate_bars."""
+        validator = DataValidator()
+        
+        bars = [
+            Bar(timestamp=datetime.now(), open=150.0, high=151.0, low=149.0, close=150.5, volume=1000, wap=150.1, count=10),
+            Bar(timestamp=datetime.now(), open=150.0, high=151.0, low=149.0, close=150.5, volume=1000, count=10),
+            Bar(timestamp=datetime.now(), open=150.0, high=151.0, low=149.0, close=150.5, volume=1000, count=0),
+        ]
+        bars[1].low = 150.2  # > min(open, close)
+        
+        columns = {
+            name: np.array([getattr(b, name) if getattr(b, name) is not None else np.nan for b in bars], dtype=float)
+            for name in ("open", "high", "low", "close", "volume", "wap", "count")
+        }
+        
+        result = validator.validate_frame(columns)
+        assert (result.valid_count, result.invalid_count) == validator.validate_bars(bars)
@@ -0,0 +1,118 @@
+"""
+Teste pentru WatermarkStore și colectarea incrementală
+"""
+
+import asyncio
+import yaml
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from src.agents.data_collection.agent import DataCollectionAgent
+from src.agents.data_collection.sources.base_source import BaseDataSource
+from src.agents.data_collection.watermark import WatermarkStore
+from src.common.models.market_data import Bar
+
+
+class FakeSource(BaseDataSource):
+    """Sursă falsă: întoarce bars zilnice până la `end`."""
+
+    name = "FAKE"
+
+    def __init__(self, end: datetime):
+        self.end = end
+        self.requests = []
+
+    async def connect(self) -> bool:
+        return True
+
+    async def disconnect(self) -> bool:
+        return True
+
+    async def fetch_historical_data(self, symbol, timeframe, lookback_days, useRTH=True) -> List[Bar]:
+        self.requests.append(lookback_days)
+        return [
+            Bar(
+                timestamp=self.end - timedelta(days=i),
+                open=100.0, high=101.0, low=99.0, close=100.5, volume=1000,
+                symbol=symbol, timeframe=timeframe, source="FAKE"
+            )
+            for i in reversed(range(lookback_days))
+        ]
+
+    async def subscribe_to_bars(self, symbol, timeframe) -> None:
+        pass
+
+    def get_latest_bar(self, symbol) -> Optional[Bar]:
+        return None
+
+
+class TestWatermarkStore:
+    """Teste pentru WatermarkStore."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test salvare și reîncărcare watermark."""
+        path = tmp_path / "watermarks.json"
+        ts = datetime(2026, 1, 17, 15, 0, tzinfo=timezone.utc)
+
+        store = WatermarkStore(str(path))
+        assert store.get("AAPL", "1H") is None
+        store.set("AAPL", "1H", ts)
+        assert store.save() == True
+
+        reloaded = WatermarkStore(str(path))
+        assert reloaded.get("AAPL", "1H") == ts
+        assert reloaded.get("AAPL", "1D") is None
+
+
+class TestIncrementalCollection:
+    """Teste pentru modul incremental al DataCollectionAgent."""
+
+    def _agent(self, tmp_path, source):
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(yaml.safe_dump({
+            "data_collector": {
+                "symbols": ["AAPL"],
+                "timeframe": "1D",
+                "lookback_days": 30,
+                "data_dir": str(tmp_path),
+                "output_format": ["csv", "json"],
+                "incremental": True,
+            }
+        }))
+        agent = DataCollectionAgent(str(config_path))
+        agent.data_source = source
+        return agent
+
+    def test_second_run_fetches_only_new_bars(self, tmp_path):
+        """Test: a doua rulare cere doar zilele de după watermark și extinde istoricul."""
+        end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        first_end = end - timedelta(days=2)
+
+        agent = self._agent(tmp_path, FakeSource(first_end))
+        assert asyncio.run(agent.collect_all()) == True
+        assert agent.watermarks.get("AAPL", "1D") == first_end
+
+        source = FakeSource(end)
+        agent = self._agent(tmp_path, source)
+        assert asyncio.run(agent.collect_all()) == True
+
+        assert source.requests[0] < 30
+        history = agent.normalizer.json_to_bars(str(tmp_path / "AAPL_1D.json"))
+        assert len(history) == 32
+        assert history[-1].timestamp == end
+        assert agent.watermarks.get("AAPL", "1D") == end
+
+    def test_unreadable_history_not_overwritten(self, tmp_path):
+        """Test: istoric existent dar ilizibil + watermark → eroare, fișierele rămân neatinse."""
+        end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        agent = self._agent(tmp_path, FakeSource(end - timedelta(days=2)))
+        assert asyncio.run(agent.collect_all()) == True
+
+        (tmp_path / "AAPL_1D.json").write_text("{corrupt")
+        (tmp_path / "AAPL_1D.csv").write_text("garbage\n")
+        agent = self._agent(tmp_path, FakeSource(end))
+
+        asyncio.run(agent.collect_all())
+        assert (tmp_path / "AAPL_1D.json").read_text() == "{corrupt"
+        assert (tmp_path / "AAPL_1D.csv").read_text() == "garbage\n"
+        assert agent.watermarks.get("AAPL", "1D") == end - timedelta(days=2)
@@ -0,0 +1,122 @@
+"""
+Teste pentru YahooDataSource (conversie fără rețea)
+"""
+
+import asyncio
+import numpy as np
+import pandas as pd
+import pytest
+from src.agents.data_collection.sources import yahoo_source
+from src.agents.data_collection.sources.yahoo_source import YahooDataSource
+
+
+@pytest.fixture
+def source(monkeypatch):
+    """YahooDataSource fără yfinance instalat (conversia nu face request-uri)."""
+    monkeypatch.setattr(yahoo_source, "YAHOO_AVAILABLE", True)
+    return YahooDataSource()
+
+
+class TestYahooConversion:
+    """Teste pentru conversia vectorizată DataFrame → BarSeries."""
+    
+    def _history(self):
+        index = pd.date_range("2026-01-16 09:30", periods=3, freq="1h", tz="America/New_York")
+        return pd.DataFrame({
+            "Open": [150.004, 151.126, np.nan],
+            "High": [151.5, 152.0, np.nan],
+            "Low": [149.9, 150.8, np.nan],
+            "Close": [151.2, 151.9, np.nan],
+            "Volume": [1000.0, 2000.0, np.nan],
+        }, index=index)
+    
+    def test_frame_to_series(self, source):
+        """Test rotunjire, cast-uri și timezone pe coloane."""
+        series = source._frame_to_series(self._history(), "AAPL", "1H")
+        
+        assert len(series) == 2  # rândul fără preț e ignorat
+        assert series.open.tolist() == [150.0, 151.13]
+        assert series.volume.dtype == np.int64
+        assert series.source == "YAHOO"
+        
+        bars = series.to_bars()
+        assert bars[0].timestamp == pd.Timestamp("2026-01-16 09:30", tz="America/New_York").to_pydatetime()
+        assert bars[0].symbol == "AAPL"
+        assert bars[0].count is None
+        assert bars[0].normalized == True
+    
+    def test_inconsistent_rows_dropped(self, source):
+        """Test: rândurile care nu ar trece Bar(...) (ex: Close > High) nu ajung în serie."""
+        hist = self._history()
+        hist.loc[hist.index[1], "Close"] = 153.0
+        
+        series = source._frame_to_series(hist, "AAPL", "1H")
+        
+        assert len(series) == 1
+        assert series.close.tolist() == [151.2]
+    
+    def test_split_adjustment_undone(self, source):
+        """Test: prețurile Yahoo ajustate la un split din perioadă revin la valorile raw."""
+        index = pd.date_range("2020-08-27", periods=3, freq="1D", tz="America/New_York")
+        hist = pd.DataFrame({
+            "Open": [125.0, 125.0, 127.0],
+            "High": [126.0, 126.0, 128.0],
+            "Low": [124.0, 124.0, 126.0],
+            "Close": [125.5, 125.5, 127.5],
+            "Volume": [4000.0, 4000.0, 1000.0],
+            "Dividends": [0.0, 0.0, 0.0],
+            "Stock Splits": [0.0, 0.0, 4.0],
+        }, index=index)
+        
+        series = source._frame_to_series(hist, "AAPL", "1D")
+        
+        assert series.close.tolist() == [502.0, 502.0, 127.5]
+        assert series.volume.tolist() == [1000, 1000, 1000]
+
+
+class TestYahooBatch:
+    """Teste pentru download-ul multi-simbol."""
+    
+    def test_fetch_historical_batch(self, source, monkeypatch):
+        """Test: un request per grup, rezultat împărțit pe simboluri."""
+        index = pd.date_range("2026-01-12", periods=3, freq="1D", tz="America/New_York")
+        calls = []
+        
+        def fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            frames = {}
+            for i, ticker in enumerate(tickers):
+                frames[ticker] = pd.DataFrame({
+                    "Open": [100.0 + i] * 3,
+                    "High": [101.0 + i] * 3,
+                    "Low": [99.0 + i] * 3,
+                    "Close": [100.5 + i] * 3,
+                    "Volume": [1000] * 3,
+                }, index=index)
+            data = pd.concat(frames, axis=1)
+            # Simbolul fără date: doar NaN
+            if "NODATA" in tickers:
+                data.loc[:, "NODATA"] = np.nan
+            return data
+        
+        monkeypatch.setattr(yahoo_source, "yf", type("yf", (), {"download": staticmethod(fake_download)}), raising=False)
+        source.batch_size = 2
+        
+        results = asyncio.run(source.fetch_historical_batch(["AAPL", "MSFT", "NODATA"], "1D", 5))
+        
+        assert calls == [["AAPL", "MSFT"], ["NODATA"]]
+        assert len(results["AAPL"]) == 3
+        assert results["MSFT"].close.tolist() == [101.5] * 3
+        assert results["MSFT"].symbol == "MSFT"
+        assert len(results["NODATA"]) == 0
+
+
+class TestYahooLive:
+    """Yahoo nu are stream live."""
+    
+    def test_subscribe_returns_none(self, source):
+        """Test: subscribe() întoarce None și nu lasă abonați pe bus."""
+        sub = asyncio.run(source.subscribe("AAPL", "1m"))
+        
+        assert sub is None
+        assert source.bus.has_subscribers("AAPL", "1m") == False
@@ -0,0 +1,294 @@
+"""
+Tick Aggregator - Bars construite incremental din stream-uri de Tick (trades) și Quote (bid/ask)
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import time
+
+import numpy as np
+
+from src.agents.data_collection.bus import BarBus
+from src.agents.data_collection.market_calendar import NS, ExchangeCalendar
+from src.agents.data_collection.ring_buffer import RingBufferStore
+from src.common.logging_utils.logger import get_logger
+from src.common.models.market_data import Bar, Quote, Tick
+from src.common.utils.helpers import timeframe_to_seconds
+
+
+TRADES = "TRADES"       # bars din Tick (preț/volum tranzacții)
+MIDPOINT = "MIDPOINT"   # bars din Quote ((bid + ask) / 2, fără volum)
+
+# Sloturi de sesiune calculate o dată pentru atâtea zile înainte
+_SLOT_HORIZON_NS = 7 * 86400 * NS
+
+# Indicii stării unui bar în formare (listă mutabilă, acces O(1))
+_START, _END, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _PV, _COUNT = range(9)
+
+
+class TickBarAggregator:
+    """Agregă tick-uri în bars pentru un timeframe, pe mai multe simboluri.
+
+    Fiecare tick costă O(1): actualizează starea bar-ului curent al
+    simbolului (open/high/low/close, volum, Σ preț × volum pentru VWAP, număr
+    de tranzacții). Un bar se emite exact când se închide: la primul tick
+    (sau quote) al simbolului de la sfârșitul slotului încolo, ori la
+    advance(now) pentru simbolurile fără activitate (ex: din run_clock()).
+    Sloturile fără tranzacții nu produc bars (ca IBKR).
+
+    Sloturile sunt cele ale sesiunilor din `calendar` (aliniate la deschidere,
+    ultimul trunchiat la închidere; tick-urile din afara sesiunii se ignoră)
+    sau, fără calendar, o grilă fixă de la epoch (piețe 24/7). Tick-urile
+    întârziate (dinaintea bar-ului curent sau, după ce bar-ul simbolului s-a
+    închis, dinaintea sfârșitului lui) se ignoră și se numără: un slot emis
+    nu se mai redeschide.
+    """
+
+    def __init__(
+        self,
+        timeframe: str,
+        calendar: Optional[ExchangeCalendar] = None,
+        useRTH: bool = True,
+        what: str = TRADES,
+        source: Optional[str] = None,
+        on_bar: Optional[Callable[[Bar], None]] = None,
+        bus: Optional[BarBus] = None,
+        history: Optional[RingBufferStore] = None,
+        tz=timezone.utc
+    ):
+        """
+        Args:
+            timeframe: Timeframe-ul bars ('1m', '5m', '15m', '1H', '4H', '1D')
+            calendar: Calendarul bursei (None = grilă fixă, fără sesiuni)
+            useRTH: Doar sesiunea regulară (cu calendar)
+            what: TRADES (din Tick) sau MIDPOINT (din Quote)
+            source: Câmpul Bar.source al bars emise
+            on_bar: Apelat cu fiecare bar închis
+            bus: Bus pe care se publică bars închise (closed=True)
+            history: Ring buffer-e în care se adaugă bars închise
+            tz: Timezone-ul timestamp-urilor Bar emise
+
+        Raises:
+            ValueError: Timeframe sau `what` necunoscut
+        """
+        if what not in (TRADES, MIDPOINT):
+            raise ValueError(f"Unknown bar type: {what} (expected {TRADES} or {MIDPOINT})")
+        self.timeframe = timeframe
+        self.bar_ns = timeframe_to_seconds(timeframe) * NS
+        self.calendar = calendar
+        self.useRTH = useRTH
+        self.what = what
+        self.source = source
+        self.on_bar = on_bar
+        self.bus = bus
+        self.history = history
+        self.tz = tz
+        self.logger = get_logger(__name__)
+        self._bars: Dict[str, list] = {}
+        self._closed: Dict[str, int] = {}               # sfârșitul ultimului bar emis per simbol
+        self._quotes: Dict[str, Quote] = {}
+        self._due: List[Tuple[int, str, int]] = []     # heap (sfârșit, simbol, început) pentru advance()
+        self._slots = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+        self._slots_range = (0, 0)
+        self.ticks = 0
+        self.bars_emitted = 0
+        self.late_ticks = 0
+        self.outside_session = 0
+
+    # --- Intrări ---
+
+    def add_tick(self, tick: Tick) -> Optional[Bar]:
+        """Adaugă un tick (timestamp naive = UTC).
+
+        Returns:
+            Bar-ul închis de acest tick sau None
+        """
+        ts = tick.timestamp
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        ts_ns = round(ts.timestamp() * 1_000_000) * 1000
+        if self.what == MIDPOINT:
+            return self._touch(tick.symbol, ts_ns)
+        return self.add(tick.symbol, ts_ns, tick.price, tick.size)
+
+    def add(self, symbol: str, ts_ns: int, price: float, size: int) -> Optional[Bar]:
+        """Calea rapidă: un trade ca valori simple (ns UTC), fără obiect Tick.
+
+        Returns:
+            Bar-ul închis de acest trade sau None
+        """
+        self.ticks += 1
+        state = self._bars.get(symbol)
+        if state is not None and state[_START] <= ts_ns < state[_END]:
+            if price > state[_HIGH]:
+                state[_HIGH] = price
+            elif price < state[_LOW]:
+                state[_LOW] = price
+            state[_CLOSE] = price
+            state[_VOLUME] += size
+            state[_PV] += price * size
+            state[_COUNT] += 1
+            return None
+        return self._roll(symbol, state, ts_ns, price, size)
+
+    def add_quote(self, quote: Quote) -> Optional[Bar]:
+        """Adaugă un quote: bars MIDPOINT din (bid + ask) / 2; la TRADES doar avansează ceasul simbolului.
+
+        Returns:
+            Bar-ul închis de acest quote sau None
+        """
+        self._quotes[quote.symbol] = quote
+        ts = quote.timestamp
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        ts_ns = round(ts.timestamp() * 1_000_000) * 1000
+        if self.what == TRADES:
+            return self._touch(quote.symbol, ts_ns)
+        return self.add(quote.symbol, ts_ns, (quote.bid + quote.ask) / 2, 0)
+
+    def advance(self, now_ns: Optional[int] = None) -> List[Bar]:
+        """Închide toate bars al căror slot s-a terminat până la `now_ns` (default: acum).
+
+        Returns:
+            Bars închise, în ordinea sfârșitului
+        """
+        now_ns = time.time_ns() if now_ns is None else now_ns
+        closed = []
+        while self._due and self._due[0][0] <= now_ns:
+            _, symbol, start = heapq.heappop(self._due)
+            state = self._bars.get(symbol)
+            if state is not None and state[_START] == start:
+                del self._bars[symbol]
+                closed.append(self._close(symbol, state))
+        return closed
+
+    def flush(self) -> List[Bar]:
+        """Închide toate bars în formare (ex: la oprire)."""
+        closed = [self._close(symbol, state) for symbol, state in
+                  sorted(self._bars.items(), key=lambda item: item[1][_END])]
+        self._bars.clear()
+        self._due.clear()
+        return closed
+
+    async def run_clock(self, stop: asyncio.Event, grace: float = 0.0) -> None:
+        """Închide bars la sfârșitul slotului și fără tick-uri noi, până la `stop`.
+
+        Args:
+            stop: Oprește bucla
+            grace: Secunde de așteptare după sfârșitul slotului, pentru tick-urile
+                care ajung cu întârziere (după închidere se numără ca late_ticks)
+        """
+        grace_ns = int(grace * NS)
+        while not stop.is_set():
+            delay = 1.0
+            if self._due:
+                delay = min(delay, max(0.0, (self._due[0][0] + grace_ns - time.time_ns()) / NS))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                self.advance(time.time_ns() - grace_ns)
+
+    # --- Interogări ---
+
+    def current(self, symbol: str) -> Optional[Bar]:
+        """Bar-ul în formare al simbolului (None dacă nu există)."""
+        state = self._bars.get(symbol)
+        return None if state is None else self._bar(symbol, state)
+
+    def next_close(self) -> Optional[int]:
+        """Cel mai apropiat sfârșit de bar în formare (ns UTC)."""
+        while self._due:
+            end, symbol, start = self._due[0]
+            state = self._bars.get(symbol)
+            if state is not None and state[_START] == start:
+                return end
+            heapq.heappop(self._due)
+        return None
+
+    def last_quote(self, symbol: str) -> Optional[Quote]:
+        return self._quotes.get(symbol)
+
+    # --- Intern ---
+
+    def _roll(self, symbol: str, state: Optional[list], ts_ns: int, price: float, size: int) -> Optional[Bar]:
+        """Tick în afara bar-ului curent: întârziat, sau închide bar-ul și deschide unul nou."""
+        floor = state[_START] if state is not None else self._closed.get(symbol)
+        if floor is not None and ts_ns < floor:
+            self.late_ticks += 1
+            return None
+        closed = None
+        if state is not None:
+            del self._bars[symbol]
+            closed = self._close(symbol, state)
+        slot = self._slot(ts_ns)
+        if slot is None:
+            self.outside_session += 1
+            return closed
+        start, end = slot
+        self._bars[symbol] = [start, end, price, price, price, price, size, price * size, 1]
+        heapq.heappush(self._due, (end, symbol, start))
+        if len(self._due) > 2 * len(self._bars) + 64:
+            # Fără advance(), intrările bars închise de tick-uri se adună: heap refăcut din stările vii
+            self._due = [(s[_END], sym, s[_START]) for sym, s in self._bars.items()]
+            heapq.heapify(self._due)
+        return closed
+
+    def _touch(self, symbol: str, ts_ns: int) -> Optional[Bar]:
+        """Avansează ceasul unui simbol fără date de bar (închide bar-ul dacă a expirat)."""
+        state = self._bars.get(symbol)
+        if state is None or ts_ns < state[_END]:
+            return None
+        del self._bars[symbol]
+        return self._close(symbol, state)
+
+    def _slot(self, ts_ns: int) -> Optional[Tuple[int, int]]:
+        """(început, sfârșit) ale slotului care conține `ts_ns` (None = în afara sesiunii)."""
+        if self.calendar is None:
+            start = ts_ns - ts_ns % self.bar_ns
+            return start, start + self.bar_ns
+        lo, hi = self._slots_range
+        if not lo <= ts_ns < hi:
+            # Sloturile câtorva zile, calculate o dată (nu per tick)
+            lo, hi = ts_ns - 86400 * NS, ts_ns + _SLOT_HORIZON_NS
+            self._slots, self._ends = self.calendar.slots(lo, hi, self.timeframe, self.useRTH)
+            self._slots_range = (lo + 86400 * NS, hi - 86400 * NS)
+        pos = int(np.searchsorted(self._slots, ts_ns, side="right")) - 1
+        if pos < 0 or ts_ns >= self._ends[pos]:
+            return None
+        return int(self._slots[pos]), int(self._ends[pos])
+
+    def _bar(self, symbol: str, state: list) -> Bar:
+        volume = state[_VOLUME]
+        return Bar.trusted(
+            timestamp=datetime.fromtimestamp(state[_START] / NS, tz=timezone.utc).astimezone(self.tz),
+            open=state[_OPEN],
+            high=state[_HIGH],
+            low=state[_LOW],
+            close=state[_CLOSE],
+            volume=volume,
+            symbol=symbol,
+            timeframe=self.timeframe,
+            count=state[_COUNT],
+            wap=state[_PV] / volume if volume > 0 else None,
+            hasGaps=False,
+            source=self.source,
+        )
+
+    def _close(self, symbol: str, state: list) -> Bar:
+        """Emite bar-ul și reține sfârșitul slotului (tick-urile de dinainte sunt întârziate)."""
+        self._closed[symbol] = state[_END]
+        return self._emit(symbol, state)
+
+    def _emit(self, symbol: str, state: list) -> Bar:
+        bar = self._bar(symbol, state)
+        self.bars_emitted += 1
+        if self.history is not None:
+            self.history.append(bar)
+        if self.bus is not None:
+            self.bus.publish_nowait(bar, closed=True)
+        if self.on_bar is not None:
+            self.on_bar(bar)
+        return bar
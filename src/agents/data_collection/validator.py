@@ -2,11 +2,31 @@
 Data Validator - Validare calitate date
 """
 
-from typing import List, Tuple
-from src.common.models.market_data import Bar
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from src.common.models.market_data import Bar, BarSeries
 from src.common.logging_utils.logger import get_logger
 
 
+@dataclass
+class FrameValidation:
+    """Rezultatul validării vectorizate (validate_frame)."""
+    
+    mask: np.ndarray              # True = bar valid
+    counts: Dict[str, int]        # Număr de bars care încalcă fiecare regulă
+    
+    @property
+    def valid_count(self) -> int:
+        return int(np.count_nonzero(self.mask))
+    
+    @property
+    def invalid_count(self) -> int:
+        return int(self.mask.size - np.count_nonzero(self.mask))
+
+
 class DataValidator:
     """Validare calitate date."""
     
@@ -77,3 +97,59 @@ class DataValidator:
                 invalid += 1
         
         return valid, invalid
+    
+    def validate_frame(
+        self,
+        data: Union[BarSeries, pd.DataFrame, Mapping[str, np.ndarray]],
+        symbol: str = ""
+    ) -> FrameValidation:
+        """Validează vectorizat bars în format columnar (aceleași reguli ca validate_bar).
+        
+        Args:
+            data: BarSeries, DataFrame sau dict de array-uri cu coloanele open,
+                  high, low, close, volume și opțional wap, count (NaN = lipsă)
+            symbol: Simbol (doar pentru log)
+        
+        Returns:
+            FrameValidation cu masca bars valide și numărul de încălcări per regulă
+        """
+        if isinstance(data, BarSeries):
+            symbol = symbol or data.symbol or ""
+            data = data.columns()
+        o = np.asarray(data["open"], dtype=np.float64)
+        h = np.asarray(data["high"], dtype=np.float64)
+        l = np.asarray(data["low"], dtype=np.float64)
+        c = np.asarray(data["close"], dtype=np.float64)
+        v = np.asarray(data["volume"], dtype=np.float64)
+        has_volume = v > 0
+        
+        rules = {
+            "high_below_open_close": h < np.maximum(o, c),
+            "low_above_open_close": l > np.minimum(o, c),
+            "high_below_low": h < l,
+            "price_not_positive": (o <= 0) | (c <= 0),
+            "negative_volume": v < 0,
+        }
+        # WAP / count: NaN = câmp lipsă, regula nu se aplică
+        if "wap" in data:
+            wap = np.asarray(data["wap"], dtype=np.float64)
+            rules["invalid_wap"] = (wap <= 0) & has_volume
+        if "count" in data:
+            count = np.asarray(data["count"], dtype=np.float64)
+            rules["invalid_count"] = (count <= 0) & has_volume
+        
+        invalid = np.zeros(o.shape, dtype=bool)
+        for rule_mask in rules.values():
+            invalid |= rule_mask
+        
+        result = FrameValidation(
+            mask=~invalid,
+            counts={name: int(np.count_nonzero(rule_mask)) for name, rule_mask in rules.items()}
+        )
+        
+        if result.invalid_count:
+            violated = ", ".join(f"{name}={n}" for name, n in result.counts.items() if n)
+            self.logger.warning(
+                f"Bar validation for {symbol or 'frame'}: {result.invalid_count}/{o.size} invalid ({violated})"
+            )
+        return result
@@ -0,0 +1,76 @@
+"""
+Watermark Store - Ultimul timestamp salvat per (simbol, timeframe)
+"""
+
+from typing import Dict, Optional
+from datetime import datetime
+from pathlib import Path
+import json
+import os
+
+from src.common.logging_utils.logger import get_logger
+
+
+class WatermarkStore:
+    """Persistă watermark-urile folosite de colectarea incrementală.
+
+    Watermark = timestamp-ul ultimului bar salvat în istoric. Fișierul e un
+    JSON simplu: {"AAPL_1H": "2026-01-17T15:00:00-05:00", ...}.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Args:
+            filepath: Cale fișier JSON cu watermark-uri
+        """
+        self.filepath = Path(filepath)
+        self.logger = get_logger(__name__)
+        self._marks: Dict[str, str] = {}
+        self._dirty = False
+        self.load()
+
+    @staticmethod
+    def _key(symbol: str, timeframe: str) -> str:
+        return f"{symbol}_{timeframe}"
+
+    def load(self) -> None:
+        """Încarcă watermark-urile de pe disc (dacă fișierul există)."""
+        if not self.filepath.exists():
+            self._marks = {}
+            return
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                self._marks = json.load(f) or {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Cannot read watermarks from {self.filepath}: {e}")
+            self._marks = {}
+
+    def get(self, symbol: str, timeframe: str) -> Optional[datetime]:
+        """Watermark-ul pentru (symbol, timeframe) sau None."""
+        value = self._marks.get(self._key(symbol, timeframe))
+        return datetime.fromisoformat(value) if value else None
+
+    def set(self, symbol: str, timeframe: str, timestamp: datetime) -> None:
+        """Actualizează watermark-ul (în memorie, până la save())."""
+        self._marks[self._key(symbol, timeframe)] = timestamp.isoformat()
+        self._dirty = True
+
+    def save(self) -> bool:
+        """Scrie watermark-urile pe disc (tmp + rename atomic).
+
+        Returns:
+            True dacă scrierea reușește
+        """
+        if not self._dirty:
+            return True
+        try:
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.filepath.with_suffix(self.filepath.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._marks, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.filepath)
+            self._dirty = False
+            return True
+        except OSError as e:
+            self.logger.error(f"Cannot save watermarks: {e}")
+            return False
@@ -1,15 +1,26 @@
 """
-Market Data Models - Bar, Quote, Tick
+Market Data Models - Bar, BarSeries, Quote, Tick
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+import gc
+import json
 from datetime import datetime
-from typing import Optional
+from itertools import repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
+import numpy as np
+import pandas as pd
 
-@dataclass
+
+@dataclass(slots=True)
 class Bar:
-    """Reprezintă o bară OHLCV (Open, High, Low, Close, Volume)"""
+    """Reprezintă o bară OHLCV (Open, High, Low, Close, Volume)
+    
+    Instanțele folosesc __slots__ (fără __dict__ per obiect). Pentru date deja
+    validate în bloc (DataValidator), Bar.trusted / Bar.from_arrays sar peste
+    validarea din __post_init__.
+    """
     
     timestamp: datetime
     open: float
@@ -38,6 +49,99 @@ class Bar:
         if self.volume < 0:
             raise ValueError("Volume cannot be negative")
     
+    @classmethod
+    def trusted(
+        cls,
+        timestamp: datetime,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        count: Optional[int] = None,
+        wap: Optional[float] = None,
+        hasGaps: Optional[bool] = None,
+        source: Optional[str] = None,
+        normalized: Optional[bool] = None
+    ) -> "Bar":
+        """Construiește un Bar fără validare (apelantul garantează consistența datelor)"""
+        bar = object.__new__(cls)
+        bar.timestamp = timestamp
+        bar.open = open
+        bar.high = high
+        bar.low = low
+        bar.close = close
+        bar.volume = volume
+        bar.symbol = symbol
+        bar.timeframe = timeframe
+        bar.count = count
+        bar.wap = wap
+        bar.hasGaps = hasGaps
+        bar.source = source
+        bar.normalized = normalized
+        return bar
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: Iterable[datetime],
+        open: Iterable[float],
+        high: Iterable[float],
+        low: Iterable[float],
+        close: Iterable[float],
+        volume: Iterable[int],
+        count: Optional[Iterable[Optional[int]]] = None,
+        wap: Optional[Iterable[Optional[float]]] = None,
+        hasGaps: Optional[Iterable[Optional[bool]]] = None,
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        source: Optional[str] = None,
+        normalized: Optional[bool] = None
+    ) -> List["Bar"]:
+        """Construiește în bloc Bar-uri din coloane, fără validare per obiect
+        
+        Args:
+            timestamps, open, high, low, close, volume: Coloanele (aceeași lungime)
+            count, wap, hasGaps: Coloane opționale (None = câmp lipsă pentru toate)
+            symbol, timeframe, source, normalized: Valori comune tuturor bars
+        
+        Returns:
+            Lista de Bar-uri
+        """
+        count = repeat(None) if count is None else count
+        wap = repeat(None) if wap is None else wap
+        hasGaps = repeat(None) if hasGaps is None else hasGaps
+        
+        new = object.__new__
+        bars = []
+        append = bars.append
+        # Bar-urile nu formează cicluri: GC-ul ciclic doar ar rescana lista în timpul construcției
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for ts, o, h, l, c, v, cnt, w, g in zip(timestamps, open, high, low, close, volume, count, wap, hasGaps):
+                bar = new(cls)
+                bar.timestamp = ts
+                bar.open = o
+                bar.high = h
+                bar.low = l
+                bar.close = c
+                bar.volume = v
+                bar.symbol = symbol
+                bar.timeframe = timeframe
+                bar.count = cnt
+                bar.wap = w
+                bar.hasGaps = g
+                bar.source = source
+                bar.normalized = normalized
+                append(bar)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return bars
+    
     @property
     def price_change(self) -> float:
         """Calculează schimbarea de preț (close - open)"""
@@ -103,7 +207,308 @@ class Bar:
         }
 
 
-@dataclass
+# Valori sentinel pentru câmpurile opționale în BarSeries
+COUNT_MISSING = -1      # count lipsă
+GAPS_MISSING = -1       # hasGaps lipsă
+
+
+@dataclass(eq=False, repr=False)
+class BarSeries:
+    """Serie de bars pentru un simbol/timeframe, stocată columnar (NumPy).
+    
+    Un bar ocupă ~61 bytes (timestamp int64 ns UTC, OHLC/WAP float64,
+    volume int64, count int32, hasGaps int8), față de sute de bytes pentru
+    un obiect Bar. symbol/timeframe/source/tz se păstrează o singură dată.
+    Câmpurile lipsă: count = -1, wap = NaN, hasGaps = -1.
+    """
+    
+    symbol: Optional[str]
+    timeframe: Optional[str]
+    timestamps: np.ndarray               # int64, ns de la epoch (UTC dacă tz e setat)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    count: Optional[np.ndarray] = None
+    wap: Optional[np.ndarray] = None
+    has_gaps: Optional[np.ndarray] = None
+    source: Optional[str] = None
+    tz: Any = None                       # Timezone pentru timestamp-urile returnate (None = naive)
+    normalized: Optional[bool] = None
+    
+    def __post_init__(self):
+        """Normalizare dtype-uri și validare lungimi"""
+        self.timestamps = np.asarray(self.timestamps, dtype=np.int64)
+        n = self.timestamps.shape[0]
+        self.open = np.asarray(self.open, dtype=np.float64)
+        self.high = np.asarray(self.high, dtype=np.float64)
+        self.low = np.asarray(self.low, dtype=np.float64)
+        self.close = np.asarray(self.close, dtype=np.float64)
+        self.volume = np.asarray(self.volume, dtype=np.int64)
+        self.count = (np.full(n, COUNT_MISSING, dtype=np.int32) if self.count is None
+                      else np.asarray(self.count, dtype=np.int32))
+        self.wap = (np.full(n, np.nan, dtype=np.float64) if self.wap is None
+                    else np.asarray(self.wap, dtype=np.float64))
+        self.has_gaps = (np.full(n, GAPS_MISSING, dtype=np.int8) if self.has_gaps is None
+                         else np.asarray(self.has_gaps, dtype=np.int8))
+        for name in self._COLUMNS[1:]:
+            if getattr(self, name).shape != (n,):
+                raise ValueError(f"Column '{name}' length does not match timestamps ({n})")
+    
+    _COLUMNS = ("timestamps", "open", "high", "low", "close", "volume", "count", "wap", "has_gaps")
+    _ITER_CHUNK = 4096
+    
+    # --- Construcție ---
+    
+    @classmethod
+    def empty(cls, symbol: Optional[str] = None, timeframe: Optional[str] = None,
+              source: Optional[str] = None) -> "BarSeries":
+        """Serie goală"""
+        return cls(symbol, timeframe, np.empty(0, np.int64), np.empty(0), np.empty(0),
+                   np.empty(0), np.empty(0), np.empty(0, np.int64), source=source)
+    
+    @classmethod
+    def from_bars(cls, bars: Sequence["Bar"], symbol: Optional[str] = None,
+                  timeframe: Optional[str] = None, source: Optional[str] = None) -> "BarSeries":
+        """Construiește seria dintr-o listă de Bar-uri"""
+        if not bars:
+            return cls.empty(symbol, timeframe, source)
+        first = bars[0]
+        stamps = [b.timestamp for b in bars]
+        tz = getattr(stamps[0], "tzinfo", None)
+        index = pd.to_datetime(stamps, utc=tz is not None)
+        return cls(
+            symbol=symbol if symbol is not None else first.symbol,
+            timeframe=timeframe if timeframe is not None else first.timeframe,
+            timestamps=index.as_unit("ns").asi8,
+            open=np.fromiter((b.open for b in bars), np.float64, len(bars)),
+            high=np.fromiter((b.high for b in bars), np.float64, len(bars)),
+            low=np.fromiter((b.low for b in bars), np.float64, len(bars)),
+            close=np.fromiter((b.close for b in bars), np.float64, len(bars)),
+            volume=np.fromiter((b.volume for b in bars), np.int64, len(bars)),
+            count=np.fromiter((COUNT_MISSING if b.count is None else b.count for b in bars),
+                              np.int32, len(bars)),
+            wap=np.fromiter((np.nan if b.wap is None else b.wap for b in bars), np.float64, len(bars)),
+            has_gaps=np.fromiter((GAPS_MISSING if b.hasGaps is None else b.hasGaps for b in bars),
+                                 np.int8, len(bars)),
+            source=source if source is not None else first.source,
+            tz=tz,
+            normalized=first.normalized,
+        )
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, symbol: Optional[str] = None,
+                   timeframe: Optional[str] = None, source: Optional[str] = None) -> "BarSeries":
+        """Construiește seria dintr-un DataFrame (coloane ca în to_frame)"""
+        index = pd.DatetimeIndex(pd.to_datetime(df["timestamp"]))
+        tz = index.tz
+        if tz is not None:
+            index = index.tz_convert("UTC")
+        count = df["count"] if "count" in df else None
+        if count is not None:
+            count = pd.to_numeric(count).fillna(COUNT_MISSING).to_numpy(np.int32)
+        has_gaps = df["hasGaps"] if "hasGaps" in df else None
+        if has_gaps is not None:
+            has_gaps = has_gaps.astype("float64").fillna(GAPS_MISSING).to_numpy(np.int8)
+        return cls(
+            symbol=symbol if symbol is not None else df.attrs.get("symbol"),
+            timeframe=timeframe if timeframe is not None else df.attrs.get("timeframe"),
+            timestamps=index.as_unit("ns").asi8,
+            open=df["open"].to_numpy(np.float64),
+            high=df["high"].to_numpy(np.float64),
+            low=df["low"].to_numpy(np.float64),
+            close=df["close"].to_numpy(np.float64),
+            volume=df["volume"].to_numpy(np.int64),
+            count=count,
+            wap=df["wap"].to_numpy(np.float64) if "wap" in df else None,
+            has_gaps=has_gaps,
+            source=source if source is not None else df.attrs.get("source"),
+            tz=tz,
+            normalized=df.attrs.get("normalized"),
+        )
+    
+    @classmethod
+    def concat(cls, series: Sequence["BarSeries"]) -> "BarSeries":
+        """Concatenează serii (metadata din ultima serie ne-goală)"""
+        series = [s for s in series if s is not None]
+        if not series:
+            return cls.empty()
+        non_empty = [s for s in series if len(s)] or series
+        last = non_empty[-1]
+        return cls(
+            symbol=last.symbol,
+            timeframe=last.timeframe,
+            source=last.source,
+            tz=last.tz,
+            normalized=last.normalized,
+            **{name: np.concatenate([getattr(s, name) for s in non_empty]) for name in cls._COLUMNS},
+        )
+    
+    # --- Acces ---
+    
+    def __len__(self) -> int:
+        return self.timestamps.shape[0]
+    
+    def __repr__(self) -> str:
+        return f"BarSeries({self.symbol} {self.timeframe}, {len(self)} bars, source={self.source})"
+    
+    def __getitem__(self, key: Union[int, slice, np.ndarray]) -> Union["Bar", "BarSeries"]:
+        """int → Bar; slice → BarSeries (view, fără copiere); mască/indici → BarSeries"""
+        if isinstance(key, (int, np.integer)):
+            return self._bar_at(int(key))
+        return self._with_columns({name: getattr(self, name)[key] for name in self._COLUMNS})
+    
+    def __iter__(self) -> Iterator["Bar"]:
+        """Iterează Bar-uri construite la cerere (conversie pe bucăți de _ITER_CHUNK)"""
+        for start in range(0, len(self), self._ITER_CHUNK):
+            yield from self[start:start + self._ITER_CHUNK]._build_bars()
+    
+    @property
+    def nbytes(self) -> int:
+        """Memorie ocupată de coloane"""
+        return sum(getattr(self, name).nbytes for name in self._COLUMNS)
+    
+    @property
+    def tz_name(self) -> Optional[str]:
+        """Numele timezone-ului (ex: 'America/New_York'), pentru serializare"""
+        if self.tz is None:
+            return None
+        return getattr(self.tz, "key", None) or getattr(self.tz, "zone", None) or str(self.tz)
+    
+    @staticmethod
+    def tz_from_name(name: Optional[str]) -> Any:
+        """Inversul tz_name (None dacă numele lipsește sau nu e recunoscut)"""
+        if not name:
+            return None
+        try:
+            return pd.DatetimeIndex([], tz=name).tz
+        except Exception:
+            return None         # timestamp-urile rămân UTC, se pierde doar afișarea locală
+    
+    def datetime_index(self) -> pd.DatetimeIndex:
+        """Timestamp-urile ca DatetimeIndex (în tz-ul seriei)"""
+        index = pd.DatetimeIndex(self.timestamps.view("M8[ns]"))
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return index
+    
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Coloane OHLCV pentru validare vectorizată (lipsă = NaN)"""
+        count = self.count.astype(np.float64)
+        count[self.count == COUNT_MISSING] = np.nan
+        return {
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "wap": self.wap,
+            "count": count,
+        }
+    
+    def unique(self) -> "BarSeries":
+        """Sortează după timestamp și păstrează ultima apariție a fiecărui timestamp"""
+        order = np.argsort(self.timestamps, kind="stable")
+        ordered = self.timestamps[order]
+        keep = np.ones(order.shape[0], dtype=bool)
+        keep[:-1] = ordered[1:] != ordered[:-1]
+        return self[order[keep]]
+    
+    # --- Conversii ---
+    
+    def to_bars(self) -> List["Bar"]:
+        """Convertește la List[Bar]"""
+        return self._build_bars()
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Convertește la DataFrame (count/hasGaps ca tipuri nullable)"""
+        df = pd.DataFrame({
+            "timestamp": self.datetime_index(),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "count": pd.arrays.IntegerArray(self.count.astype(np.int64), self.count == COUNT_MISSING),
+            "wap": self.wap,
+            "hasGaps": pd.arrays.BooleanArray(self.has_gaps == 1, self.has_gaps == GAPS_MISSING),
+        })
+        df.attrs.update(symbol=self.symbol, timeframe=self.timeframe, source=self.source,
+                        normalized=self.normalized)
+        return df
+    
+    def save_npz(self, path: str) -> None:
+        """Salvează seria într-un fișier .npz (coloane + metadata, fără pickle)"""
+        meta = {"symbol": self.symbol, "timeframe": self.timeframe, "source": self.source,
+                "tz": self.tz_name, "normalized": self.normalized}
+        with open(path, "wb") as f:
+            np.savez(f, **{name: getattr(self, name) for name in self._COLUMNS},
+                     meta=np.array(json.dumps(meta)))
+    
+    @classmethod
+    def load_npz(cls, path: str) -> "BarSeries":
+        """Încarcă o serie salvată cu save_npz"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            columns = {name: data[name] for name in cls._COLUMNS}
+        return cls(symbol=meta.get("symbol"), timeframe=meta.get("timeframe"),
+                   source=meta.get("source"), tz=cls.tz_from_name(meta.get("tz")),
+                   normalized=meta.get("normalized"), **columns)
+    
+    def _with_columns(self, columns: Dict[str, np.ndarray]) -> "BarSeries":
+        return BarSeries(
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            source=self.source,
+            tz=self.tz,
+            normalized=self.normalized,
+            **columns,
+        )
+    
+    def _build_bars(self) -> List["Bar"]:
+        """Construiește Bar-urile (coloanele convertite o singură dată la liste Python)"""
+        if not len(self):
+            return []
+        datetimes = self.datetime_index().to_pydatetime()
+        counts = [None if c == COUNT_MISSING else c for c in self.count.tolist()]
+        waps = [None if w != w else w for w in self.wap.tolist()]
+        gaps = [None if g == GAPS_MISSING else bool(g) for g in self.has_gaps.tolist()]
+        return Bar.from_arrays(
+            datetimes, self.open.tolist(), self.high.tolist(), self.low.tolist(),
+            self.close.tolist(), self.volume.tolist(), counts, waps, gaps,
+            symbol=self.symbol, timeframe=self.timeframe, source=self.source,
+            normalized=self.normalized,
+        )
+    
+    def _bar_at(self, i: int) -> "Bar":
+        count = int(self.count[i])
+        wap = float(self.wap[i])
+        has_gaps = int(self.has_gaps[i])
+        return Bar.trusted(
+            timestamp=self._datetime_at(i),
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=int(self.volume[i]),
+            symbol=self.symbol,
+            timeframe=self.timeframe,
+            count=None if count == COUNT_MISSING else count,
+            wap=None if np.isnan(wap) else wap,
+            hasGaps=None if has_gaps == GAPS_MISSING else bool(has_gaps),
+            source=self.source,
+            normalized=self.normalized,
+        )
+    
+    def _datetime_at(self, i: int) -> datetime:
+        ts = pd.Timestamp(int(self.timestamps[i]), unit="ns")
+        if self.tz is not None:
+            ts = ts.tz_localize("UTC").tz_convert(self.tz)
+        return ts.to_pydatetime()
+
+
+@dataclass(slots=True)
 class Quote:
     """Reprezintă un quote (bid/ask)"""
     
@@ -123,6 +528,19 @@ class Quote:
         if self.bid_size < 0 or self.ask_size < 0:
             raise ValueError("Bid size and Ask size cannot be negative")
     
+    @classmethod
+    def trusted(cls, timestamp: datetime, symbol: str, bid: float, ask: float,
+                bid_size: int, ask_size: int) -> "Quote":
+        """Construiește un Quote fără validare (feed deja validat)"""
+        quote = object.__new__(cls)
+        quote.timestamp = timestamp
+        quote.symbol = symbol
+        quote.bid = bid
+        quote.ask = ask
+        quote.bid_size = bid_size
+        quote.ask_size = ask_size
+        return quote
+    
     @property
     def spread(self) -> float:
         """Calculează spread-ul (ask - bid)"""
@@ -134,7 +552,7 @@ class Quote:
         return (self.bid + self.ask) / 2
 
 
-@dataclass
+@dataclass(slots=True)
 class Tick:
     """Reprezintă un tick (preț instantaneu)"""
     
@@ -149,3 +567,13 @@ class Tick:
             raise ValueError("Price must be positive")
         if self.size < 0:
             raise ValueError("Size cannot be negative")
+    
+    @classmethod
+    def trusted(cls, timestamp: datetime, symbol: str, price: float, size: int) -> "Tick":
+        """Construiește un Tick fără validare (feed deja validat)"""
+        tick = object.__new__(cls)
+        tick.timestamp = timestamp
+        tick.symbol = symbol
+        tick.price = price
+        tick.size = size
+        return tick
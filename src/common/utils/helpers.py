@@ -136,3 +136,33 @@ def truncate_string(text: str, max_length: int, suffix: str = "...") -> str:
     if len(text) <= max_length:
         return text
     return text[:max_length - len(suffix)] + suffix
+
+
+# Durata în secunde a fiecărui timeframe al aplicației
+TIMEFRAME_SECONDS = {
+    "1m": 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "1H": 60 * 60,
+    "4H": 4 * 60 * 60,
+    "1D": 24 * 60 * 60,
+}
+
+
+def timeframe_to_seconds(timeframe: str) -> int:
+    """
+    Convertește un timeframe al aplicației ('1m', '5m', '15m', '1H', '4H', '1D') în secunde
+    
+    Args:
+        timeframe: Timeframe-ul
+        
+    Returns:
+        Durata unui bar în secunde
+        
+    Raises:
+        ValueError: Dacă timeframe-ul nu e cunoscut
+    """
+    try:
+        return TIMEFRAME_SECONDS[timeframe]
+    except KeyError:
+        raise ValueError(f"Unknown timeframe: {timeframe}")
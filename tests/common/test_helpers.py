@@ -73,3 +73,11 @@ class TestHelpers:
         # Duminică
         dt = datetime(2024, 1, 14, 15, 0, 0, tzinfo=timezone.utc)
         assert helpers.is_market_hours(dt) is False
+    
+    def test_timeframe_to_seconds(self):
+        """Test conversie timeframe → secunde"""
+        assert helpers.timeframe_to_seconds("1m") == 60
+        assert helpers.timeframe_to_seconds("4H") == 4 * 3600
+        assert helpers.timeframe_to_seconds("1D") == 86400
+        with pytest.raises(ValueError):
+            helpers.timeframe_to_seconds("2m")
@@ -4,7 +4,7 @@ Teste pentru models
 
 import pytest
 from datetime import datetime, timedelta
-from src.common.models.market_data import Bar, Quote, Tick
+from src.common.models.market_data import Bar, BarSeries, Quote, Tick
 from src.common.models.signal import Signal, SignalAction, Indicator
 from src.common.models.trade import Trade, Position, Order, OrderType, OrderSide, OrderStatus, PositionStatus
 
@@ -73,6 +73,118 @@ class TestBar:
         assert "timestamp" in data
 
 
+class TestBarFastConstruction:
+    """Teste pentru __slots__ și construcția fără validare"""
+    
+    def test_bar_has_slots(self):
+        """Test: Bar nu are __dict__ per instanță"""
+        bar = Bar(timestamp=datetime.now(), open=100.0, high=105.0, low=99.0, close=103.0, volume=1000)
+        assert not hasattr(bar, "__dict__")
+    
+    def test_trusted_skips_validation(self):
+        """Test: Bar.trusted nu rulează validarea din __post_init__"""
+        bar = Bar.trusted(datetime.now(), 100.0, 99.0, 100.0, 100.0, 1000, symbol="AAPL")
+        assert bar.high == 99.0
+        assert bar.symbol == "AAPL"
+        assert bar.count is None
+    
+    def test_from_arrays(self):
+        """Test: Bar.from_arrays echivalent cu constructorul normal"""
+        ts = [datetime(2024, 1, 15, 10, 0, 0) + timedelta(hours=i) for i in range(3)]
+        bars = Bar.from_arrays(
+            ts, [100.0] * 3, [105.0] * 3, [99.0] * 3, [103.0] * 3, [1000, 2000, 3000],
+            count=[1, None, 3], symbol="AAPL", timeframe="1H", source="IBKR"
+        )
+        assert bars == [
+            Bar(timestamp=t, open=100.0, high=105.0, low=99.0, close=103.0, volume=vol,
+                symbol="AAPL", timeframe="1H", count=cnt, source="IBKR")
+            for t, vol, cnt in zip(ts, [1000, 2000, 3000], [1, None, 3])
+        ]
+
+
+class TestBarSeries:
+    """Teste pentru BarSeries"""
+    
+    def _bars(self, n=5):
+        return [
+            Bar(
+                timestamp=datetime(2024, 1, 15, 10, 0, 0) + timedelta(hours=i),
+                open=100.0 + i,
+                high=105.0 + i,
+                low=99.0 + i,
+                close=103.0 + i,
+                volume=1000 * (i + 1),
+                symbol="AAPL",
+                timeframe="1H",
+                count=10 if i % 2 == 0 else None,
+                wap=102.0 + i if i % 2 == 0 else None,
+                source="IBKR"
+            )
+            for i in range(n)
+        ]
+    
+    def test_roundtrip_bars(self):
+        """Test conversie List[Bar] → BarSeries → List[Bar]"""
+        bars = self._bars()
+        series = BarSeries.from_bars(bars)
+        
+        assert len(series) == 5
+        assert series.symbol == "AAPL"
+        assert series.close.dtype.name == "float64"
+        assert series.to_bars() == bars
+        assert list(series) == bars
+        assert series[2] == bars[2]
+        assert series[-1] == bars[-1]
+    
+    def test_slice_is_view(self):
+        """Test slicing fără copiere"""
+        series = BarSeries.from_bars(self._bars())
+        part = series[1:3]
+        
+        assert len(part) == 2
+        assert part.to_bars() == self._bars()[1:3]
+        assert part.close.base is not None
+    
+    def test_concat_and_unique(self):
+        """Test concatenare și deduplicare (ultima apariție câștigă)"""
+        series = BarSeries.from_bars(self._bars())
+        updated = BarSeries.from_bars(self._bars()[3:])
+        updated.close[:] = 104.5
+        
+        merged = BarSeries.concat([series, updated]).unique()
+        assert len(merged) == 5
+        assert merged.close[-1] == 104.5
+        assert merged.close[0] == 103.0
+    
+    def test_frame_roundtrip(self):
+        """Test conversie la/din DataFrame"""
+        series = BarSeries.from_bars(self._bars())
+        df = series.to_frame()
+        
+        assert len(df) == 5
+        assert df["count"].isna().sum() == 2
+        assert BarSeries.from_frame(df).to_bars() == self._bars()
+    
+    def test_memory_per_bar(self):
+        """Test memorie per bar"""
+        series = BarSeries.from_bars(self._bars(100))
+        assert series.nbytes / len(series) <= 64
+    
+    def test_npz_roundtrip(self, tmp_path):
+        """Test salvare/încărcare .npz (păstrează timezone-ul)"""
+        from zoneinfo import ZoneInfo
+        bars = self._bars()
+        for bar in bars:
+            bar.timestamp = bar.timestamp.replace(tzinfo=ZoneInfo("America/New_York"))
+        series = BarSeries.from_bars(bars)
+        path = tmp_path / "series.npz"
+        series.save_npz(str(path))
+        
+        loaded = BarSeries.load_npz(str(path))
+        assert loaded.to_bars() == bars
+        assert loaded[0].timestamp.utcoffset() == bars[0].timestamp.utcoffset()
+
+
 class TestQuote:
     """Teste pentru Quote"""
     